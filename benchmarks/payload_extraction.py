@@ -0,0 +1,128 @@
+"""
+Benchmarks function invocation extraction from realistic LLM completion objects.
+
+Compares the precompiled provider fast paths with the generic recursive search (an extractor without fast paths)
+and with the former approach of converting the whole completion with `model_dump` before searching it.
+The completion models below mirror the shape of the OpenAI SDK `ChatCompletion` response, including the usage and
+logprobs data that make whole-object conversion expensive.
+
+Run with: `python benchmarks/payload_extraction.py`
+"""
+
+import json
+import timeit
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from openapi_service_client.providers import OpenAILLMProvider
+from openapi_service_client.providers.payload_extractor import DefaultPayloadExtractor
+
+
+class Function(BaseModel):
+    name: str
+    arguments: str
+
+
+class ToolCall(BaseModel):
+    id: str
+    type: str = "function"
+    function: Function
+
+
+class TopLogprob(BaseModel):
+    token: str
+    logprob: float
+    bytes: Optional[List[int]] = None
+
+
+class TokenLogprob(BaseModel):
+    token: str
+    logprob: float
+    bytes: Optional[List[int]] = None
+    top_logprobs: List[TopLogprob]
+
+
+class ChoiceLogprobs(BaseModel):
+    content: Optional[List[TokenLogprob]] = None
+
+
+class Message(BaseModel):
+    role: str = "assistant"
+    content: Optional[str] = None
+    tool_calls: Optional[List[ToolCall]] = None
+
+
+class Choice(BaseModel):
+    index: int
+    finish_reason: str = "tool_calls"
+    message: Message
+    logprobs: Optional[ChoiceLogprobs] = None
+
+
+class Usage(BaseModel):
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
+class ChatCompletion(BaseModel):
+    id: str
+    object: str = "chat.completion"
+    created: int
+    model: str
+    choices: List[Choice]
+    usage: Usage
+
+
+def make_completion(tool_calls: int = 3, logprob_tokens: int = 200) -> ChatCompletion:
+    logprobs = ChoiceLogprobs(
+        content=[
+            TokenLogprob(
+                token=f"tok{i}",
+                logprob=-0.1,
+                bytes=[116, 111, 107],
+                top_logprobs=[TopLogprob(token=f"alt{j}", logprob=-1.0 * j) for j in range(5)],
+            )
+            for i in range(logprob_tokens)
+        ]
+    )
+    calls = [
+        ToolCall(
+            id=f"call_{i}",
+            function=Function(name="serperdev_search", arguments=json.dumps({"q": f"query {i}", "num": 10})),
+        )
+        for i in range(tool_calls)
+    ]
+    return ChatCompletion(
+        id="chatcmpl-123",
+        created=1700000000,
+        model="gpt-4o",
+        choices=[Choice(index=0, message=Message(tool_calls=calls), logprobs=logprobs)],
+        usage=Usage(prompt_tokens=512, completion_tokens=64, total_tokens=576),
+    )
+
+
+def main(number: int = 2000):
+    fast = OpenAILLMProvider().get_payload_extractor()
+    generic = DefaultPayloadExtractor(arguments_field_name="arguments")
+
+    for logprob_tokens in (0, 200):
+        completion = make_completion(logprob_tokens=logprob_tokens)
+        expected = fast.extract_function_invocations(completion)
+        assert generic.extract_function_invocations(completion) == expected
+        assert generic.extract_function_invocations(completion.model_dump()) == expected
+
+        timings = {
+            "fast path": lambda c=completion: fast.extract_function_invocations(c),
+            "generic search": lambda c=completion: generic.extract_function_invocations(c),
+            "model_dump + generic search": lambda c=completion: generic.extract_function_invocations(c.model_dump()),
+        }
+        print(f"ChatCompletion with 3 tool calls and {logprob_tokens} logprob tokens, {number} extractions:")
+        for label, fn in timings.items():
+            seconds = min(timeit.repeat(fn, number=number, repeat=3))
+            print(f"  {label:<30} {seconds / number * 1e6:10.1f} us/extraction")
+
+
+if __name__ == "__main__":
+    main()
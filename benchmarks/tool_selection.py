@@ -0,0 +1,140 @@
+"""
+Benchmarks top-k tool selection on a synthetic specification with 2,000 operations.
+
+Every operation acts on one of 100 resources with one of 20 actions. Each query asks for one operation the way
+users phrase requests: a filler, one of three phrasings of the action, the resource in singular or plural and a
+parameter value. Reports the time to build the index, the selection latency, the recall of the
+asked-for operation within the top-k and how much smaller the selected definitions are than all definitions.
+Recall is reported separately for queries naming the action with a word of its definition and for paraphrased
+queries sharing only the resource with it, which a lexical index cannot tell apart from the other actions on the
+resource.
+
+Run with: `python benchmarks/tool_selection.py`
+"""
+
+import json
+import random
+import time
+import timeit
+from typing import Any, Dict, List, Tuple
+
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.tool_selection import ToolSelector, tokenize
+
+# action -> (HTTP method, path suffix, description template, synonyms used in queries)
+ACTIONS = {
+    "list": ("get", "", "List all {plural} of the account.", ["show all", "enumerate", "browse"]),
+    "get": ("get", "/{{id}}", "Fetch a single {resource} by its id.", ["look up", "retrieve", "fetch"]),
+    "create": ("post", "", "Create a new {resource}.", ["add", "make", "register"]),
+    "update": ("put", "/{{id}}", "Update an existing {resource}.", ["change", "modify", "edit"]),
+    "delete": ("delete", "/{{id}}", "Delete a {resource} permanently.", ["remove", "erase", "delete"]),
+    "search": ("get", "/search", "Search {plural} by keyword.", ["find", "search for", "query"]),
+    "archive": ("post", "/{{id}}/archive", "Archive a {resource} so it is hidden.", ["archive", "hide", "shelve"]),
+    "restore": ("post", "/{{id}}/restore", "Restore an archived {resource}.", ["restore", "unarchive", "recover"]),
+    "export": ("get", "/export", "Export {plural} as CSV.", ["export", "download", "dump"]),
+    "import": ("post", "/import", "Import {plural} from a CSV file.", ["import", "upload", "load"]),
+    "count": ("get", "/count", "Count the {plural} matching a filter.", ["count", "how many", "tally"]),
+    "share": ("post", "/{{id}}/share", "Share a {resource} with another user.", ["share", "send", "give access to"]),
+    "lock": ("post", "/{{id}}/lock", "Lock a {resource} against edits.", ["lock", "freeze", "protect"]),
+    "unlock": ("post", "/{{id}}/unlock", "Unlock a locked {resource}.", ["unlock", "unfreeze", "unprotect"]),
+    "copy": ("post", "/{{id}}/copy", "Duplicate a {resource}.", ["copy", "duplicate", "clone"]),
+    "move": ("post", "/{{id}}/move", "Move a {resource} to another folder.", ["move", "relocate", "transfer"]),
+    "tag": ("post", "/{{id}}/tags", "Add a tag to a {resource}.", ["tag", "label", "categorize"]),
+    "history": ("get", "/{{id}}/history", "Show the change history of a {resource}.", ["history of", "audit", "log"]),
+    "comment": ("post", "/{{id}}/comments", "Comment on a {resource}.", ["comment on", "annotate", "note on"]),
+    "stats": ("get", "/stats", "Usage statistics of {plural}.", ["statistics on", "usage of", "metrics for"]),
+}
+
+RESOURCES = [
+    "invoice", "customer", "order", "product", "shipment", "ticket", "project", "task", "document", "folder",
+    "contact", "lead", "campaign", "coupon", "subscription", "payment", "refund", "warehouse", "supplier", "employee",
+    "team", "meeting", "calendar", "event", "report", "dashboard", "alert", "incident", "deployment", "build",
+    "repository", "branch", "commit", "release", "package", "license", "device", "sensor", "vehicle", "driver",
+    "route", "booking", "room", "guest", "review", "rating", "article", "comment", "video", "playlist",
+    "album", "track", "artist", "podcast", "episode", "course", "lesson", "quiz", "student", "teacher",
+    "patient", "appointment", "prescription", "doctor", "clinic", "claim", "policy", "account", "budget", "expense",
+    "receipt", "transaction", "loan", "portfolio", "stock", "fund", "asset", "contract", "proposal", "quote",
+    "recipe", "ingredient", "menu", "restaurant", "reservation", "flight", "hotel", "trip", "visa", "passport",
+    "webhook", "token", "secret", "certificate", "domain", "server", "database", "backup", "cluster", "volume",
+]  # fmt: skip
+
+FILLERS = ["please", "could you", "I need to", "quickly", "for me", "right now", "if possible", "thanks"]
+
+
+def synthetic_spec() -> Dict[str, Any]:
+    paths: Dict[str, Dict[str, Any]] = {}
+    for resource in RESOURCES:
+        plural = f"{resource}s"
+        for action, (method, suffix, description, _) in ACTIONS.items():
+            path = f"/{plural}{suffix.format()}"
+            parameters = [{"name": "id", "in": "path", "required": True, "schema": {"type": "string"}}]
+            if "{id}" not in path:
+                parameters = [{"name": "filter", "in": "query", "schema": {"type": "string"}}]
+            paths.setdefault(path, {})[method] = {
+                "operationId": f"{action}{resource.capitalize()}",
+                "summary": f"{action.capitalize()} {resource}",
+                "description": description.format(resource=resource, plural=plural),
+                "tags": [plural],
+                "parameters": parameters,
+                "responses": {"200": {"description": "OK"}},
+            }
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Synthetic Service", "version": "1.0.0"},
+        "servers": [{"url": "http://localhost"}],
+        "paths": paths,
+    }
+
+
+def synthetic_queries(count: int, seed: int = 42) -> List[Tuple[str, str, bool]]:
+    """
+    Returns queries with the operationId they ask for and whether they paraphrase the action.
+    """
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        resource = rng.choice(RESOURCES)
+        action = rng.choice(list(ACTIONS))
+        synonym = rng.choice(ACTIONS[action][3])
+        noun = resource if rng.random() < 0.5 else f"{resource}s"
+        words = [rng.choice(FILLERS), synonym, "the", noun, f"#{rng.randint(1, 9999)}"]
+        vocabulary = set(tokenize(f"{action} {ACTIONS[action][2]}"))
+        paraphrased = not set(tokenize(synonym)) & vocabulary
+        queries.append((" ".join(words), f"{action}{resource.capitalize()}", paraphrased))
+    return queries
+
+
+def main(query_count: int = 1000):
+    config = ClientConfigurationBuilder().with_openapi_spec(synthetic_spec()).build()
+    spec = config.get_openapi_spec()
+    operation_count = len(spec.get_operation_ids())
+
+    start = time.perf_counter()
+    selector = ToolSelector(spec)
+    build_seconds = time.perf_counter() - start
+    queries = synthetic_queries(query_count)
+
+    print(f"Synthetic spec with {operation_count} operations, {query_count} queries")
+    print(f"  index build                   {build_seconds * 1e3:10.1f} ms")
+    paraphrased_count = sum(paraphrased for _, _, paraphrased in queries)
+    print(f"  {query_count - paraphrased_count} literal and {paraphrased_count} paraphrased queries")
+    for top_k in (1, 5, 10, 20):
+        hits = {False: 0, True: 0}
+        for query, expected, paraphrased in queries:
+            hits[paraphrased] += expected in selector.select(query, top_k)
+        seconds = min(timeit.repeat(lambda k=top_k: [selector.select(q, k) for q, _, _ in queries], number=1, repeat=3))
+        print(
+            f"  top-{top_k:<3} recall {sum(hits.values()) / query_count:6.1%} "
+            f"(literal {hits[False] / (query_count - paraphrased_count):6.1%}, "
+            f"paraphrased {hits[True] / paraphrased_count:6.1%})   "
+            f"latency {seconds / query_count * 1e6:8.1f} us/query"
+        )
+
+    all_size = len(json.dumps(config.get_tools_definitions()))
+    top_size = sum(len(json.dumps(config.select_tools_definitions(q, 10))) for q, _, _ in queries[:100]) / 100
+    print(f"  definitions size, all         {all_size:10d} bytes")
+    print(f"  definitions size, top-10      {top_size:10.0f} bytes ({top_size / all_size:.2%} of all)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
-from openapi_service_client.client import OpenAPIServiceClient
+from openapi_service_client.client import AsyncOpenAPIServiceClient, InvocationResult, OpenAPIServiceClient
 from openapi_service_client.client_configuration import ClientConfiguration, ClientConfigurationBuilder
+from openapi_service_client.registry import ServiceRegistry
 
 __all__ = [
+    "AsyncOpenAPIServiceClient",
+    "InvocationResult",
     "OpenAPIServiceClient",
     "ClientConfiguration",
     "ClientConfigurationBuilder",
+    "ServiceRegistry",
 ]
@@ -1,7 +1,41 @@
-from typing import Any
+import asyncio
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Union
 
 from openapi_service_client.client_configuration import ClientConfiguration
+from openapi_service_client.http_client import CircuitBreaker, HttpxAsyncHttpClient, ResponseTooLargeError
+from openapi_service_client.http_client.circuit_breaker import CLOSED
+from openapi_service_client.providers import FunctionPayloadExtractor
 from openapi_service_client.request_builder import RequestBuilder
+from openapi_service_client.response_shaping import ResponseShaper
+from openapi_service_client.spec import OpenAPISpecification
+
+# upper bound on the number of threads invoke_all uses to run function invocations in parallel
+DEFAULT_MAX_WORKERS = 8
+# upper bound on the number of invocations ainvoke_batch keeps in flight on the event loop
+DEFAULT_MAX_CONCURRENCY = 64
+
+
+@dataclass
+class InvocationResult:
+    """
+    The outcome of a single function invocation made by `invoke_all`.
+
+    Exactly one of `response` and `error` is meaningful: if the invocation failed, `error` holds the exception that
+    was raised and `response` is None.
+    """
+
+    id: Optional[str]
+    name: Optional[str]
+    response: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 class OpenAPIServiceClient:
@@ -65,10 +99,17 @@ class OpenAPIServiceClient:
         self,
         client_config: ClientConfiguration,
     ):
-        self.openapi_spec = client_config.get_openapi_spec()
+        self.client_config = client_config
         self.http_client = client_config.get_http_client()
         self.request_builder = RequestBuilder(client_config)
         self.payload_extractor = client_config.get_payload_extractor()
+        # configurations implementing the protocol structurally may predate response shaping
+        self.response_shaper = ResponseShaper(getattr(client_config, "get_response_shaping_config", lambda: None)())
+
+    @property
+    def openapi_spec(self) -> OpenAPISpecification:
+        # read from the configuration on every access, it changes when a reloadable spec is reloaded
+        return self.client_config.get_openapi_spec()
 
     def invoke(self, function_payload: Any) -> Any:
         """
@@ -86,16 +127,367 @@ class OpenAPIServiceClient:
         """
         fn_invocation_payload = self.payload_extractor.extract_function_invocation(function_payload)
         if not fn_invocation_payload:
-            raise OpenAPIClientError(
-                f"Failed to extract function invocation payload from {function_payload} using "
-                f"{self.payload_extractor.__class__.__name__}. Ensure the payload format matches the expected "
-                "structure for the designated LLM extractor."
-            )
-        # fn_invocation_payload, if not empty, guaranteed to have "name" and "arguments" keys from here on
+            raise self._extraction_error(function_payload)
+        return self.invoke_function(fn_invocation_payload)
+
+    def invoke_function(self, fn_invocation_payload: Dict[str, Any]) -> Any:
+        """
+        Invokes a function invocation already extracted from an LLM completion, e.g. one of those returned by
+        `FunctionPayloadExtractor.extract_function_invocations`.
+
+        :param fn_invocation_payload: A dictionary with the "name" and "arguments" of the function to be invoked.
+        :returns: The response from the service after invoking the function.
+        :raises ValueError: If the function is not an operation of the specification or its arguments are invalid.
+        :raises HttpClientError: If an error occurs while sending the request and receiving the response.
+        """
+        return self._send(self._build_request(fn_invocation_payload))
+
+    def invoke_all(self, function_payload: Any, max_workers: Optional[int] = None) -> List[InvocationResult]:
+        """
+        Invokes all functions specified in the function payload in parallel.
+
+        LLMs can request several function calls in a single completion. `invoke_all` extracts all of them and runs
+        them concurrently on a bounded thread pool, so the overall latency is that of the slowest call rather than
+        the sum of all calls. A failing invocation does not affect the others; its exception is reported in the
+        corresponding `InvocationResult`.
+
+        :param function_payload: The function payload containing the details of the functions to be invoked.
+        :param max_workers: The maximum number of invocations to run in parallel, defaults to `DEFAULT_MAX_WORKERS`.
+        :returns: A list of `InvocationResult`, one per function invocation, in the order they appear in the payload.
+        :raises OpenAPIClientError: If no function invocation can be extracted from the function payload.
+        """
+        return invoke_all_safely(self.payload_extractor, function_payload, self.invoke_function, max_workers)
+
+    def invoke_stream(self, chunks: Iterable[Any], max_workers: Optional[int] = None) -> Iterator[InvocationResult]:
+        """
+        Invokes the functions of a streamed LLM completion while the completion is still being streamed.
+
+        The chunks are fed to the provider's streaming payload extractor and each function invocation is started on
+        a bounded thread pool as soon as its arguments are complete, instead of after the whole completion has been
+        received. Results are yielded in call order, each one as soon as it and all calls before it have finished.
+        As with `invoke_all`, a failing invocation does not affect the others.
+
+        :param chunks: The chunks (deltas, events) of the streamed LLM completion.
+        :param max_workers: The maximum number of invocations to run in parallel, defaults to `DEFAULT_MAX_WORKERS`.
+        :returns: An iterator of `InvocationResult`, one per function invocation, in call order.
+        """
+        extractor = self.client_config.get_streaming_payload_extractor()
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=max_workers or DEFAULT_MAX_WORKERS) as executor:
+            for chunk in chunks:
+                for fn_invocation_payload in extractor.feed(chunk):
+                    pending.append(executor.submit(self._invoke_safely, fn_invocation_payload))
+                while pending and pending[0].done():
+                    yield pending.popleft().result()
+            for fn_invocation_payload in extractor.finish():
+                pending.append(executor.submit(self._invoke_safely, fn_invocation_payload))
+            while pending:
+                yield pending.popleft().result()
+
+    def invoke_batch(
+        self, function_payloads: Iterable[Any], max_workers: Optional[int] = None, *, return_exceptions: bool = True
+    ) -> Iterator[Any]:
+        """
+        Invokes a batch of function payloads, e.g. recorded LLM tool calls replayed for an offline evaluation, on a
+        bounded thread pool.
+
+        Each payload is invoked like with `invoke`, and the results are yielded in input order as soon as they and
+        all results before them are available. Payloads are consumed lazily and at most twice `max_workers`
+        invocations are pending at a time, so arbitrarily large batches run in constant memory. All workers share
+        this client: its specification, HTTP client, connection pool and rate limits. Size
+        `HttpClientConfig.pool_maxsize` to `max_workers` to keep a pooled connection per worker.
+
+        :param function_payloads: The function payloads to invoke, one function invocation each.
+        :param max_workers: The maximum number of invocations to run in parallel, defaults to `DEFAULT_MAX_WORKERS`.
+        :param return_exceptions: Whether a failed invocation yields its exception in place of its response, like
+        `asyncio.gather`. Otherwise the exception is raised when its turn comes and the remaining invocations are
+        abandoned.
+        :returns: An iterator of the responses, one per function payload, in input order.
+        """
+        workers = max_workers or DEFAULT_MAX_WORKERS
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for function_payload in function_payloads:
+                    pending.append(executor.submit(self.invoke, function_payload))
+                    while pending and (pending[0].done() or len(pending) >= 2 * workers):
+                        yield _batch_result(pending.popleft(), return_exceptions=return_exceptions)
+                while pending:
+                    yield _batch_result(pending.popleft(), return_exceptions=return_exceptions)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def get_circuit_state(self, operation_id: str) -> str:
+        """
+        Returns the circuit breaker state of an operation, see `HttpClientConfig.circuit_breaker`.
+
+        Lets applications tell the LLM up front that a tool is temporarily unavailable, instead of invoking it and
+        getting a `CircuitOpenError`.
+
+        :param operation_id: The operationId of the operation.
+        :returns: "open" while requests for the operation, or to its server, are rejected without being sent,
+        "half_open" while probe requests are let through, and "closed" otherwise, also when the HTTP client has no
+        circuit breaker.
+        """
+        operation = self.openapi_spec.find_operation_by_id(operation_id)
+        circuit_breaker = self._get_circuit_breaker()
+        if circuit_breaker is None:
+            return CLOSED
+        return circuit_breaker.get_state(operation.get_server_url(), operation_id)
+
+    def _get_circuit_breaker(self) -> Optional[CircuitBreaker]:
+        return getattr(self.http_client, "circuit_breaker", None)
+
+    def _invoke_safely(self, fn_invocation_payload: Dict[str, Any]) -> InvocationResult:
+        return invoke_safely(self.invoke_function, fn_invocation_payload)
+
+    def _send(self, request: Dict[str, Any]) -> Any:
+        try:
+            response = self.http_client.send_request(request)
+        except ResponseTooLargeError as e:
+            return self.response_shaper.shape_truncated(e)
+        return self.response_shaper.shape(request, response)
+
+    def _build_request(self, fn_invocation_payload: Dict[str, Any]) -> Dict[str, Any]:
+        # fn_invocation_payload, if not empty, guaranteed to have "name" and "arguments" keys, and an "error" key if
+        # its arguments could not be parsed
+        error = fn_invocation_payload.get("error")
+        if error is not None:
+            raise error
         operation = self.openapi_spec.find_operation_by_id(fn_invocation_payload.get("name"))
         request = self.request_builder.build_request(operation, **fn_invocation_payload.get("arguments"))
-        return self.http_client.send_request(request)
+        return self.response_shaper.prepare(request)
+
+    def _extraction_error(self, function_payload: Any) -> "OpenAPIClientError":
+        return extraction_error(self.payload_extractor, function_payload)
+
+
+class AsyncOpenAPIServiceClient(OpenAPIServiceClient):
+    """
+    An asyncio variant of `OpenAPIServiceClient`.
+
+    `AsyncOpenAPIServiceClient` extracts function invocations and builds requests exactly like `OpenAPIServiceClient`,
+    using the same payload extractor, request builder and authentication strategy, but sends the requests with the
+    configured `AsyncHttpClient`. A single event loop can therefore drive many concurrent invocations without
+    dedicating a thread to each one.
+
+    Example usage:
+
+    ```python
+    config = ClientConfigurationBuilder().with_openapi_spec("https://bit.ly/serper_dev_spec_yaml").build()
+    serper_api = AsyncOpenAPIServiceClient(config)
+    service_response = await serper_api.ainvoke(response)
+    ```
+    """
+
+    def __init__(
+        self,
+        client_config: ClientConfiguration,
+    ):
+        super().__init__(client_config)
+        get_async_http_client = getattr(client_config, "get_async_http_client", None)
+        if get_async_http_client is not None:
+            self.async_http_client = get_async_http_client()
+        else:
+            # configurations implementing the protocol structurally may predate the asynchronous client
+            self.async_http_client = HttpxAsyncHttpClient(client_config.get_http_client_config())
+
+    async def ainvoke(self, function_payload: Any) -> Any:
+        """
+        Asynchronously invokes a function specified in the function payload.
+
+        :param function_payload: The function payload containing the details of the function to be invoked.
+        :returns: The response from the service after invoking the function.
+        :raises OpenAPIClientError: If the function invocation payload cannot be extracted from the function payload.
+        :raises HttpClientError: If an error occurs while sending the request and receiving the response.
+        """
+        fn_invocation_payload = self.payload_extractor.extract_function_invocation(function_payload)
+        if not fn_invocation_payload:
+            raise self._extraction_error(function_payload)
+        request = self._build_request(fn_invocation_payload)
+        return await self._asend(request)
+
+    async def ainvoke_all(self, function_payload: Any, max_concurrency: Optional[int] = None) -> List[InvocationResult]:
+        """
+        Asynchronously invokes all functions specified in the function payload, concurrently on the event loop.
+
+        :param function_payload: The function payload containing the details of the functions to be invoked.
+        :param max_concurrency: The maximum number of invocations in flight at once, unbounded by default.
+        :returns: A list of `InvocationResult`, one per function invocation, in the order they appear in the payload.
+        :raises OpenAPIClientError: If no function invocation can be extracted from the function payload.
+        """
+        fn_invocation_payloads = self.payload_extractor.extract_function_invocations(function_payload)
+        if not fn_invocation_payloads:
+            raise self._extraction_error(function_payload)
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def invoke_safely(fn_invocation_payload: Dict[str, Any]) -> InvocationResult:
+            if semaphore is None:
+                return await self._ainvoke_safely(fn_invocation_payload)
+            async with semaphore:
+                return await self._ainvoke_safely(fn_invocation_payload)
+
+        return list(await asyncio.gather(*(invoke_safely(payload) for payload in fn_invocation_payloads)))
+
+    async def ainvoke_stream(self, chunks: AsyncIterable[Any]) -> AsyncIterator[InvocationResult]:
+        """
+        Asynchronously invokes the functions of a streamed LLM completion while the completion is still being
+        streamed, see `OpenAPIServiceClient.invoke_stream`.
+
+        :param chunks: The chunks (deltas, events) of the streamed LLM completion.
+        :returns: An async iterator of `InvocationResult`, one per function invocation, in call order.
+        """
+        extractor = self.client_config.get_streaming_payload_extractor()
+        pending: Deque[asyncio.Task] = deque()
+        try:
+            async for chunk in chunks:
+                for fn_invocation_payload in extractor.feed(chunk):
+                    pending.append(asyncio.ensure_future(self._ainvoke_safely(fn_invocation_payload)))
+                while pending and pending[0].done():
+                    yield pending.popleft().result()
+            for fn_invocation_payload in extractor.finish():
+                pending.append(asyncio.ensure_future(self._ainvoke_safely(fn_invocation_payload)))
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def ainvoke_batch(
+        self,
+        function_payloads: Union[Iterable[Any], AsyncIterable[Any]],
+        max_concurrency: Optional[int] = None,
+        *,
+        return_exceptions: bool = True,
+    ) -> AsyncIterator[Any]:
+        """
+        Asynchronously invokes a batch of function payloads concurrently on the event loop, see
+        `OpenAPIServiceClient.invoke_batch`.
+
+        :param function_payloads: The function payloads to invoke, an iterable or an async iterable.
+        :param max_concurrency: The maximum number of invocations in flight at once, defaults to
+        `DEFAULT_MAX_CONCURRENCY`.
+        :param return_exceptions: Whether a failed invocation yields its exception in place of its response.
+        :returns: An async iterator of the responses, one per function payload, in input order.
+        """
+        limit = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        semaphore = asyncio.Semaphore(limit)
+        pending: Deque[asyncio.Task] = deque()
+
+        async def invoke(function_payload: Any) -> Any:
+            async with semaphore:
+                return await self.ainvoke(function_payload)
+
+        try:
+            async for function_payload in _aiterate(function_payloads):
+                pending.append(asyncio.ensure_future(invoke(function_payload)))
+                while pending and (pending[0].done() or len(pending) >= 2 * limit):
+                    yield await _abatch_result(pending.popleft(), return_exceptions=return_exceptions)
+            while pending:
+                yield await _abatch_result(pending.popleft(), return_exceptions=return_exceptions)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _get_circuit_breaker(self) -> Optional[CircuitBreaker]:
+        return getattr(self.async_http_client, "circuit_breaker", None)
+
+    async def _ainvoke_safely(self, fn_invocation_payload: Dict[str, Any]) -> InvocationResult:
+        result = InvocationResult(id=fn_invocation_payload.get("id"), name=fn_invocation_payload.get("name"))
+        try:
+            result.response = await self._asend(self._build_request(fn_invocation_payload))
+        except Exception as e:
+            result.error = e
+        return result
+
+    async def _asend(self, request: Dict[str, Any]) -> Any:
+        try:
+            response = await self.async_http_client.send_request(request)
+        except ResponseTooLargeError as e:
+            return self.response_shaper.shape_truncated(e)
+        return self.response_shaper.shape(request, response)
+
+
+def _batch_result(future: Future, *, return_exceptions: bool) -> Any:
+    error = future.exception()
+    if error is None:
+        return future.result()
+    if return_exceptions:
+        return error
+    raise error
+
+
+async def _abatch_result(task: "asyncio.Task[Any]", *, return_exceptions: bool) -> Any:
+    try:
+        return await task
+    except Exception as e:
+        if return_exceptions:
+            return e
+        raise
+
+
+async def _aiterate(items: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
 
 
 class OpenAPIClientError(Exception):
     pass
+
+
+def extraction_error(payload_extractor: FunctionPayloadExtractor, function_payload: Any) -> OpenAPIClientError:
+    """
+    Returns the error raised when no function invocation can be extracted from a function payload.
+    """
+    return OpenAPIClientError(
+        f"Failed to extract function invocation payload from {function_payload} using "
+        f"{payload_extractor.__class__.__name__}. Ensure the payload format matches the expected "
+        "structure for the designated LLM extractor."
+    )
+
+
+def invoke_safely(
+    invoke_function: Callable[[Dict[str, Any]], Any], fn_invocation_payload: Dict[str, Any]
+) -> InvocationResult:
+    """
+    Invokes an extracted function invocation, reporting its response or the exception it raised in an
+    `InvocationResult`.
+    """
+    result = InvocationResult(id=fn_invocation_payload.get("id"), name=fn_invocation_payload.get("name"))
+    try:
+        result.response = invoke_function(fn_invocation_payload)
+    except Exception as e:
+        result.error = e
+    return result
+
+
+def invoke_all_safely(
+    payload_extractor: FunctionPayloadExtractor,
+    function_payload: Any,
+    invoke_function: Callable[[Dict[str, Any]], Any],
+    max_workers: Optional[int] = None,
+) -> List[InvocationResult]:
+    """
+    Extracts all function invocations of a function payload and invokes them in parallel on a bounded thread pool,
+    see `OpenAPIServiceClient.invoke_all`.
+
+    :param payload_extractor: The extractor for the provider that generated the function payload.
+    :param function_payload: The function payload containing the details of the functions to be invoked.
+    :param invoke_function: Invokes one extracted function invocation, e.g. `OpenAPIServiceClient.invoke_function`.
+    :param max_workers: The maximum number of invocations to run in parallel, defaults to `DEFAULT_MAX_WORKERS`.
+    :returns: A list of `InvocationResult`, one per function invocation, in the order they appear in the payload.
+    :raises OpenAPIClientError: If no function invocation can be extracted from the function payload.
+    """
+    fn_invocation_payloads = payload_extractor.extract_function_invocations(function_payload)
+    if not fn_invocation_payloads:
+        raise extraction_error(payload_extractor, function_payload)
+    if len(fn_invocation_payloads) == 1:
+        return [invoke_safely(invoke_function, fn_invocation_payloads[0])]
+    workers = min(len(fn_invocation_payloads), max_workers or DEFAULT_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(partial(invoke_safely, invoke_function), fn_invocation_payloads))
@@ -1,6 +1,7 @@
+import copy
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol, Union
+from typing import Any, Dict, List, Optional, Protocol, Tuple, Union
 from urllib.parse import urlparse
 
 from openapi_service_client.config import (
@@ -10,10 +11,24 @@ from openapi_service_client.config import (
     HttpClientConfig,
     OAuthAuthentication,
     PassThroughAuthentication,
+    ResponseShapingConfig,
 )
-from openapi_service_client.http_client import HttpClient, RequestsHttpClient
-from openapi_service_client.providers import FunctionPayloadExtractor, LLMProvider, OpenAILLMProvider
-from openapi_service_client.spec import OpenAPISpecification
+from openapi_service_client.http_client import (
+    AsyncHttpClient,
+    HttpClient,
+    HttpxAsyncHttpClient,
+    RequestsHttpClient,
+    ResponseCache,
+)
+from openapi_service_client.providers import (
+    FunctionPayloadExtractor,
+    LLMProvider,
+    OpenAILLMProvider,
+    StreamingPayloadExtractor,
+    get_definition_name,
+)
+from openapi_service_client.spec import CompiledSpecCache, OpenAPISpecification, ReloadableSpec, SpecFetcher
+from openapi_service_client.tool_selection import ToolSelector
 
 
 class ClientConfiguration(Protocol):
@@ -37,6 +52,17 @@ class ClientConfiguration(Protocol):
         """
         pass
 
+    def get_async_http_client(self) -> AsyncHttpClient:
+        """
+        Returns the configured asynchronous HTTP client used by `AsyncOpenAPIServiceClient` for making API calls.
+        Optional: for configurations without it, the client uses an `HttpxAsyncHttpClient` configured with
+        `get_http_client_config`.
+
+        :return: An instance of a class that implements the AsyncHttpClient protocol, capable of sending HTTP
+        requests and receiving responses without blocking the event loop.
+        """
+        pass
+
     def get_http_client_config(self) -> HttpClientConfig:
         """
         Returns the configuration settings for the HTTP client, including timeouts, headers, and other relevant
@@ -45,6 +71,14 @@ class ClientConfiguration(Protocol):
         """
         pass
 
+    def get_response_shaping_config(self) -> Optional[ResponseShapingConfig]:
+        """
+        Returns the configuration of the response shaping stage, which keeps service responses within the context
+        budget of the LLM. Optional: the clients return responses as received for configurations without it.
+        :return: ResponseShapingConfig object, or None if responses are returned as received.
+        """
+        pass
+
     def get_auth_config(self) -> AuthenticationStrategy:
         """
         Returns the authentication strategy configured for the client to authenticate requests made to the API.
@@ -60,10 +94,21 @@ class ClientConfiguration(Protocol):
         """
         pass
 
-    def get_tools_definitions(self) -> List[Dict[str, Any]]:
+    def get_tools_definitions(self, operation_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Returns the LLM specific function definitions derived from the OpenAPI specification. These definitions need
         to be passed to the LLM for generating function calls.
+        :param operation_ids: If given, only the definitions of the operations with these operationIds are returned,
+        in the given order.
+        :return: List of dictionaries containing function definitions.
+        """
+        pass
+
+    def select_tools_definitions(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Returns the LLM specific function definitions of the `top_k` operations most relevant to a query, best first.
+        :param query: The query the operations are ranked against, e.g. the latest user message.
+        :param top_k: The maximum number of definitions returned.
         :return: List of dictionaries containing function definitions.
         """
         pass
@@ -76,33 +121,70 @@ class ClientConfiguration(Protocol):
         """
         pass
 
+    def get_streaming_payload_extractor(self) -> StreamingPayloadExtractor:
+        """
+        Returns a new extractor that assembles function invocations from the chunks of a streamed LLM completion.
+        :return: StreamingPayloadExtractor object capable of assembling function names and arguments from the
+        LLM-generated completion chunks.
+        """
+        pass
+
 
 class DefaultClientConfiguration(ClientConfiguration):
 
     def __init__(
         self,
-        openapi_spec: Union[str, Path, Dict[str, Any]],
+        openapi_spec: Union[str, Path, Dict[str, Any], ReloadableSpec],
         credentials: Optional[Union[str, Dict[str, Any], AuthenticationStrategy]] = None,
         http_client: Optional[HttpClient] = None,
         http_client_config: Optional[HttpClientConfig] = None,
         provider: Optional[LLMProvider] = None,
+        *,
+        async_http_client: Optional[AsyncHttpClient] = None,
+        response_shaping_config: Optional[ResponseShapingConfig] = None,
+        response_cache: Optional[ResponseCache] = None,
+        spec_cache: Optional[CompiledSpecCache] = None,
+        spec_fetcher: Optional[SpecFetcher] = None,
     ):
-        if isinstance(openapi_spec, (str, Path)) and os.path.isfile(openapi_spec):
-            self.openapi_spec = OpenAPISpecification.from_file(openapi_spec)
+        self.reloadable_spec: Optional[ReloadableSpec] = None
+        if isinstance(openapi_spec, ReloadableSpec):
+            self.reloadable_spec = openapi_spec
+        elif isinstance(openapi_spec, (str, Path)) and os.path.isfile(openapi_spec):
+            self.openapi_spec = OpenAPISpecification.from_file(openapi_spec, spec_cache)
         elif isinstance(openapi_spec, dict):
             self.openapi_spec = OpenAPISpecification.from_dict(openapi_spec)
         elif isinstance(openapi_spec, str):
             if self.is_valid_http_url(openapi_spec):
-                self.openapi_spec = OpenAPISpecification.from_url(openapi_spec)
+                self.openapi_spec = OpenAPISpecification.from_url(openapi_spec, spec_cache, spec_fetcher)
             else:
-                self.openapi_spec = OpenAPISpecification.from_str(openapi_spec)
+                self.openapi_spec = OpenAPISpecification.from_str(openapi_spec, spec_cache)
         else:
             raise ValueError("Invalid OpenAPI specification format. Expected file path or dictionary.")
 
         self.credentials = credentials
-        self.http_client = http_client or RequestsHttpClient(http_client_config)
+        self.response_cache = response_cache
+        self.http_client = http_client or RequestsHttpClient(http_client_config, cache=response_cache)
         self.http_client_config = http_client_config or HttpClientConfig()
         self.provider = provider or OpenAILLMProvider()
+        # created lazily, the default async client depends on the optional httpx package
+        self.async_http_client = async_http_client
+        self.response_shaping_config = response_shaping_config
+        self.spec_cache = spec_cache
+        self._tools_definitions_cache: Dict[Tuple[str, str], _ToolsDefinitions] = {}
+        # the tool selector of the current spec version, rebuilt when a reloadable spec changes
+        self._tool_selector: Optional[ToolSelector] = None
+
+    @property
+    def openapi_spec(self) -> OpenAPISpecification:
+        # the current version of a reloadable spec, read anew by every invocation
+        if self.reloadable_spec is not None:
+            return self.reloadable_spec.get()
+        return self._openapi_spec
+
+    @openapi_spec.setter
+    def openapi_spec(self, openapi_spec: OpenAPISpecification):
+        self.reloadable_spec = None
+        self._openapi_spec = openapi_spec
 
     def get_openapi_spec(self) -> OpenAPISpecification:
         return self.openapi_spec
@@ -110,15 +192,82 @@ class DefaultClientConfiguration(ClientConfiguration):
     def get_http_client(self) -> HttpClient:
         return self.http_client
 
+    def get_async_http_client(self) -> AsyncHttpClient:
+        if self.async_http_client is None:
+            self.async_http_client = HttpxAsyncHttpClient(self.http_client_config, cache=self.response_cache)
+        return self.async_http_client
+
     def get_http_client_config(self) -> HttpClientConfig:
         return self.http_client_config
 
-    def get_tools_definitions(self) -> List[Dict[str, Any]]:
-        return self.provider.get_schema_converter(self.openapi_spec).convert()
+    def get_response_shaping_config(self) -> Optional[ResponseShapingConfig]:
+        return self.response_shaping_config
+
+    def get_tools_definitions(self, operation_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        # converted definitions are memoized per provider and spec content; a new spec gets a new fingerprint. Callers
+        # get deep copies, so that modifying a returned definition does not change the memoized (and cached) ones
+        openapi_spec = self.openapi_spec
+        provider_type = type(self.provider)
+        cache_key = (f"{provider_type.__module__}.{provider_type.__qualname__}", openapi_spec.get_fingerprint())
+        cached = self._tools_definitions_cache.get(cache_key)
+        if cached is None:
+            previous = next((v for k, v in self._tools_definitions_cache.items() if k[0] == cache_key[0]), None)
+            # drop definitions cached for previous versions of the spec
+            self._tools_definitions_cache = {
+                k: v for k, v in self._tools_definitions_cache.items() if k[1] == cache_key[1]
+            }
+            cached = self._tools_definitions_cache[cache_key] = _ToolsDefinitions(openapi_spec)
+            if self.spec_cache is not None:
+                cached.all = self.spec_cache.load_tools_definitions(cache_key[1], cache_key[0])
+                if cached.all is not None:
+                    cached.by_operation_id.update((get_definition_name(d), d) for d in cached.all)
+            if cached.all is None and previous is not None:
+                cached.reuse(previous)
+
+        if operation_ids is None:
+            if cached.all is None:
+                cached.all = self.provider.get_schema_converter(openapi_spec).convert()
+                cached.by_operation_id.update((get_definition_name(d), d) for d in cached.all)
+                if self.spec_cache is not None:
+                    self.spec_cache.store_tools_definitions(cache_key[1], cache_key[0], cached.all)
+            return copy.deepcopy(cached.all)
+
+        missing = [op_id for op_id in operation_ids if op_id not in cached.by_operation_id]
+        if missing and cached.all is None:
+            converted = self.provider.get_schema_converter(openapi_spec).convert(operation_ids=missing)
+            cached.by_operation_id.update((get_definition_name(d), d) for d in converted)
+            # operations that cannot be converted are remembered too, so they are not converted over and over again
+            cached.by_operation_id.update((op_id, None) for op_id in missing if op_id not in cached.by_operation_id)
+        definitions = [d for d in (cached.by_operation_id.get(op_id) for op_id in operation_ids) if d is not None]
+        return copy.deepcopy(definitions)
+
+    def select_tools_definitions(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Returns the LLM specific function definitions of the `top_k` operations most relevant to a query, best
+        first, see `ToolSelector`. Use it instead of `get_tools_definitions` for specifications with many
+        operations, to keep the prompt small. Operations sharing no term with the query are never selected.
+
+        :param query: The query the operations are ranked against, e.g. the latest user message.
+        :param top_k: The maximum number of definitions returned.
+        """
+        openapi_spec = self.openapi_spec
+        selector = self._tool_selector
+        if selector is None or selector.openapi_spec is not openapi_spec:
+            selector = self._tool_selector = ToolSelector(openapi_spec)
+        definitions: List[Dict[str, Any]] = []
+        ranked = selector.select(query, top_k=len(selector))
+        # operations that cannot be converted to definitions are skipped
+        while ranked and len(definitions) < top_k:
+            candidates, ranked = ranked[: top_k - len(definitions)], ranked[top_k - len(definitions) :]
+            definitions.extend(self.get_tools_definitions(candidates))
+        return definitions
 
     def get_payload_extractor(self) -> FunctionPayloadExtractor:
         return self.provider.get_payload_extractor()
 
+    def get_streaming_payload_extractor(self) -> StreamingPayloadExtractor:
+        return self.provider.get_streaming_payload_extractor()
+
     def get_auth_config(self) -> AuthenticationStrategy:
         if self.credentials is None:
             return PassThroughAuthentication()
@@ -166,6 +315,32 @@ class DefaultClientConfiguration(ClientConfiguration):
         return all([r.scheme in ["http", "https"], r.netloc])
 
 
+class _ToolsDefinitions:
+    """
+    Tool definitions converted for one provider from one version of an OpenAPI specification.
+    """
+
+    __slots__ = ("all", "by_operation_id", "openapi_spec")
+
+    def __init__(self, openapi_spec: OpenAPISpecification):
+        self.openapi_spec = openapi_spec
+        self.all: Optional[List[Dict[str, Any]]] = None
+        self.by_operation_id: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def reuse(self, previous: "_ToolsDefinitions"):
+        """
+        Takes over the definitions of the operations that are unchanged since the previous version of the
+        specification, see `OpenAPISpecification.get_operation_fingerprints`.
+        """
+        fingerprints = self.openapi_spec.get_operation_fingerprints()
+        previous_fingerprints = previous.openapi_spec.get_operation_fingerprints()
+        self.by_operation_id.update(
+            (op_id, definition)
+            for op_id, definition in previous.by_operation_id.items()
+            if op_id in fingerprints and fingerprints[op_id] == previous_fingerprints.get(op_id)
+        )
+
+
 class ClientConfigurationBuilder:
     """
     ClientConfigurationBuilder provides a fluent interface for constructing a `ClientConfiguration`. This builder
@@ -179,17 +354,25 @@ class ClientConfigurationBuilder:
     """
 
     def __init__(self):
-        self._openapi_spec: Union[str, Path, Dict[str, Any], None] = None
+        self._openapi_spec: Union[str, Path, Dict[str, Any], ReloadableSpec, None] = None
         self._credentials: Optional[Union[str, Dict[str, Any], AuthenticationStrategy]] = None
         self._http_client: Optional[HttpClient] = None
+        self._async_http_client: Optional[AsyncHttpClient] = None
         self._http_client_config: Optional[HttpClientConfig] = None
         self._provider: Optional[LLMProvider] = None
+        self._response_shaping_config: Optional[ResponseShapingConfig] = None
+        self._response_cache: Optional[ResponseCache] = None
+        self._spec_cache: Optional[CompiledSpecCache] = None
+        self._spec_fetcher: Optional[SpecFetcher] = None
 
-    def with_openapi_spec(self, openapi_spec: Union[str, Path, Dict[str, Any]]) -> "ClientConfigurationBuilder":
+    def with_openapi_spec(
+        self, openapi_spec: Union[str, Path, Dict[str, Any], ReloadableSpec]
+    ) -> "ClientConfigurationBuilder":
         """
         Sets the OpenAPI specification for the configuration.
 
-        :param openapi_spec: The OpenAPI specification as a URL, file path, or dictionary.
+        :param openapi_spec: The OpenAPI specification as a URL, file path, or dictionary, or a `ReloadableSpec`
+        to pick up new versions of the specification without building a new configuration.
         :return: The instance of this builder to allow for method chaining.
         """
         self._openapi_spec = openapi_spec
@@ -218,6 +401,17 @@ class ClientConfigurationBuilder:
         self._http_client = http_client
         return self
 
+    def with_async_http_client(self, async_http_client: AsyncHttpClient) -> "ClientConfigurationBuilder":
+        """
+        Specifies the asynchronous HTTP client used by `AsyncOpenAPIServiceClient` for making API calls.
+        If not set, the default `HttpxAsyncHttpClient` is used.
+
+        :param async_http_client: The asynchronous HTTP client implementation.
+        :return: The instance of this builder to allow for method chaining.
+        """
+        self._async_http_client = async_http_client
+        return self
+
     def with_http_client_config(self, http_client_config: HttpClientConfig) -> "ClientConfigurationBuilder":
         """
         Specifies the HTTP client configuration.
@@ -241,6 +435,55 @@ class ClientConfigurationBuilder:
         self._provider = provider
         return self
 
+    def with_response_shaping(self, response_shaping_config: ResponseShapingConfig) -> "ClientConfigurationBuilder":
+        """
+        Specifies how service responses are shaped before they are returned to the LLM: size caps, field
+        allowlists and array trimming, see `ResponseShapingConfig`.
+        If not set, responses are returned as received.
+
+        :param response_shaping_config: Configuration of the response shaping stage.
+        :return: The instance of this builder to allow for method chaining.
+        """
+        self._response_shaping_config = response_shaping_config
+        return self
+
+    def with_response_cache(self, response_cache: ResponseCache) -> "ClientConfigurationBuilder":
+        """
+        Specifies a cache for the responses of idempotent operations, used by the default HTTP clients. Identical
+        calls are then served from the cache instead of the network while the cached response is fresh.
+        If not set, every invocation goes to the network.
+
+        :param response_cache: The response cache, e.g. `ResponseCache(ttl=60)` or
+        `ResponseCache(DiskCacheStore(".cache"), operation_ttls={"search": 300})`.
+        :return: The instance of this builder to allow for method chaining.
+        """
+        self._response_cache = response_cache
+        return self
+
+    def with_spec_cache(self, spec_cache: CompiledSpecCache) -> "ClientConfigurationBuilder":
+        """
+        Specifies a cache of compiled specifications and their tool definitions, so that specifications given as a
+        file path, URL or string are not parsed and converted again on every process start.
+        If not set, specifications are parsed whenever a configuration is built.
+
+        :param spec_cache: The compiled specification cache, e.g. `CompiledSpecCache(".spec-cache")`.
+        :return: The instance of this builder to allow for method chaining.
+        """
+        self._spec_cache = spec_cache
+        return self
+
+    def with_spec_fetcher(self, spec_fetcher: SpecFetcher) -> "ClientConfigurationBuilder":
+        """
+        Specifies how specifications given as a URL are fetched, e.g. through an on-disk mirror that keeps
+        processes starting while the specification host is down.
+        If not set, specifications are fetched with a shared fetcher without a mirror.
+
+        :param spec_fetcher: The specification fetcher, e.g. `SpecFetcher(mirror_dir=".spec-mirror")`.
+        :return: The instance of this builder to allow for method chaining.
+        """
+        self._spec_fetcher = spec_fetcher
+        return self
+
     def build(self) -> ClientConfiguration:
         """
         Constructs a `ClientConfiguration` instance using the settings provided. It validates that an OpenAPI
@@ -258,4 +501,9 @@ class ClientConfigurationBuilder:
             http_client=self._http_client,
             http_client_config=self._http_client_config,
             provider=self._provider,
+            async_http_client=self._async_http_client,
+            response_shaping_config=self._response_shaping_config,
+            response_cache=self._response_cache,
+            spec_cache=self._spec_cache,
+            spec_fetcher=self._spec_fetcher,
         )
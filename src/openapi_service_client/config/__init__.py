@@ -1,9 +1,12 @@
 from openapi_service_client.config.auth_strategy import AuthenticationStrategy, PassThroughAuthentication
 from openapi_service_client.config.configuration import (
     ApiKeyAuthentication,
+    CircuitBreakerConfig,
     HTTPAuthentication,
     HttpClientConfig,
     OAuthAuthentication,
+    RateLimit,
+    ResponseShapingConfig,
 )
 
 __all__ = [
@@ -13,4 +16,7 @@ __all__ = [
     "HTTPAuthentication",
     "OAuthAuthentication",
     "HttpClientConfig",
+    "CircuitBreakerConfig",
+    "RateLimit",
+    "ResponseShapingConfig",
 ]
@@ -1,6 +1,6 @@
 from base64 import b64encode
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from openapi_service_client.config import AuthenticationStrategy
 
@@ -71,10 +71,189 @@ class OAuthAuthentication(AuthenticationStrategy):
             raise ValueError("OAuthAuthentication strategy received a non-OAuth2 security scheme.")
 
 
+@dataclass
+class RateLimit:
+    """
+    A client-side limit on the requests sent to a host or for an operation: at most `requests_per_second` on
+    average, in bursts of up to `burst` requests (one second's worth by default), and at most `max_in_flight`
+    requests at the same time. Any of the limits may be None, meaning unlimited.
+    """
+
+    requests_per_second: Optional[float] = None
+    burst: Optional[int] = None
+    max_in_flight: Optional[int] = None
+
+    @classmethod
+    def from_extension(cls, extension: Dict[str, Any]) -> "RateLimit":
+        """
+        Creates a rate limit from an `x-ratelimit` specification extension, e.g.
+        `{"requests-per-minute": 60, "burst": 5, "max-in-flight": 2}`. The rate is given either as
+        `requests-per-second` or as `requests-per-minute`.
+        """
+        requests_per_second = extension.get("requests-per-second")
+        if requests_per_second is None and extension.get("requests-per-minute") is not None:
+            requests_per_second = float(extension["requests-per-minute"]) / 60
+        burst = extension.get("burst")
+        max_in_flight = extension.get("max-in-flight")
+        return cls(
+            requests_per_second=float(requests_per_second) if requests_per_second is not None else None,
+            burst=int(burst) if burst is not None else None,
+            max_in_flight=int(max_in_flight) if max_in_flight is not None else None,
+        )
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """
+    Settings of the circuit breakers that stop sending requests to a failing upstream service, see
+    `HttpClientConfig.circuit_breaker`.
+
+    Each circuit tracks the outcome of the last `window_size` request attempts. Once at least `minimum_calls` are
+    tracked and the share of failed attempts (network errors and 5xx responses) reaches `failure_rate_threshold`,
+    or the share of attempts slower than `slow_call_seconds` reaches `slow_call_rate_threshold`, the circuit opens:
+    requests fail fast for `open_seconds`. Then the circuit is half-open and lets `half_open_probes` requests
+    through; if they all succeed the circuit closes, otherwise it opens again.
+    """
+
+    failure_rate_threshold: float = 0.5
+    slow_call_seconds: Optional[float] = None
+    slow_call_rate_threshold: float = 0.5
+    window_size: int = 20
+    minimum_calls: int = 10
+    open_seconds: float = 30.0
+    half_open_probes: int = 1
+
+
 @dataclass
 class HttpClientConfig:
+    """
+    Configuration settings for the HTTP clients: timeouts and deadlines, retries, connection pooling, response
+    decoding, request coalescing, client-side rate limits, circuit breakers and hedged requests. Settings keyed by
+    operationId take precedence over the matching specification extensions (`x-timeout`, `x-deadline`,
+    `x-idempotent` and `x-ratelimit`).
+
+    :param timeout: The default connect and read timeout of a single request attempt, in seconds.
+    :param max_retries: The maximum number of retries of a failed idempotent request, see `RetryPolicy`.
+    :param backoff_factor: The minimum delay between retries, in seconds.
+    :param retry_on_status: The response statuses that are retried.
+    :param default_headers: Headers sent with every request.
+    :param connect_timeout: Overrides `timeout` for connecting.
+    :param read_timeout: Overrides `timeout` for reading the response.
+    :param operation_timeouts: Read timeouts per operationId.
+    :param deadline: The overall time budget of one invocation, shared by all its retries, in seconds.
+    :param operation_deadlines: Deadlines per operationId.
+    :param pool_connections: The number of hosts for which connection pools are kept.
+    :param pool_maxsize: The number of connections kept open per host, size it to the number of threads sending
+        requests to one host concurrently.
+    :param pool_block: Whether requests wait for a free connection instead of opening (and discarding) extra ones.
+    :param tcp_keepalive: Enables TCP keep-alive probes on pooled connections, see `PoolingHTTPAdapter`.
+    :param tcp_keepalive_idle: The idle time before the first keep-alive probe, in seconds, where supported.
+    :param tcp_keepalive_interval: The interval between keep-alive probes, in seconds, where supported.
+    :param tcp_keepalive_count: The number of unanswered probes before a connection is dropped, where supported.
+    :param response_modes: How responses are decoded per operationId, one of "json", "text", "bytes" and
+        "stream", overriding the mode derived from the specification, see `response_mode_for`.
+    :param coalesce_requests: Lets identical concurrent GET and HEAD requests share one upstream request, see
+        `SingleFlight`.
+    :param host_rate_limits: Client-side rate limits per server host name, see `RateLimit` and `RateLimiter`.
+    :param operation_rate_limits: Client-side rate limits per operationId.
+    :param max_backoff: The maximum delay between retries, in seconds. Responses whose `Retry-After` header asks for
+        a longer delay are not retried.
+    :param idempotent_operations: The operationIds of operations that are safe to retry despite their HTTP method.
+    :param retry_budget_ratio: The maximum share of retries among all requests, see `RetryBudget`, None to disable
+        the retry budget.
+    :param retry_budget_min_per_second: The retries per second allowed regardless of `retry_budget_ratio`.
+    :param circuit_breaker: Enables circuit breakers per server URL and per operationId, see
+        `CircuitBreakerConfig`.
+    :param hedged_operations: The operationIds of operations whose slow requests are hedged, see `Hedger`.
+    :param hedge_percentile: The percentile (between 0 and 1) of recent latencies after which a hedge is sent.
+    :param hedge_initial_delay: The delay of hedges until enough latencies have been observed, in seconds.
+    """
+
     timeout: int = 10
     max_retries: int = 3
     backoff_factor: float = 0.3
-    retry_on_status: set = field(default_factory=lambda: {500, 502, 503, 504})
+    retry_on_status: set = field(default_factory=lambda: {429, 500, 502, 503, 504})
     default_headers: Dict[str, str] = field(default_factory=dict)
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+    operation_timeouts: Dict[str, float] = field(default_factory=dict)
+    deadline: Optional[float] = None
+    operation_deadlines: Dict[str, float] = field(default_factory=dict)
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    tcp_keepalive: bool = False
+    tcp_keepalive_idle: Optional[int] = None
+    tcp_keepalive_interval: Optional[int] = None
+    tcp_keepalive_count: Optional[int] = None
+    response_modes: Dict[str, str] = field(default_factory=dict)
+    coalesce_requests: bool = False
+    host_rate_limits: Dict[str, RateLimit] = field(default_factory=dict)
+    operation_rate_limits: Dict[str, RateLimit] = field(default_factory=dict)
+    max_backoff: float = 20.0
+    idempotent_operations: Set[str] = field(default_factory=set)
+    retry_budget_ratio: Optional[float] = 0.2
+    retry_budget_min_per_second: float = 1.0
+    circuit_breaker: Optional[CircuitBreakerConfig] = None
+    hedged_operations: Set[str] = field(default_factory=set)
+    hedge_percentile: float = 0.95
+    hedge_initial_delay: float = 1.0
+
+    def get_timeouts(self, request: Dict[str, Any]) -> Tuple[float, float]:
+        """
+        Returns the (connect, read) timeouts of a single attempt of the given request.
+        """
+        operation_id = request.get("operation_id")
+        read_timeout = self.operation_timeouts.get(operation_id) if operation_id else None
+        if read_timeout is None:
+            read_timeout = request.get("timeout") or self.read_timeout or self.timeout
+        return self.connect_timeout or self.timeout, read_timeout
+
+    def get_deadline(self, request: Dict[str, Any]) -> Optional[float]:
+        """
+        Returns the overall time budget, in seconds, of the given request including all its retries, if any.
+        """
+        operation_id = request.get("operation_id")
+        deadline = self.operation_deadlines.get(operation_id) if operation_id else None
+        return deadline or request.get("deadline") or self.deadline
+
+    def get_response_mode(self, request: Dict[str, Any]) -> str:
+        """
+        Returns how the response to the given request is decoded: "json", "text", "bytes" or "stream".
+        """
+        operation_id = request.get("operation_id")
+        mode = self.response_modes.get(operation_id) if operation_id else None
+        return mode or request.get("response_mode") or "json"
+
+
+@dataclass
+class ResponseShapingConfig:
+    """
+    Configuration of the response shaping stage of `OpenAPIServiceClient`, which keeps service responses within
+    the context budget of the LLM they are returned to.
+
+    `max_response_bytes` caps the size of a response body: the download stops as soon as the cap is reached and the
+    truncated body is returned as text. `include_fields` lists, per operationId, the JSON pointers
+    (https://www.rfc-editor.org/rfc/rfc6901) of the fields to keep in JSON responses; all other fields are dropped.
+    A pointer keeps the field it points to together with everything below it, and `*` matches any object key or
+    array index, e.g. `/organic/*/title`. `max_array_items` trims every array in a JSON response to its first items.
+    `operation_max_response_bytes` and `operation_max_array_items` override the limits per operationId.
+
+    What was dropped is reported under `report_field` of the shaped response: the pointers of dropped fields and
+    the original lengths of trimmed arrays, with `*` in place of array indices, and the byte cap if the body was
+    cut. Responses that are not JSON objects are wrapped as `{"content": response, report_field: report}` when
+    something was dropped. Set `report_field` to None to not report anything.
+    """
+
+    max_response_bytes: Optional[int] = None
+    max_array_items: Optional[int] = None
+    include_fields: Dict[str, List[str]] = field(default_factory=dict)
+    operation_max_response_bytes: Dict[str, int] = field(default_factory=dict)
+    operation_max_array_items: Dict[str, int] = field(default_factory=dict)
+    report_field: Optional[str] = "_truncated"
+
+    def get_max_response_bytes(self, operation_id: Optional[str]) -> Optional[int]:
+        return self.operation_max_response_bytes.get(operation_id) or self.max_response_bytes
+
+    def get_max_array_items(self, operation_id: Optional[str]) -> Optional[int]:
+        return self.operation_max_array_items.get(operation_id) or self.max_array_items
@@ -1,8 +1,41 @@
+from openapi_service_client.http_client.cache import CacheStore, DiskCacheStore, InMemoryCacheStore, ResponseCache
+from openapi_service_client.http_client.circuit_breaker import CircuitBreaker
 from openapi_service_client.http_client.client import (
     VALID_HTTP_METHODS,
+    AsyncHttpClient,
+    CircuitOpenError,
     HttpClient,
     HttpClientError,
+    HttpxAsyncHttpClient,
     RequestsHttpClient,
+    ResponseTooLargeError,
 )
+from openapi_service_client.http_client.hedging import Hedger, LatencyTracker
+from openapi_service_client.http_client.rate_limit import AsyncRateLimiter, RateLimiter, TokenBucket
+from openapi_service_client.http_client.retry import RetryBudget, RetryPolicy
+from openapi_service_client.http_client.single_flight import AsyncSingleFlight, SingleFlight
 
-__all__ = ["VALID_HTTP_METHODS", "HttpClient", "HttpClientError", "RequestsHttpClient"]
+__all__ = [
+    "VALID_HTTP_METHODS",
+    "AsyncHttpClient",
+    "AsyncRateLimiter",
+    "AsyncSingleFlight",
+    "CacheStore",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DiskCacheStore",
+    "Hedger",
+    "HttpClient",
+    "HttpClientError",
+    "HttpxAsyncHttpClient",
+    "InMemoryCacheStore",
+    "LatencyTracker",
+    "RateLimiter",
+    "RequestsHttpClient",
+    "ResponseCache",
+    "ResponseTooLargeError",
+    "RetryBudget",
+    "RetryPolicy",
+    "SingleFlight",
+    "TokenBucket",
+]
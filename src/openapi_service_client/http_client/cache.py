@@ -0,0 +1,322 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Protocol, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# status codes of the responses the cache stores, see `ResponseCache.store_response`
+CACHEABLE_STATUS_CODES = frozenset({200, 203})
+
+
+class CacheEntry:
+    """
+    A cached response body together with the metadata needed to serve and revalidate it.
+    """
+
+    __slots__ = ("content", "content_type", "etag", "expires_at", "last_modified")
+
+    def __init__(
+        self,
+        content: bytes,
+        content_type: Optional[str],
+        expires_at: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        self.content = content
+        self.content_type = content_type
+        # wall-clock time, so that entries of a disk store stay meaningful across processes
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """
+        Returns the headers of a conditional request revalidating this entry.
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CacheStore(Protocol):
+    """
+    Storage of cached responses, keyed by the cache key of their request.
+    """
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        pass
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class InMemoryCacheStore(CacheStore):
+    """
+    A thread-safe in-memory `CacheStore` evicting the least recently used entry once `max_entries` are stored.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheStore(CacheStore):
+    """
+    A `CacheStore` keeping one file per entry in a directory, so that cached responses survive restarts and are
+    shared by processes on the same machine.
+
+    Each file holds a line of JSON metadata followed by the raw response body. Files are replaced atomically, so
+    concurrent readers never see a partially written entry.
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._path(key), "rb") as file:
+                metadata = json.loads(file.readline())
+                content = file.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {self._path(key)}: {e}")
+            return None
+        return CacheEntry(content=content, **metadata)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        metadata = {
+            "content_type": entry.content_type,
+            "expires_at": entry.expires_at,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(json.dumps(metadata).encode("utf-8") + b"\n")
+                file.write(entry.content)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.entry"):
+            path.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.entry"
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Parses a Cache-Control header value into a dictionary of lower-cased directives and their values, if any.
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for directive in (value or "").split(","):
+        name, _, argument = directive.partition("=")
+        if name.strip():
+            directives[name.strip().lower()] = argument.strip().strip('"') or None
+    return directives
+
+
+def _without_credentials(
+    values: Optional[Mapping[str, Any]], auth_names: Optional[Iterable[str]]
+) -> List[Tuple[str, str]]:
+    # the sorted (name, value) pairs of request parameters, leaving out those added by the authentication strategy
+    auth_names = frozenset(auth_names or ())
+    return sorted((str(k), str(v)) for k, v in (values or {}).items() if k not in auth_names)
+
+
+class ResponseCache:
+    """
+    An opt-in cache of responses to idempotent requests, used by the HTTP clients in front of the network.
+
+    Requests are keyed on their method, URL, query parameters, headers, cookies and a hash of their JSON body.
+    Credentials are not part of the key: headers, cookies and query parameters added by the authentication strategy
+    are left out, so identical calls share one cached response regardless of who makes them.
+
+    How long a response stays fresh is, in order of precedence, the per-operationId TTL of `operation_ttls`, the
+    `max-age` (or `s-maxage`) directive of the response's Cache-Control header and the default `ttl`. Responses
+    marked `no-store` or `private` are never cached, `no-cache` ones are always revalidated. A stale response with
+    an `ETag` or `Last-Modified` validator is kept and revalidated with a conditional request; a `304 Not Modified`
+    answer then serves the cached body without downloading it again.
+
+    `get_stats` reports cache hits, misses, revalidated responses and stored responses.
+    """
+
+    def __init__(
+        self,
+        store: Optional[CacheStore] = None,
+        ttl: Optional[float] = None,
+        operation_ttls: Optional[Dict[str, float]] = None,
+        methods: Iterable[str] = ("get", "head"),
+    ):
+        """
+        :param store: Where responses are stored, an `InMemoryCacheStore` by default.
+        :param ttl: The default freshness lifetime of responses, in seconds, when the response does not specify one.
+        :param operation_ttls: Freshness lifetimes per operationId, overriding the one specified by the response.
+        :param methods: The HTTP methods whose responses are cached.
+        """
+        self.store = store if store is not None else InMemoryCacheStore()
+        self.ttl = ttl
+        self.operation_ttls = operation_ttls or {}
+        self.methods = frozenset(method.lower() for method in methods)
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0}
+        self._lock = threading.Lock()
+
+    def get_key(self, request: Dict[str, Any]) -> Optional[str]:
+        """
+        Returns the cache key of the request, or None if its responses are not cached.
+        """
+        if request["method"].lower() not in self.methods:
+            return None
+        params = _without_credentials(request.get("params"), request.get("auth_params"))
+        # header names are case-insensitive
+        headers = sorted(
+            (k.lower(), v) for k, v in _without_credentials(request.get("headers"), request.get("auth_headers"))
+        )
+        cookies = _without_credentials(request.get("cookies"), request.get("auth_cookies"))
+        body = request.get("json")
+        body_hash = hashlib.sha256(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest() if body else ""
+        key = json.dumps([request["method"].lower(), request["url"], params, headers, cookies, body_hash])
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """
+        Returns the cached entry for the key, fresh or stale, counting a hit if it is fresh and a miss otherwise.
+        """
+        entry = self.store.get(key)
+        if entry is not None and not entry.is_fresh() and not entry.has_validators():
+            self.store.delete(key)
+            entry = None
+        self._count("hits" if entry is not None and entry.is_fresh() else "misses")
+        return entry
+
+    def store_response(
+        self, key: str, request: Dict[str, Any], status_code: int, headers: Mapping[str, str], content: bytes
+    ) -> None:
+        """
+        Stores a response received from the network, if it may be cached.
+        """
+        if status_code not in CACHEABLE_STATUS_CODES:
+            return
+        ttl = self._freshness_lifetime(request, headers)
+        if ttl is None:
+            return
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if ttl <= 0 and not (etag or last_modified):
+            return
+        entry = CacheEntry(content, headers.get("Content-Type"), time.time() + ttl, etag, last_modified)
+        self.store.set(key, entry)
+        self._count("stored")
+
+    def revalidated(
+        self, key: str, request: Dict[str, Any], entry: CacheEntry, headers: Mapping[str, str]
+    ) -> CacheEntry:
+        """
+        Refreshes a cached entry after the server confirmed it with a `304 Not Modified` response.
+
+        :return: The refreshed entry, whose body is served in place of the empty 304 response.
+        """
+        ttl = self._freshness_lifetime(request, headers) or 0
+        entry = CacheEntry(
+            entry.content,
+            entry.content_type,
+            time.time() + ttl,
+            headers.get("ETag") or entry.etag,
+            headers.get("Last-Modified") or entry.last_modified,
+        )
+        self.store.set(key, entry)
+        self._count("revalidated")
+        return entry
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns the number of cache hits, misses, revalidated and stored responses so far.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def clear(self) -> None:
+        self.store.clear()
+
+    def _freshness_lifetime(self, request: Dict[str, Any], headers: Mapping[str, str]) -> Optional[float]:
+        # None if the response must not be stored at all
+        cache_control = parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in cache_control or "private" in cache_control:
+            return None
+        operation_id = request.get("operation_id")
+        if operation_id in self.operation_ttls:
+            return self.operation_ttls[operation_id]
+        if "no-cache" in cache_control:
+            return 0
+        for directive in ("s-maxage", "max-age"):
+            try:
+                return float(cache_control[directive] or 0)
+            except KeyError:
+                continue
+            except ValueError:
+                return 0
+        return self.ttl or 0
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
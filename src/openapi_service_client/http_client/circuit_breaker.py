@@ -0,0 +1,219 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from openapi_service_client.config.configuration import CircuitBreakerConfig
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# the states of a request's circuits, from least to most severe
+_SEVERITY = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class Circuit:
+    """
+    The state machine of one circuit, see `CircuitBreakerConfig`. Thread-safe.
+    """
+
+    def __init__(self, config: CircuitBreakerConfig):
+        self.config = config
+        self._state = CLOSED
+        # (failed, slow) outcomes of the last attempts made while the circuit was closed
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=config.window_size)
+        self._opened_at = 0.0
+        # start times of the probes in flight and the number of successful probes, while half-open
+        self._probes: List[float] = []
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def get_state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._open_remaining(time.monotonic()) <= 0:
+                return HALF_OPEN
+            return self._state
+
+    def retry_in(self) -> float:
+        """
+        Returns how long requests are still rejected, in seconds, 0 if a request may be sent now.
+        """
+        with self._lock:
+            return self._retry_in(time.monotonic())
+
+    def acquire(self) -> float:
+        """
+        Lets a request through if the circuit allows it, counting it as a probe while half-open.
+
+        :return: 0 if the request may be sent, otherwise how long requests are still rejected, in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = self._retry_in(now)
+            if wait > 0:
+                return wait
+            if self._state == OPEN:
+                self._state = HALF_OPEN
+                self._probes = []
+                self._successes = 0
+            if self._state == HALF_OPEN:
+                self._probes.append(now)
+            return 0.0
+
+    def record(self, *, failed: bool, slow: bool) -> None:
+        """
+        Records the outcome of a request attempt.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                if self._probes:
+                    self._probes.pop(0)
+                if failed or slow:
+                    self._open()
+                    return
+                self._successes += 1
+                if self._successes >= self.config.half_open_probes:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+            elif self._state == CLOSED:
+                self._outcomes.append((failed, slow))
+                if len(self._outcomes) >= self.config.minimum_calls and self._tripped():
+                    self._open()
+            # attempts started before the circuit opened do not change an open circuit
+
+    def release(self) -> None:
+        """
+        Gives back a probe slot taken by `acquire` for an attempt that was never sent, without recording an outcome.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes.pop()
+
+    def _retry_in(self, now: float) -> float:
+        if self._state == OPEN:
+            return max(self._open_remaining(now), 0.0)
+        if self._state == HALF_OPEN:
+            # probes that never reported back (e.g. cancelled requests) expire after open_seconds
+            self._probes = [started for started in self._probes if now - started < self.config.open_seconds]
+            if len(self._probes) >= self.config.half_open_probes - self._successes:
+                return self._probes[0] + self.config.open_seconds - now if self._probes else 0.0
+        return 0.0
+
+    def _open_remaining(self, now: float) -> float:
+        return self._opened_at + self.config.open_seconds - now
+
+    def _tripped(self) -> bool:
+        calls = len(self._outcomes)
+        if sum(failed for failed, _ in self._outcomes) / calls >= self.config.failure_rate_threshold:
+            return True
+        if self.config.slow_call_seconds is None:
+            return False
+        return sum(slow for _, slow in self._outcomes) / calls >= self.config.slow_call_rate_threshold
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probes = []
+        self._successes = 0
+
+
+class CircuitBreaker:
+    """
+    Tracks the health of upstream services with one `Circuit` per server URL and one per operationId, so that
+    requests to a failing service, or for a failing operation, fail fast instead of waiting out timeouts and
+    retries. Shared by all threads (or coroutines) sending requests through one HTTP client.
+
+    A CircuitBreaker without a configuration lets every request through.
+    """
+
+    def __init__(self, config: Optional[CircuitBreakerConfig] = None):
+        self.config = config
+        self._circuits: Dict[Tuple[str, str], Circuit] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, request: Dict[str, Any]) -> Optional[Tuple[Tuple[str, str], float]]:
+        """
+        Checks the circuits of a request before an attempt is sent.
+
+        :return: None if the attempt may be sent, otherwise the key of the open circuit, ("server", server URL) or
+        ("operation", operationId), and how long it still rejects requests, in seconds.
+        """
+        if self.config is None:
+            return None
+        circuits = [(key, self._circuit(key)) for key in self._keys(request)]
+        # check all circuits first, so that a request rejected by one does not take a probe of another
+        for key, circuit in circuits:
+            wait = circuit.retry_in()
+            if wait > 0:
+                return key, wait
+        for i, (key, circuit) in enumerate(circuits):
+            wait = circuit.acquire()
+            if wait > 0:
+                for _, acquired in circuits[:i]:
+                    acquired.release()
+                return key, wait
+        return None
+
+    def record(self, request: Dict[str, Any], *, failed: bool, latency: Optional[float] = None) -> None:
+        """
+        Records the outcome of a request attempt.
+
+        :param request: The request.
+        :param failed: Whether the attempt failed with a network error or a server error response.
+        :param latency: How long the attempt took until the response headers arrived, in seconds.
+        """
+        if self.config is None:
+            return
+        threshold = self.config.slow_call_seconds
+        slow = threshold is not None and latency is not None and latency > threshold
+        for key in self._keys(request):
+            self._circuit(key).record(failed=failed, slow=slow)
+
+    def release(self, request: Dict[str, Any]) -> None:
+        """
+        Releases the circuits acquired for a request attempt that was not sent or whose outcome is unknown, e.g.
+        one refused by the rate limiter, so that a half-open circuit does not wait for the probe to expire.
+        """
+        if self.config is None:
+            return
+        for key in self._keys(request):
+            self._circuit(key).release()
+
+    def get_state(self, server_url: Optional[str] = None, operation_id: Optional[str] = None) -> str:
+        """
+        Returns the state of the circuits of a server URL and an operation, the most severe of the two: "open"
+        while requests are rejected, "half_open" while probe requests are let through, "closed" otherwise.
+        """
+        keys = [("server", server_url.rstrip("/"))] if server_url else []
+        if operation_id:
+            keys.append(("operation", operation_id))
+        states = [self._circuits[key].get_state() for key in keys if key in self._circuits]
+        return max(states, key=_SEVERITY.__getitem__, default=CLOSED)
+
+    def get_states(self) -> Dict[Tuple[str, str], str]:
+        """
+        Returns the states of all circuits, keyed by ("server", server URL) or ("operation", operationId).
+        """
+        return {key: circuit.get_state() for key, circuit in list(self._circuits.items())}
+
+    @staticmethod
+    def _keys(request: Dict[str, Any]) -> List[Tuple[str, str]]:
+        server_url = request.get("server_url")
+        if not server_url:
+            parsed = urlparse(request["url"])
+            server_url = f"{parsed.scheme}://{parsed.netloc}"
+        keys = [("server", server_url.rstrip("/"))]
+        if request.get("operation_id"):
+            keys.append(("operation", request["operation_id"]))
+        return keys
+
+    def _circuit(self, key: Tuple[str, str]) -> Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            with self._lock:
+                circuit = self._circuits.get(key)
+                if circuit is None:
+                    circuit = self._circuits[key] = Circuit(self.config)
+        return circuit
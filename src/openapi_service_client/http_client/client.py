@@ -1,11 +1,39 @@
+import asyncio
 import logging
-from typing import Any, Dict, Optional, Protocol
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Protocol, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3 import Retry
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import NewConnectionError
 
 from openapi_service_client.config.configuration import HttpClientConfig
+from openapi_service_client.http_client.cache import CacheEntry, ResponseCache
+from openapi_service_client.http_client.circuit_breaker import CircuitBreaker
+from openapi_service_client.http_client.decoding import (
+    READ_CHUNK_SIZE,
+    STREAM,
+    aiter_events,
+    charset,
+    decode_content,
+    iter_events,
+    media_type,
+    read_limited,
+)
+from openapi_service_client.http_client.hedging import Hedger
+from openapi_service_client.http_client.rate_limit import AsyncRateLimiter, RateLimiter
+from openapi_service_client.http_client.retry import RetryPolicy
+from openapi_service_client.http_client.single_flight import AsyncSingleFlight, SingleFlight
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx is an optional dependency
+    httpx = None
 
 VALID_HTTP_METHODS = [
     "get",
@@ -31,44 +59,495 @@ class HttpClient(Protocol):
         pass
 
 
+class PoolingHTTPAdapter(HTTPAdapter):
+    """
+    An `HTTPAdapter` that applies the socket options, e.g. TCP keep-alive, of an `HttpClientConfig` to the
+    connections of its pools.
+    """
+
+    def __init__(self, socket_options: Optional[List[Tuple[int, int, int]]] = None, **kwargs):
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    # keeps the signature of HTTPAdapter.init_poolmanager
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):  # noqa: FBT002
+        if self.socket_options is not None:
+            pool_kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+
+def keepalive_socket_options(config: HttpClientConfig) -> Optional[List[Tuple[int, int, int]]]:
+    """
+    Returns the socket options enabling TCP keep-alive as configured, or None to use the urllib3 defaults.
+    """
+    if not config.tcp_keepalive:
+        return None
+    options = [*HTTPConnection.default_socket_options, (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    tunables = [
+        ("TCP_KEEPIDLE", config.tcp_keepalive_idle),
+        ("TCP_KEEPINTVL", config.tcp_keepalive_interval),
+        ("TCP_KEEPCNT", config.tcp_keepalive_count),
+    ]
+    for option_name, value in tunables:
+        # not all platforms support tuning keep-alive probes
+        if value is not None and hasattr(socket, option_name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, option_name), value))
+    return options
+
+
 class RequestsHttpClient(HttpClient):
-    def __init__(self, config: Optional[HttpClientConfig] = None):
+    """
+    An `HttpClient` backed by a `requests.Session`.
+
+    All requests sent through the client share the session and its connection pools, so keep-alive connections
+    are reused across invocations. The client is safe to share across threads: the session is configured once, and
+    per-request settings such as headers and timeouts are passed with each request instead of modifying it.
+
+    With a `ResponseCache`, responses to idempotent requests are served from the cache while fresh and revalidated
+    with conditional requests once stale. With `HttpClientConfig.coalesce_requests`, threads sending identical
+    idempotent requests at the same time share a single upstream request. With `HttpClientConfig.circuit_breaker`,
+    requests to a failing server or operation fail fast with a `CircuitOpenError`, see `circuit_breaker`. Requests
+    for the operations in `HttpClientConfig.hedged_operations` are hedged on a thread pool, see `hedger`.
+    """
+
+    def __init__(self, config: Optional[HttpClientConfig] = None, cache: Optional[ResponseCache] = None):
         self.config = config or HttpClientConfig()
+        self.cache = cache
+        self.single_flight = SingleFlight() if self.config.coalesce_requests else None
+        self.rate_limiter = RateLimiter(self.config)
+        self.circuit_breaker = CircuitBreaker(self.config.circuit_breaker)
+        self.retry_policy = RetryPolicy(self.config)
+        self.hedger = Hedger(self.config)
+        self._hedging_executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
         self.session = requests.Session()
         self._initialize_session()
 
     def _initialize_session(self) -> None:
-        retries = Retry(
-            total=self.config.max_retries,
-            backoff_factor=self.config.backoff_factor,
-            status_forcelist=self.config.retry_on_status,
+        # retries are made by send_request, see RetryPolicy, not by urllib3
+        adapter = PoolingHTTPAdapter(
+            socket_options=keepalive_socket_options(self.config),
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block,
+            max_retries=0,
         )
-        adapter = HTTPAdapter(max_retries=retries)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         self.session.headers.update(self.config.default_headers)
 
+    def get_pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns statistics of the connection pools of this client, keyed by `scheme://host:port`, to help size the
+        pools against real traffic:
+
+        - `num_connections`: connections opened by the pool so far; a number growing with the traffic, rather than
+          settling, means connections are discarded because the pool is too small.
+        - `num_requests`: requests sent through the pool.
+        - `idle`: open connections currently available in the pool.
+        - `maxsize`: the maximum number of connections kept in the pool.
+
+        :return: A dictionary of pool statistics per host.
+        """
+        stats: Dict[str, Dict[str, int]] = {}
+        adapters = {id(adapter): adapter for adapter in self.session.adapters.values()}.values()
+        for adapter in adapters:
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+                stats[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                    "num_connections": pool.num_connections,
+                    "num_requests": pool.num_requests,
+                    "idle": idle,
+                    "maxsize": pool.pool.maxsize if pool.pool else 0,
+                }
+        return stats
+
     def send_request(self, request: Dict[str, Any]) -> Any:
         url = request["url"]
-        method = request["method"]
-        headers = {**self.config.default_headers, **request.get("headers", {})}
-        params = request.get("params", {})
-        json_data = request.get("json", None)
-        auth = request.get("auth", None)
+        response_mode = self.config.get_response_mode(request)
         try:
-            response = self.session.request(method, url, headers=headers, params=params, json=json_data, auth=auth)
-            response.raise_for_status()
-            return response.json()
+            if response_mode == STREAM:
+                response = self._send(request, stream=True)
+                try:
+                    response.raise_for_status()
+                except requests.exceptions.HTTPError:
+                    response.close()
+                    raise
+                return self._iter_stream(response)
+            flight_key = self.single_flight.get_key(request) if self.single_flight is not None else None
+            if flight_key is None:
+                content, content_type = self._fetch_content(request)
+            else:
+                # identical requests in flight share one upstream request, each caller decodes its own copy
+                content, content_type = self.single_flight.do(
+                    flight_key, lambda: self._fetch_content(request), self.config.get_deadline(request)
+                )
+            return decode_content(content, content_type, response_mode)
         except requests.exceptions.HTTPError as e:
             logger.warning(f"HTTP error occurred: {e} while sending request to {url}")
             raise HttpClientError(f"HTTP error occurred: {e}") from e
         except requests.exceptions.RequestException as e:
             logger.warning(f"Request error occurred: {e} while sending request to {url}")
             raise HttpClientError(f"HTTP error occurred: {e}") from e
+        except HttpClientError:
+            raise
+        except Exception as e:
+            logger.warning(f"An error occurred: {e} while sending request to {url}")
+            raise HttpClientError(f"An error occurred: {e}") from e
+
+    def _fetch_content(self, request: Dict[str, Any]) -> Tuple[bytes, Optional[str]]:
+        # the response body and its content type, from the cache or the network
+        max_bytes = request.get("max_response_bytes")
+        cache_key = self.cache.get_key(request) if self.cache is not None else None
+        cached = self.cache.lookup(cache_key) if cache_key else None
+        if cached is not None and cached.is_fresh():
+            return _cached_content(cached, max_bytes)
+        conditional_headers = cached.conditional_headers() if cached is not None else None
+        if self.hedger.is_hedged(request):
+            response = self.hedger.run(
+                request,
+                lambda: self._send(request, conditional_headers, stream=bool(max_bytes)),
+                self._get_hedging_executor(),
+                discard=requests.Response.close,
+            )
+        else:
+            response = self._send(request, conditional_headers, stream=bool(max_bytes))
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+        if cached is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            response.close()
+            return _cached_content(self.cache.revalidated(cache_key, request, cached, response.headers), max_bytes)
+        content_type = response.headers.get("Content-Type")
+        if not max_bytes:
+            content = response.content
+        else:
+            # read only up to the byte cap, closing the connection instead of downloading the rest
+            with response:
+                content, truncated = read_limited(response.iter_content(chunk_size=READ_CHUNK_SIZE), max_bytes)
+            if truncated:
+                raise ResponseTooLargeError(content, content_type, max_bytes)
+        if cache_key:
+            self.cache.store_response(cache_key, request, response.status_code, response.headers, content)
+        return content, content_type
+
+    def _get_hedging_executor(self) -> ThreadPoolExecutor:
+        # runs hedged requests, both the original and the hedge, so that the caller can wait for the first response
+        if self._hedging_executor is None:
+            with self._lock:
+                if self._hedging_executor is None:
+                    self._hedging_executor = ThreadPoolExecutor(
+                        max_workers=2 * self.config.pool_maxsize, thread_name_prefix="hedged-request"
+                    )
+        return self._hedging_executor
+
+    def _send(
+        self, request: Dict[str, Any], extra_headers: Optional[Dict[str, str]] = None, *, stream: bool = False
+    ) -> requests.Response:
+        # sends the request with retries, returning the final response
+        connect_timeout, read_timeout = self.config.get_timeouts(request)
+        headers = {**self.config.default_headers, **request.get("headers", {}), **(extra_headers or {})}
+        retry = self.retry_policy.start(request)
+        while True:
+            remaining = retry.remaining()
+            _check_circuit(self.circuit_breaker, request)
+            try:
+                with self.rate_limiter.limit(request, remaining):
+                    started = time.monotonic()
+                    response = self.session.request(
+                        request["method"],
+                        request["url"],
+                        headers=headers,
+                        params=request.get("params", {}),
+                        json=request.get("json", None),
+                        auth=request.get("auth", None),
+                        timeout=(
+                            connect_timeout,
+                            max(min(read_timeout, remaining), 0.001) if remaining is not None else read_timeout,
+                        ),
+                        stream=stream,
+                    )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.circuit_breaker.record(request, failed=True)
+                delay = retry.retry_after_error(connect_error=_is_connect_error(e))
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                # the attempt was not sent, e.g. refused by the rate limiter at the deadline, or was interrupted
+                self.circuit_breaker.release(request)
+                raise
+            self.circuit_breaker.record(
+                request,
+                failed=response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR,
+                latency=time.monotonic() - started,
+            )
+            self.rate_limiter.observe(request, response.status_code, response.headers)
+            delay = retry.retry_after_status(response.status_code, response.headers)
+            if delay is None:
+                return response
+            response.close()
+            time.sleep(delay)
+
+    def _iter_stream(self, response: requests.Response) -> Iterator[Any]:
+        # the connection is returned to the pool once the stream is consumed or the iterator is closed
+        content_type = response.headers.get("Content-Type")
+        try:
+            if media_type(content_type).startswith("text/") or "json" in media_type(content_type):
+                encoding = charset(content_type) or "utf-8"
+                lines = (line.decode(encoding, errors="replace") for line in response.iter_lines())
+                yield from iter_events(lines, content_type)
+            else:
+                yield from response.iter_content(chunk_size=None)
+        finally:
+            response.close()
+
+
+def _is_connect_error(error: requests.exceptions.RequestException) -> bool:
+    # whether the request failed before it was sent, and can therefore be retried regardless of its method
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _check_circuit(circuit_breaker: CircuitBreaker, request: Dict[str, Any]) -> None:
+    rejected = circuit_breaker.acquire(request)
+    if rejected is not None:
+        (kind, name), retry_in = rejected
+        raise CircuitOpenError(kind, name, retry_in)
+
+
+def _cached_content(entry: CacheEntry, max_bytes: Optional[int]) -> Tuple[bytes, Optional[str]]:
+    if max_bytes and len(entry.content) > max_bytes:
+        raise ResponseTooLargeError(entry.content[:max_bytes], entry.content_type, max_bytes)
+    return entry.content, entry.content_type
+
+
+class AsyncHttpClient(Protocol):
+    async def send_request(self, request: Dict[str, Any]) -> Any:
+        """
+        Send an HTTP request without blocking the event loop and return the response.
+        :param request: a dictionary containing the request details.
+        :return: the response from the HTTP request.
+        """
+        pass
+
+
+class HttpxAsyncHttpClient(AsyncHttpClient):
+    """
+    An `AsyncHttpClient` backed by `httpx.AsyncClient`.
+
+    A single `httpx.AsyncClient`, and therefore a single connection pool, is shared by all requests sent through
+    this client, so one event loop can drive many concurrent invocations. Requires the optional `httpx` dependency.
+    """
+
+    def __init__(
+        self,
+        config: Optional[HttpClientConfig] = None,
+        client: Optional["httpx.AsyncClient"] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        if httpx is None:
+            raise ImportError("HttpxAsyncHttpClient requires httpx, install it with `pip install httpx`")
+        self.config = config or HttpClientConfig()
+        self.cache = cache
+        self.single_flight = AsyncSingleFlight() if self.config.coalesce_requests else None
+        self.rate_limiter = AsyncRateLimiter(self.config)
+        self.circuit_breaker = CircuitBreaker(self.config.circuit_breaker)
+        self.retry_policy = RetryPolicy(self.config)
+        self.hedger = Hedger(self.config)
+        self.client = client or httpx.AsyncClient(
+            timeout=self.config.timeout,
+            limits=httpx.Limits(
+                max_connections=self.config.pool_connections * self.config.pool_maxsize,
+                max_keepalive_connections=self.config.pool_maxsize,
+            ),
+        )
+
+    async def send_request(self, request: Dict[str, Any]) -> Any:
+        url = request["url"]
+        response_mode = self.config.get_response_mode(request)
+        try:
+            if response_mode == STREAM:
+                response = await self._send(request)
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError:
+                    await response.aclose()
+                    raise
+                return self._aiter_stream(response)
+            flight_key = self.single_flight.get_key(request) if self.single_flight is not None else None
+            if flight_key is None:
+                content, content_type = await self._fetch_content(request)
+            else:
+                # identical requests in flight share one upstream request, each caller decodes its own copy
+                content, content_type = await self.single_flight.do(
+                    flight_key, lambda: self._fetch_content(request), self.config.get_deadline(request)
+                )
+            return decode_content(content, content_type, response_mode)
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"HTTP error occurred: {e} while sending request to {url}")
+            raise HttpClientError(f"HTTP error occurred: {e}") from e
+        except httpx.HTTPError as e:
+            logger.warning(f"Request error occurred: {e} while sending request to {url}")
+            raise HttpClientError(f"HTTP error occurred: {e}") from e
+        except HttpClientError:
+            raise
         except Exception as e:
             logger.warning(f"An error occurred: {e} while sending request to {url}")
             raise HttpClientError(f"An error occurred: {e}") from e
 
+    async def _fetch_content(self, request: Dict[str, Any]) -> Tuple[bytes, Optional[str]]:
+        max_bytes = request.get("max_response_bytes")
+        cache_key = self.cache.get_key(request) if self.cache is not None else None
+        cached = self.cache.lookup(cache_key) if cache_key else None
+        if cached is not None and cached.is_fresh():
+            return _cached_content(cached, max_bytes)
+        conditional_headers = cached.conditional_headers() if cached is not None else None
+        if self.hedger.is_hedged(request):
+            response = await self.hedger.arun(
+                request, lambda: self._send(request, conditional_headers), discard=httpx.Response.aclose
+            )
+        else:
+            response = await self._send(request, conditional_headers)
+        if cached is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            await response.aclose()
+            return _cached_content(self.cache.revalidated(cache_key, request, cached, response.headers), max_bytes)
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError:
+            await response.aclose()
+            raise
+        content_type = response.headers.get("Content-Type")
+        if not max_bytes:
+            content = await response.aread()
+            await response.aclose()
+        else:
+            content, truncated = await self._aread_limited(response, max_bytes)
+            if truncated:
+                raise ResponseTooLargeError(content, content_type, max_bytes)
+        if cache_key:
+            self.cache.store_response(cache_key, request, response.status_code, response.headers, content)
+        return content, content_type
+
+    async def _send(self, request: Dict[str, Any], extra_headers: Optional[Dict[str, str]] = None) -> "httpx.Response":
+        # sends the request with retries, returning the final response with its body not yet read
+        url = request["url"]
+        connect_timeout, read_timeout = self.config.get_timeouts(request)
+        headers = {**self.config.default_headers, **request.get("headers", {}), **(extra_headers or {})}
+        retry = self.retry_policy.start(request)
+        while True:
+            remaining = retry.remaining()
+            http_request = self.client.build_request(
+                request["method"],
+                url,
+                headers=headers,
+                params=request.get("params", {}),
+                json=request.get("json", None),
+                timeout=httpx.Timeout(
+                    max(min(read_timeout, remaining), 0.001) if remaining is not None else read_timeout,
+                    connect=connect_timeout,
+                ),
+            )
+            _check_circuit(self.circuit_breaker, request)
+            try:
+                async with self.rate_limiter.limit(request, remaining):
+                    started = time.monotonic()
+                    response = await self.client.send(http_request, auth=request.get("auth", None), stream=True)
+            except httpx.TransportError as e:
+                self.circuit_breaker.record(request, failed=True)
+                delay = retry.retry_after_error(connect_error=isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)))
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # the attempt was not sent, e.g. refused by the rate limiter at the deadline, or was cancelled
+                self.circuit_breaker.release(request)
+                raise
+            self.circuit_breaker.record(
+                request,
+                failed=response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR,
+                latency=time.monotonic() - started,
+            )
+            self.rate_limiter.observe(request, response.status_code, response.headers)
+            delay = retry.retry_after_status(response.status_code, response.headers)
+            if delay is None:
+                return response
+            await response.aclose()
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def _aread_limited(response: "httpx.Response", limit: int) -> Tuple[bytes, bool]:
+        received = []
+        size = 0
+        try:
+            async for chunk in response.aiter_bytes(READ_CHUNK_SIZE):
+                received.append(chunk)
+                size += len(chunk)
+                if size > limit:
+                    return b"".join(received)[:limit], True
+            return b"".join(received), False
+        finally:
+            await response.aclose()
+
+    async def _aiter_stream(self, response: "httpx.Response") -> AsyncIterator[Any]:
+        content_type = response.headers.get("Content-Type")
+        try:
+            if media_type(content_type).startswith("text/") or "json" in media_type(content_type):
+                async for event in aiter_events(response.aiter_lines(), content_type):
+                    yield event
+            else:
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+        finally:
+            await response.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Closes the underlying `httpx.AsyncClient` and its connection pool.
+        """
+        await self.client.aclose()
+
 
 class HttpClientError(Exception):
     pass
+
+
+class ResponseTooLargeError(HttpClientError):
+    """
+    Raised when a response body exceeds the byte cap of its request, the `max_response_bytes` request key.
+
+    The download is stopped at the cap; `content` holds the bytes received up to it.
+    """
+
+    def __init__(self, content: bytes, content_type: Optional[str], limit: int):
+        super().__init__(f"Response exceeds the limit of {limit} bytes")
+        self.content = content
+        self.content_type = content_type
+        self.limit = limit
+
+
+class CircuitOpenError(HttpClientError):
+    """
+    Raised without sending the request while a circuit of the request is open, see `CircuitBreaker`.
+
+    `circuit` is "server" or "operation", `name` the server URL or operationId of the open circuit and `retry_in`
+    how long it keeps rejecting requests, in seconds.
+    """
+
+    def __init__(self, circuit: str, name: str, retry_in: float):
+        super().__init__(f"Circuit of {circuit} {name!r} is open, retry in {retry_in:.1f}s")
+        self.circuit = circuit
+        self.name = name
+        self.retry_in = retry_in
@@ -0,0 +1,187 @@
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - msgspec is an optional dependency
+    msgspec = None
+
+# Response decoding modes, see `response_mode_for`
+JSON = "json"
+TEXT = "text"
+BYTES = "bytes"
+STREAM = "stream"
+RESPONSE_MODES = (JSON, TEXT, BYTES, STREAM)
+
+# size of the chunks in which responses with a byte cap are read
+READ_CHUNK_SIZE = 64 * 1024
+
+# content types of streamed, incrementally consumable responses
+STREAMING_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-seq", "text/event-stream")
+
+
+def _loads_with_fallback(fast_loads: Callable[[bytes], Any]) -> Callable[[bytes], Any]:
+    def loads(content: bytes) -> Any:
+        try:
+            return fast_loads(content)
+        except ValueError:
+            # the C decoders are stricter than json, e.g. about NaN/Infinity literals
+            return json.loads(content)
+
+    return loads
+
+
+if orjson is not None:
+    loads_json = _loads_with_fallback(orjson.loads)
+elif msgspec is not None:
+    loads_json = _loads_with_fallback(msgspec.json.decode)
+else:
+    loads_json = json.loads
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """
+    Returns the lower-cased media type of a Content-Type header value, without its parameters.
+    """
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def is_json_media_type(content_type: Optional[str]) -> bool:
+    mime = media_type(content_type)
+    return mime == "application/json" or mime.endswith("+json")
+
+
+def response_mode_for(content_types: Iterable[str]) -> str:
+    """
+    Chooses how to decode the responses of an operation from the content types its specification declares for
+    successful responses: JSON content is parsed, streamed content (NDJSON, server-sent events) is consumed
+    incrementally, other text content is returned as text and any other content as raw bytes. Operations that
+    declare no content are assumed to return JSON.
+
+    :param content_types: The content types of the successful responses of the operation.
+    :return: One of `JSON`, `STREAM`, `TEXT` and `BYTES`.
+    """
+    media_types = [media_type(content_type) for content_type in content_types]
+    if not media_types or any(is_json_media_type(mime) or mime == "*/*" for mime in media_types):
+        return JSON
+    if any(mime in STREAMING_CONTENT_TYPES for mime in media_types):
+        return STREAM
+    if any(mime.startswith("text/") or mime in ("application/xml", "application/yaml") for mime in media_types):
+        return TEXT
+    return BYTES
+
+
+def charset(content_type: Optional[str]) -> Optional[str]:
+    """
+    Returns the charset parameter of a Content-Type header value, if any.
+    """
+    for parameter in (content_type or "").split(";")[1:]:
+        name, _, value = parameter.partition("=")
+        if name.strip().lower() == "charset":
+            return value.strip().strip('"') or None
+    return None
+
+
+def decode_content(content: bytes, content_type: Optional[str], mode: str) -> Any:
+    """
+    Decodes a fully read response body according to the decoding mode.
+
+    In `JSON` mode, the response's actual content type wins over the specification: a text or binary response is
+    returned as text or bytes instead of failing to parse.
+
+    :param content: The response body.
+    :param content_type: The Content-Type header of the response.
+    :param mode: The decoding mode.
+    :return: The decoded response.
+    """
+    if mode == BYTES:
+        return content
+    if mode == JSON:
+        if not content:
+            return None
+        mime = media_type(content_type)
+        if not mime or is_json_media_type(mime):
+            return loads_json(content)
+        if not mime.startswith("text/"):
+            return content
+    return content.decode(charset(content_type) or "utf-8", errors="replace")
+
+
+def read_limited(chunks: Iterable[bytes], limit: int) -> Tuple[bytes, bool]:
+    """
+    Reads a response body chunk by chunk, stopping as soon as it exceeds `limit` bytes.
+
+    :param chunks: The chunks of the response body.
+    :param limit: The maximum number of bytes to read.
+    :return: The body, cut to at most `limit` bytes, and whether it was cut.
+    """
+    received = []
+    size = 0
+    for chunk in chunks:
+        received.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            return b"".join(received)[:limit], True
+    return b"".join(received), False
+
+
+def iter_events(lines: Iterable[str], content_type: Optional[str]) -> Iterator[Any]:
+    """
+    Parses the lines of a streamed response: server-sent events are yielded as dictionaries with their `event`,
+    `data` and `id` fields, NDJSON lines as parsed JSON values.
+    """
+    if media_type(content_type) == "text/event-stream":
+        yield from _iter_server_sent_events(lines)
+        return
+    for line in lines:
+        if line.strip():
+            yield loads_json(line)
+
+
+async def aiter_events(lines: AsyncIterator[str], content_type: Optional[str]) -> AsyncIterator[Any]:
+    """
+    The asynchronous counterpart of `iter_events`.
+    """
+    if media_type(content_type) == "text/event-stream":
+        event: Dict[str, Any] = {}
+        async for line in lines:
+            event = _feed_server_sent_event(event, line)
+            if not line.strip() and event:
+                yield event
+                event = {}
+        if event:
+            yield event
+        return
+    async for line in lines:
+        if line.strip():
+            yield loads_json(line)
+
+
+def _iter_server_sent_events(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    event: Dict[str, Any] = {}
+    for line in lines:
+        event = _feed_server_sent_event(event, line)
+        if not line.strip() and event:
+            yield event
+            event = {}
+    if event:
+        yield event
+
+
+def _feed_server_sent_event(event: Dict[str, Any], line: str) -> Dict[str, Any]:
+    # see https://html.spec.whatwg.org/multipage/server-sent-events.html#event-stream-interpretation
+    line = line.rstrip("\r\n")
+    if not line or line.startswith(":"):
+        return event
+    field, _, value = line.partition(":")
+    value = value[1:] if value.startswith(" ") else value
+    if field == "data":
+        event["data"] = f"{event['data']}\n{value}" if "data" in event else value
+    elif field in ("event", "id", "retry"):
+        event[field] = value
+    return event
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+from openapi_service_client.config.configuration import HttpClientConfig
+from openapi_service_client.http_client.retry import IDEMPOTENT_METHODS
+
+T = TypeVar("T")
+
+# number of recent latencies kept per operation to estimate the hedge delay
+LATENCY_WINDOW = 256
+# latencies observed before the hedge delay follows the observed percentile instead of hedge_initial_delay
+MIN_LATENCY_SAMPLES = 20
+
+
+class LatencyTracker:
+    """
+    Keeps the most recent latencies of an operation, to estimate their percentiles. Thread-safe.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Returns the given percentile (between 0 and 1) of the recent latencies, or None if too few were observed.
+        """
+        with self._lock:
+            if len(self._latencies) < MIN_LATENCY_SAMPLES:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(int(percentile * len(latencies)), len(latencies) - 1)]
+
+
+class Hedger:
+    """
+    Sends hedged requests for the operations listed in `HttpClientConfig.hedged_operations`: when a request has not
+    been answered after the `hedge_percentile` of the operation's recent latencies, an identical second request is
+    sent and whichever succeeds first is used; the other one is cancelled, or discarded once it completes.
+
+    Until enough latencies have been observed, hedges are sent after `hedge_initial_delay` seconds. Only requests
+    with an idempotent HTTP method are hedged, and streamed responses are not. Each hedge is a full request,
+    subject to rate limits and counted by circuit breakers. `get_stats` reports how many requests were eligible,
+    how many hedges were fired and how many of them won.
+    """
+
+    def __init__(self, config: HttpClientConfig):
+        self.config = config
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._stats = {"requests": 0, "hedged": 0, "won": 0}
+        self._lock = threading.Lock()
+
+    def is_hedged(self, request: Dict[str, Any]) -> bool:
+        return (
+            request.get("operation_id") in self.config.hedged_operations
+            and request["method"].lower() in IDEMPOTENT_METHODS
+        )
+
+    def get_delay(self, request: Dict[str, Any]) -> float:
+        """
+        Returns how long to wait for the response to a request before sending a hedge, in seconds.
+        """
+        delay = self._tracker(request["operation_id"]).percentile(self.config.hedge_percentile)
+        return delay if delay is not None else self.config.hedge_initial_delay
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def run(self, request: Dict[str, Any], call: Callable[[], T], executor: Executor, discard: Callable[[T], Any]) -> T:
+        """
+        Runs a blocking call on the executor, hedged with a second call if the first is slow.
+
+        Blocking calls cannot be interrupted, so the losing call runs to completion and its result is passed to
+        `discard`, e.g. to close a response and return its connection to the pool.
+
+        :return: The result of the first call to succeed.
+        :raises Exception: The error of the first call, if all calls failed.
+        """
+        self._count("requests")
+        futures: List[Future] = [executor.submit(self._timed, request, call)]
+        done, _ = wait(futures, timeout=self.get_delay(request))
+        if not done:
+            self._count("hedged")
+            futures.append(executor.submit(self._timed, request, call))
+        winner = None
+        pending = set(futures)
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in futures if future in done and future.exception() is None), None)
+        if winner is None:
+            return futures[0].result()
+        if winner is not futures[0]:
+            self._count("won")
+        for future in futures:
+            if future is not winner:
+                future.add_done_callback(lambda loser: discard(loser.result()) if loser.exception() is None else None)
+        return winner.result()
+
+    async def arun(
+        self, request: Dict[str, Any], call: Callable[[], Awaitable[T]], discard: Callable[[T], Awaitable[Any]]
+    ) -> T:
+        """
+        Runs a coroutine call, hedged with a second call if the first is slow; see `run`. The losing call is
+        cancelled, or its result passed to `discard` if it already completed.
+        """
+        self._count("requests")
+        tasks = [asyncio.ensure_future(self._atimed(request, call))]
+        done, _ = await asyncio.wait(tasks, timeout=self.get_delay(request))
+        if not done:
+            self._count("hedged")
+            tasks.append(asyncio.ensure_future(self._atimed(request, call)))
+        winner = None
+        try:
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in tasks if task in done and task.exception() is None), None)
+            if winner is None:
+                return tasks[0].result()
+            if winner is not tasks[0]:
+                self._count("won")
+            return winner.result()
+        finally:
+            for task in tasks:
+                if task is winner:
+                    continue
+                if not task.done():
+                    task.cancel()
+                    task.add_done_callback(_retrieve_exception)
+                elif not task.cancelled() and task.exception() is None:
+                    await discard(task.result())
+
+    def _timed(self, request: Dict[str, Any], call: Callable[[], T]) -> T:
+        started = time.monotonic()
+        result = call()
+        self._tracker(request["operation_id"]).record(time.monotonic() - started)
+        return result
+
+    async def _atimed(self, request: Dict[str, Any], call: Callable[[], Awaitable[T]]) -> T:
+        started = time.monotonic()
+        result = await call()
+        self._tracker(request["operation_id"]).record(time.monotonic() - started)
+        return result
+
+    def _tracker(self, operation_id: str) -> LatencyTracker:
+        tracker = self._trackers.get(operation_id)
+        if tracker is None:
+            with self._lock:
+                tracker = self._trackers.setdefault(operation_id, LatencyTracker())
+        return tracker
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+def _retrieve_exception(task: "asyncio.Future[Any]") -> None:
+    # marks the error of a cancelled hedge as retrieved, nobody waits for it anymore
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,276 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+from openapi_service_client.config.configuration import HttpClientConfig, RateLimit
+
+# response status codes whose Retry-After header holds back further requests to the host
+RETRY_AFTER_STATUS_CODES = frozenset({429, 503})
+
+# X-RateLimit-Reset values above this are epoch timestamps rather than delays in seconds
+_EPOCH_THRESHOLD = 1_000_000_000
+
+
+def retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Returns the delay requested by a Retry-After header, given in seconds or as an HTTP date, if any.
+    """
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def quota_reset_delay(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Returns how long to wait before the next request if the `RateLimit-*` (or `X-RateLimit-*`) headers of a
+    response say that the quota is used up, None otherwise.
+    """
+    for prefix in ("RateLimit", "X-RateLimit"):
+        remaining = headers.get(f"{prefix}-Remaining")
+        if remaining is None:
+            continue
+        try:
+            if float(remaining) > 0:
+                return None
+            reset = float(headers.get(f"{prefix}-Reset") or 1)
+        except ValueError:
+            return None
+        return max(reset - time.time(), 0.0) if reset > _EPOCH_THRESHOLD else reset
+    return None
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket: tokens refill at `rate` per second up to `burst` tokens, and each request takes one.
+
+    Requests reserve their token upfront and then wait until it is due, so concurrent waiters are served in order
+    without polling. A bucket without a rate only enforces pauses requested by the server.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst
+        self.capacity = float(burst or max(1.0, rate or 1.0))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, rate: Optional[float] = None, burst: Optional[int] = None) -> None:
+        """
+        Changes the rate and burst of the bucket, keeping the tokens it holds up to the new capacity and any pause.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.burst = burst
+            self.capacity = float(burst or max(1.0, rate or 1.0))
+            self._tokens = min(self._tokens, self.capacity)
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Reserves a token.
+
+        :param max_wait: The longest acceptable wait, in seconds, unbounded by default.
+        :return: How long to wait before sending the request, in seconds, or None if that would be longer than
+        `max_wait`, in which case no token is taken.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._paused_until - now, 0.0)
+            self._refill(now)
+            if self.rate:
+                available = min(self.capacity, self._tokens + wait * self.rate)
+                wait += max(1.0 - available, 0.0) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            if self.rate:
+                self._tokens -= 1.0
+            return wait
+
+    def refund(self) -> None:
+        """
+        Returns a token reserved for a request that is not sent after all.
+        """
+        with self._lock:
+            if self.rate:
+                self._tokens = min(self.capacity, self._tokens + 1.0)
+
+    def _refill(self, now: float) -> None:
+        if self.rate:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause(self, seconds: float) -> None:
+        """
+        Holds back all requests for the given number of seconds.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class _RateLimiterBase:
+    def __init__(self, config: HttpClientConfig):
+        self.config = config
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        # in-flight semaphores and the limit they were created for
+        self._slots: Dict[Tuple[str, str], Tuple[int, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, request: Dict[str, Any], status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Adapts to the rate limit signals of a response: holds back requests to the host as long as the server asks.
+        """
+        delay = retry_after(headers) if status_code in RETRY_AFTER_STATUS_CODES else None
+        if delay is None:
+            delay = quota_reset_delay(headers)
+        if delay:
+            host = urlparse(request["url"]).hostname or ""
+            self._bucket(("host", host), self._host_limit(host, request)).pause(delay)
+
+    def _reserve(
+        self, request: Dict[str, Any], remaining: Optional[float]
+    ) -> Tuple[float, List[Tuple[Tuple[str, str], int]]]:
+        # reserves tokens in all buckets the request is subject to, returns the wait and the in-flight slots needed
+        host = urlparse(request["url"]).hostname or ""
+        operation_id = request.get("operation_id")
+        limits = [(("host", host), self._host_limit(host, request))]
+        if operation_id:
+            limits.append((("operation", operation_id), self._operation_limit(operation_id, request)))
+        max_wait = max(remaining, 0.0) if remaining is not None else None
+        wait = 0.0
+        slots = []
+        reserved_in: List[TokenBucket] = []
+        for key, limit in limits:
+            bucket = self._bucket(key, limit)
+            reserved = bucket.reserve(max_wait)
+            if reserved is None:
+                # the tokens taken from the other buckets are given back, the request is not sent
+                for other in reserved_in:
+                    other.refund()
+                raise TimeoutError(f"Rate limit of {key[0]} {key[1]!r} would delay the request past its deadline")
+            reserved_in.append(bucket)
+            wait = max(wait, reserved)
+            if limit is not None and limit.max_in_flight:
+                slots.append((key, limit.max_in_flight))
+        return wait, slots
+
+    def _host_limit(self, host: str, request: Dict[str, Any]) -> Optional[RateLimit]:
+        limit = self.config.host_rate_limits.get(host)
+        if limit is None and request.get("host_rate_limit"):
+            limit = RateLimit.from_extension(request["host_rate_limit"])
+        return limit
+
+    def _operation_limit(self, operation_id: str, request: Dict[str, Any]) -> Optional[RateLimit]:
+        limit = self.config.operation_rate_limits.get(operation_id)
+        if limit is None and request.get("operation_rate_limit"):
+            limit = RateLimit.from_extension(request["operation_rate_limit"])
+        return limit
+
+    def _bucket(self, key: Tuple[str, str], limit: Optional[RateLimit]) -> TokenBucket:
+        # buckets follow the limit of the latest request, e.g. after a reloaded spec changed its x-ratelimit
+        rate, burst = (limit.requests_per_second, limit.burst) if limit is not None else (None, None)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = TokenBucket(rate, burst)
+        if bucket.rate != rate or bucket.burst != burst:
+            bucket.configure(rate, burst)
+        return bucket
+
+
+class RateLimiter(_RateLimiterBase):
+    """
+    Applies the client-side rate limits of an `HttpClientConfig` to requests sent from many threads.
+
+    Requests are limited per server host name and per operationId. The limits configured in
+    `HttpClientConfig.host_rate_limits` and `HttpClientConfig.operation_rate_limits` take precedence over
+    `x-ratelimit` extensions in the specification, at its root for its server host and on an operation for the
+    operation. Requests wait for their turn, but never past their deadline. Limits also adapt to the server: after
+    a `Retry-After` header on a 429 or 503 response, or a `RateLimit-Remaining: 0` (or `X-RateLimit-Remaining: 0`)
+    header, requests to the host are held back until the indicated time.
+    """
+
+    @contextmanager
+    def limit(self, request: Dict[str, Any], remaining: Optional[float] = None) -> Iterator[None]:
+        """
+        Waits until the request may be sent and holds its in-flight slots while the context is active.
+
+        :param request: The request to send.
+        :param remaining: The time left until the deadline of the request, in seconds, unbounded if not given.
+        :raises TimeoutError: If the request would have to wait past its deadline.
+        """
+        started = time.monotonic()
+        wait, slots = self._reserve(request, remaining)
+        if wait:
+            time.sleep(wait)
+        acquired: List[threading.BoundedSemaphore] = []
+        try:
+            for key, max_in_flight in slots:
+                semaphore = self._slot(key, max_in_flight)
+                timeout = max(remaining - (time.monotonic() - started), 0.0) if remaining is not None else None
+                if not semaphore.acquire(timeout=timeout):
+                    raise TimeoutError(f"No free in-flight slot for {key[0]} {key[1]!r} before the request deadline")
+                acquired.append(semaphore)
+            yield
+        finally:
+            for semaphore in acquired:
+                semaphore.release()
+
+    def _slot(self, key: Tuple[str, str], max_in_flight: int) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            # a changed limit gets a new semaphore, requests in flight release the one they acquired
+            if slot is None or slot[0] != max_in_flight:
+                slot = self._slots[key] = (max_in_flight, threading.BoundedSemaphore(max_in_flight))
+            return slot[1]
+
+
+class AsyncRateLimiter(_RateLimiterBase):
+    """
+    Applies the client-side rate limits of an `HttpClientConfig` to requests sent from coroutines of one event
+    loop, see `RateLimiter`.
+    """
+
+    @asynccontextmanager
+    async def limit(self, request: Dict[str, Any], remaining: Optional[float] = None) -> AsyncIterator[None]:
+        started = time.monotonic()
+        wait, slots = self._reserve(request, remaining)
+        if wait:
+            await asyncio.sleep(wait)
+        acquired: List[asyncio.Semaphore] = []
+        try:
+            for key, max_in_flight in slots:
+                semaphore = self._slot(key, max_in_flight)
+                timeout = max(remaining - (time.monotonic() - started), 0.0) if remaining is not None else None
+                try:
+                    await asyncio.wait_for(semaphore.acquire(), timeout)
+                except asyncio.TimeoutError as e:
+                    raise TimeoutError(
+                        f"No free in-flight slot for {key[0]} {key[1]!r} before the request deadline"
+                    ) from e
+                acquired.append(semaphore)
+            yield
+        finally:
+            for semaphore in acquired:
+                semaphore.release()
+
+    def _slot(self, key: Tuple[str, str], max_in_flight: int) -> asyncio.Semaphore:
+        slot = self._slots.get(key)
+        if slot is None or slot[0] != max_in_flight:
+            slot = self._slots[key] = (max_in_flight, asyncio.Semaphore(max_in_flight))
+        return slot[1]
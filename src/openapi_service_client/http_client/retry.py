@@ -0,0 +1,162 @@
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional
+
+from openapi_service_client.config.configuration import HttpClientConfig
+from openapi_service_client.http_client.rate_limit import retry_after
+
+logger = logging.getLogger(__name__)
+
+# HTTP methods that are idempotent by definition, see https://www.rfc-editor.org/rfc/rfc9110#section-9.2.2
+IDEMPOTENT_METHODS = frozenset({"get", "head", "put", "delete", "options", "trace"})
+
+
+class RetryBudget:
+    """
+    Bounds retries to a fraction of the overall traffic, so that retries cannot multiply the load on a service that
+    is already failing.
+
+    Requests and retries are counted over a sliding window of `window` seconds. A retry is allowed while the
+    retries in the window stay below `ratio` times the requests in the window, or below `min_per_second` retries
+    per second, whichever is more, so that low-traffic clients can still retry.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, window: int = 10):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window = window
+        # per-second slots of [second, requests, retries]
+        self._slots: List[List[int]] = [[0, 0, 0] for _ in range(window)]
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._slot()[1] += 1
+
+    def try_withdraw(self) -> bool:
+        """
+        Withdraws a retry from the budget.
+
+        :return: True if the retry is within the budget and was recorded, False if it must not be made.
+        """
+        with self._lock:
+            current = self._slot()
+            live = [slot for slot in self._slots if current[0] - slot[0] < self.window]
+            requests = sum(slot[1] for slot in live)
+            retries = sum(slot[2] for slot in live)
+            if retries >= max(self.ratio * requests, self.min_per_second * self.window):
+                return False
+            current[2] += 1
+            return True
+
+    def _slot(self) -> List[int]:
+        second = int(time.monotonic())
+        slot = self._slots[second % self.window]
+        if slot[0] != second:
+            slot[:] = [second, 0, 0]
+        return slot
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request attempt is retried, for the retry loops of the HTTP clients.
+
+    - Only idempotent requests are retried: requests with an idempotent HTTP method, and requests of operations
+      that opt in, with the `x-idempotent` specification extension or `HttpClientConfig.idempotent_operations`.
+      A request that failed to connect was never sent and is retried regardless of its method.
+    - Responses with a status in `HttpClientConfig.retry_on_status` (by default 429 and 5xx gateway errors) are
+      retried, after the delay their `Retry-After` header asks for, if any. A response asking for a longer delay
+      than `max_backoff` is not retried, rather than blocking the caller for as long as the service demands.
+    - Otherwise retries back off with decorrelated jitter: each delay is random between `backoff_factor` and
+      three times the previous delay, capped at `max_backoff`, so that clients do not retry in lockstep.
+    - A retry is abandoned if its delay would end past the request's deadline, or if the retry budget (see
+      `RetryBudget`) shared by all requests of the client is spent.
+    """
+
+    def __init__(self, config: HttpClientConfig):
+        self.config = config
+        self.budget = (
+            RetryBudget(config.retry_budget_ratio, config.retry_budget_min_per_second)
+            if config.retry_budget_ratio is not None
+            else None
+        )
+
+    def is_idempotent(self, request: Dict[str, Any]) -> bool:
+        return (
+            request["method"].lower() in IDEMPOTENT_METHODS
+            or bool(request.get("idempotent"))
+            or request.get("operation_id") in self.config.idempotent_operations
+        )
+
+    def start(self, request: Dict[str, Any]) -> "RetryState":
+        """
+        Starts tracking the attempts of a request.
+        """
+        if self.budget is not None:
+            self.budget.record_request()
+        budget = self.config.get_deadline(request)
+        deadline = time.monotonic() + budget if budget else None
+        return RetryState(self, request, deadline)
+
+
+class RetryState:
+    """
+    The retry state of one request, see `RetryPolicy.start`.
+    """
+
+    def __init__(self, policy: RetryPolicy, request: Dict[str, Any], deadline: Optional[float]):
+        self.policy = policy
+        self.request = request
+        self.deadline = deadline
+        self.attempt = 0
+        self._delay = policy.config.backoff_factor
+
+    def retry_after_status(self, status_code: int, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Returns the delay before retrying a request answered with the given status, or None if it is not retried.
+        """
+        if status_code not in self.policy.config.retry_on_status or not self.policy.is_idempotent(self.request):
+            return None
+        return self._next_delay(retry_after(headers))
+
+    def retry_after_error(self, *, connect_error: bool) -> Optional[float]:
+        """
+        Returns the delay before retrying a request whose attempt failed with a network error, or None if it is not
+        retried.
+
+        :param connect_error: Whether the error occurred while connecting, before the request was sent.
+        """
+        if not connect_error and not self.policy.is_idempotent(self.request):
+            return None
+        return self._next_delay(None)
+
+    def remaining(self) -> Optional[float]:
+        return self.deadline - time.monotonic() if self.deadline is not None else None
+
+    def _next_delay(self, requested: Optional[float]) -> Optional[float]:
+        config = self.policy.config
+        if self.attempt >= config.max_retries:
+            return None
+        if requested is None:
+            # jitter, not cryptography
+            self._delay = min(config.max_backoff, random.uniform(config.backoff_factor, self._delay * 3))  # noqa: S311
+            delay = self._delay
+        elif requested > config.max_backoff:
+            logger.warning(
+                f"Not retrying {self.request['url']}, the service asks to retry after {requested:.1f}s, longer than "
+                f"the maximum backoff of {config.max_backoff:.1f}s"
+            )
+            return None
+        else:
+            delay = requested
+        if self.deadline is not None and time.monotonic() + delay >= self.deadline:
+            logger.warning(f"Deadline exceeded after {self.attempt + 1} attempt(s) of {self.request['url']}")
+            return None
+        budget = self.policy.budget
+        if budget is not None and not budget.try_withdraw():
+            logger.warning(f"Retry budget exhausted, not retrying {self.request['url']}")
+            return None
+        self.attempt += 1
+        return delay
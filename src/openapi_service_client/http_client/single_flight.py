@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def flight_key(request: Dict[str, Any], methods: Iterable[str]) -> Optional[str]:
+    """
+    Returns the key identifying identical requests, or None if requests with this method are not coalesced.
+
+    Unlike cache keys, flight keys include the headers, cookies and credentials of the request, so only callers
+    making exactly the same request, on behalf of the same principal, share a response.
+    """
+    if request["method"].lower() not in methods:
+        return None
+    key = json.dumps(
+        [
+            request["method"].lower(),
+            request["url"],
+            request.get("params"),
+            request.get("headers"),
+            request.get("cookies"),
+            request.get("json"),
+            repr(request.get("auth")) if request.get("auth") is not None else None,
+            request.get("max_response_bytes"),
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls made from different threads: the first caller (the leader) runs the call,
+    the others wait for it and share its outcome, result or exception. Once the call completes, the next identical
+    call runs again; SingleFlight deduplicates in-flight work only and caches nothing.
+    """
+
+    def __init__(self, methods: Iterable[str] = ("get", "head")):
+        """
+        :param methods: The HTTP methods whose requests are coalesced, idempotent ones only by default.
+        """
+        self.methods = frozenset(method.lower() for method in methods)
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def get_key(self, request: Dict[str, Any]) -> Optional[str]:
+        return flight_key(request, self.methods)
+
+    def do(self, key: str, call: Callable[[], T], timeout: Optional[float] = None) -> T:
+        """
+        Runs the call, or waits for the identical call already in flight.
+
+        :param key: The key identifying identical calls.
+        :param call: The call to run.
+        :param timeout: How long to wait for an identical call in flight, in seconds, unbounded by default.
+        :return: The result of the call.
+        :raises TimeoutError: If the identical call in flight did not complete within the timeout.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if leader:
+            try:
+                flight.result = call()
+                return flight.result
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+        if not flight.done.wait(timeout):
+            raise TimeoutError(f"Timed out after {timeout}s waiting for an identical request in flight")
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def in_flight(self) -> int:
+        """
+        Returns the number of distinct calls currently in flight.
+        """
+        return len(self._flights)
+
+
+class AsyncSingleFlight:
+    """
+    The asyncio counterpart of `SingleFlight`, coalescing identical concurrent calls made from coroutines.
+
+    The shared call runs as a separate task, so a caller that is cancelled or times out stops waiting without
+    cancelling the call for the other callers.
+    """
+
+    def __init__(self, methods: Iterable[str] = ("get", "head")):
+        self.methods = frozenset(method.lower() for method in methods)
+        self._flights: Dict[str, asyncio.Future[Any]] = {}
+
+    def get_key(self, request: Dict[str, Any]) -> Optional[str]:
+        return flight_key(request, self.methods)
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """
+        Runs the call, or waits for the identical call already in flight, see `SingleFlight.do`.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = asyncio.ensure_future(call())
+            flight.add_done_callback(lambda done: self._complete(key, done))
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight), timeout)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(f"Timed out after {timeout}s waiting for an identical request in flight") from e
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def _complete(self, key: str, flight: "asyncio.Future[Any]") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # mark the exception as retrieved, every caller that still waits receives it through the shield
+            flight.exception()
@@ -1,9 +1,10 @@
 from openapi_service_client.providers.anthropic import AnthropicLLMProvider
 from openapi_service_client.providers.cohere import CohereLLMProvider
-from openapi_service_client.providers.converter import OpenAPISpecificationConverter
+from openapi_service_client.providers.converter import OpenAPISpecificationConverter, get_definition_name
 from openapi_service_client.providers.llm_provider import LLMProvider
 from openapi_service_client.providers.openai import OpenAILLMProvider
 from openapi_service_client.providers.payload_extractor import FunctionPayloadExtractor
+from openapi_service_client.providers.streaming import StreamingPayloadExtractor
 
 __all__ = [
     "LLMProvider",
@@ -12,4 +13,6 @@ __all__ = [
     "OpenAILLMProvider",
     "OpenAPISpecificationConverter",
     "FunctionPayloadExtractor",
+    "StreamingPayloadExtractor",
+    "get_definition_name",
 ]
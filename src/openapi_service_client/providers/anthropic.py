@@ -1,14 +1,29 @@
 from openapi_service_client.providers.llm_provider import LLMProvider, OpenAPISpecificationConverter
 from openapi_service_client.providers.openai import OpenAIConverter
-from openapi_service_client.providers.payload_extractor import DefaultPayloadExtractor, FunctionPayloadExtractor
+from openapi_service_client.providers.payload_extractor import (
+    EACH,
+    DefaultPayloadExtractor,
+    FunctionPayloadExtractor,
+    PayloadPath,
+)
+from openapi_service_client.providers.streaming import AnthropicStreamingPayloadExtractor, StreamingPayloadExtractor
 from openapi_service_client.spec import OpenAPISpecification
 
+# where Anthropic keeps tool calls: the tool_use blocks of a message, and a bare tool_use block
+ANTHROPIC_TOOL_USE_PATHS = (
+    PayloadPath("content", EACH, where={"type": "tool_use"}),
+    PayloadPath(where={"type": "tool_use"}),
+)
+
 
 class AnthropicLLMProvider(LLMProvider):
 
     def get_payload_extractor(self) -> FunctionPayloadExtractor:
         # See how Anthropic LLM function payloads are structured at https://docs.anthropic.com/claude/docs/tool-use
-        return DefaultPayloadExtractor(arguments_field_name="input")
+        return DefaultPayloadExtractor(arguments_field_name="input", fast_paths=ANTHROPIC_TOOL_USE_PATHS)
+
+    def get_streaming_payload_extractor(self) -> StreamingPayloadExtractor:
+        return AnthropicStreamingPayloadExtractor()
 
     def get_schema_converter(self, openapi_spec: OpenAPISpecification) -> OpenAPISpecificationConverter:
         # anthropic is using the same conversion format as OpenAI except for the parameters name
@@ -1,30 +1,50 @@
 import logging
-from typing import Any, Dict, List
-
-import jsonref
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from openapi_service_client.providers.converter import OpenAPISpecificationConverter
 from openapi_service_client.providers.llm_provider import LLMProvider
-from openapi_service_client.providers.payload_extractor import DefaultPayloadExtractor, FunctionPayloadExtractor
+from openapi_service_client.providers.payload_extractor import (
+    EACH,
+    DefaultPayloadExtractor,
+    FunctionPayloadExtractor,
+    PayloadPath,
+)
+from openapi_service_client.providers.streaming import CohereStreamingPayloadExtractor, StreamingPayloadExtractor
 from openapi_service_client.spec import OpenAPISpecification
 
 logger = logging.getLogger(__name__)
 
+# where Cohere keeps tool calls: in a chat response, and a bare tool call
+COHERE_TOOL_CALL_PATHS = (
+    PayloadPath("tool_calls", EACH),
+    PayloadPath(),
+)
+
 
 class CohereConverter(OpenAPISpecificationConverter):
 
     def __init__(self, schema: OpenAPISpecification):
         self.schema = schema
 
-    def convert(self) -> List[Dict[str, Any]]:
-        resolved_schema = jsonref.replace_refs(self.schema.spec_dict)
-        return self._openapi_to_functions(resolved_schema)
+    def convert(self, operation_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        return self._openapi_to_functions(
+            self.schema.spec_dict, set(operation_ids) if operation_ids is not None else None
+        )
 
-    def _openapi_to_functions(self, service_openapi_spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _openapi_to_functions(
+        self, service_openapi_spec: Dict[str, Any], operation_ids: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
+        # references are resolved with the shared resolver of the specification, only for the operations converted
+        resolver = self.schema.get_resolver()
         functions = []
         for _, path_item in service_openapi_spec.get("paths", {}).items():
-            for _, operation in path_item.items():
-                function_dict = self._parse_endpoint(operation)
+            for _, operation in resolver.deref(path_item).items():
+                # path items also hold path-level fields, e.g. the parameters shared by their operations
+                if not isinstance(operation, dict) or (
+                    operation_ids is not None and operation.get("operationId") not in operation_ids
+                ):
+                    continue
+                function_dict = self._parse_endpoint(resolver.resolve(operation))
                 if function_dict:
                     functions.append(function_dict)
         return functions
@@ -109,7 +129,10 @@ class CohereLLMProvider(LLMProvider):
 
     def get_payload_extractor(self) -> FunctionPayloadExtractor:
         # See Cohere LLM function payloads at https://docs.cohere.com/docs/tool-use
-        return DefaultPayloadExtractor(arguments_field_name="parameters")
+        return DefaultPayloadExtractor(arguments_field_name="parameters", fast_paths=COHERE_TOOL_CALL_PATHS)
+
+    def get_streaming_payload_extractor(self) -> StreamingPayloadExtractor:
+        return CohereStreamingPayloadExtractor()
 
     def get_schema_converter(self, openapi_spec: OpenAPISpecification) -> OpenAPISpecificationConverter:
         # See https://docs.cohere.com/docs/tool-use for more information on function definition format.
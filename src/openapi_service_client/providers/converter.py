@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Protocol
+from typing import Any, Dict, Iterable, List, Optional, Protocol
 
 
 class OpenAPISpecificationConverter(Protocol):
@@ -7,9 +7,18 @@ class OpenAPISpecificationConverter(Protocol):
     LLM specific function definitions.
     """
 
-    def convert(self) -> List[Dict[str, Any]]:
+    def convert(self, operation_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
         """
         Converts an OpenAPI specification into a list of LLM specific function definitions.
+        :param operation_ids: if given, only the operations with these operationIds are converted.
         :return: a list of function definitions represented as dictionaries.
         """
         pass
+
+
+def get_definition_name(definition: Dict[str, Any]) -> str:
+    """
+    Returns the function name of an LLM specific function definition, i.e. the operationId it was converted from.
+    """
+    # OpenAI wraps each definition as {"type": "function", "function": {...}}, other providers don't
+    return definition.get("function", definition).get("name")
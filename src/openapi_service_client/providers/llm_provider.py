@@ -2,6 +2,7 @@ from typing import Protocol
 
 from openapi_service_client.providers.converter import OpenAPISpecificationConverter
 from openapi_service_client.providers.payload_extractor import FunctionPayloadExtractor
+from openapi_service_client.providers.streaming import StreamingPayloadExtractor
 from openapi_service_client.spec import OpenAPISpecification
 
 
@@ -23,6 +24,15 @@ class LLMProvider(Protocol):
         """
         pass
 
+    def get_streaming_payload_extractor(self) -> StreamingPayloadExtractor:
+        """
+        Provides a new extractor that assembles function invocations from the chunks of a streamed completion
+        generated by the LLM. Streaming extractors are stateful, a new one is needed for each streamed completion.
+        :return: StreamingPayloadExtractor object capable of assembling function names and arguments from the
+        LLM-generated completion chunks
+        """
+        pass
+
     def get_schema_converter(self, openapi_spec: OpenAPISpecification) -> OpenAPISpecificationConverter:
         """
         Provides a converter that translates an OpenAPI specification into a format that LLMs can understand and utilize
@@ -1,22 +1,36 @@
 import logging
-from typing import Any, Callable, Dict, List, Optional
-
-import jsonref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 
 from openapi_service_client.providers.converter import OpenAPISpecificationConverter
 from openapi_service_client.providers.llm_provider import LLMProvider
-from openapi_service_client.providers.payload_extractor import DefaultPayloadExtractor, FunctionPayloadExtractor
+from openapi_service_client.providers.payload_extractor import (
+    EACH,
+    DefaultPayloadExtractor,
+    FunctionPayloadExtractor,
+    PayloadPath,
+)
+from openapi_service_client.providers.streaming import OpenAIStreamingPayloadExtractor, StreamingPayloadExtractor
 from openapi_service_client.spec import OpenAPISpecification
 
 MIN_REQUIRED_OPENAPI_SPEC_VERSION = 3
 
+# where OpenAI keeps tool calls: in a chat completion, in a single completion message, and a bare tool call
+OPENAI_TOOL_CALL_PATHS = (
+    PayloadPath("choices", EACH, "message", "tool_calls", EACH, function_field="function"),
+    PayloadPath("tool_calls", EACH, function_field="function"),
+    PayloadPath(function_field="function"),
+)
+
 logger = logging.getLogger(__name__)
 
 
 class OpenAILLMProvider(LLMProvider):
 
     def get_payload_extractor(self) -> FunctionPayloadExtractor:
-        return DefaultPayloadExtractor(arguments_field_name="arguments")
+        return DefaultPayloadExtractor(arguments_field_name="arguments", fast_paths=OPENAI_TOOL_CALL_PATHS)
+
+    def get_streaming_payload_extractor(self) -> StreamingPayloadExtractor:
+        return OpenAIStreamingPayloadExtractor()
 
     def get_schema_converter(self, openapi_spec: OpenAPISpecification) -> OpenAPISpecificationConverter:
         # each function in the OpenAI schema needs to be wrapped the below described json object
@@ -35,18 +49,24 @@ class OpenAIConverter(OpenAPISpecificationConverter):
         self.parameters_name = parameters_name
         self.transform_fn = transform_fn
 
-    def convert(self) -> List[Dict[str, Any]]:
-        resolved_schema = jsonref.replace_refs(self.schema.spec_dict)
-        fn_definitions = self._openapi_to_functions(resolved_schema)
+    def convert(self, operation_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        fn_definitions = self._openapi_to_functions(
+            self.schema.spec_dict, set(operation_ids) if operation_ids is not None else None
+        )
         return [self.transform_fn(fn) for fn in fn_definitions] if self.transform_fn else fn_definitions
 
-    def _openapi_to_functions(self, service_openapi_spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _openapi_to_functions(
+        self, service_openapi_spec: Dict[str, Any], operation_ids: Optional[Set[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Extracts functions from the OpenAPI specification of the service and converts them into a format
-        suitable for OpenAI function calling.
+        suitable for OpenAI function calling. References are resolved with the shared resolver of the
+        specification, only for the operations converted.
 
         :param service_openapi_spec: The OpenAPI specification from which functions are to be extracted.
         :type service_openapi_spec: Dict[str, Any]
+        :param operation_ids: If given, only the operations with these operationIds are converted.
+        :type operation_ids: Optional[Set[str]]
         :return: A list of dictionaries, each representing a function. Each dictionary includes the function's
                  name, description, and a schema of its parameters.
         :rtype: List[Dict[str, Any]]
@@ -66,10 +86,15 @@ class OpenAIConverter(OpenAPISpecificationConverter):
                 f"at least {MIN_REQUIRED_OPENAPI_SPEC_VERSION}."
             )
 
+        resolver = self.schema.get_resolver()
         functions: List[Dict[str, Any]] = []
         for paths in service_openapi_spec["paths"].values():
-            for path_spec in paths.values():
-                function_dict = self._parse_endpoint_spec(path_spec)
+            for path_spec in resolver.deref(paths).values():
+                if operation_ids is not None and (
+                    not isinstance(path_spec, dict) or path_spec.get("operationId") not in operation_ids
+                ):
+                    continue
+                function_dict = self._parse_endpoint_spec(resolver.resolve(path_spec))
                 if function_dict:
                     functions.append(function_dict)
         return functions
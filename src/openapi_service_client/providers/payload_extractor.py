@@ -1,6 +1,9 @@
 import dataclasses
 import json
-from typing import Any, Callable, Dict, List, Optional, Protocol, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Sequence, Tuple, Union
+
+# PayloadPath step that iterates over the items of a list
+EACH = "[]"
 
 
 class FunctionPayloadExtractor(Protocol):
@@ -25,6 +28,81 @@ class FunctionPayloadExtractor(Protocol):
         """
         pass
 
+    def extract_function_invocations(self, payload: Any) -> List[Dict[str, Any]]:
+        """
+        Extracts all function invocations from the LLM generated function call payload.
+
+        LLMs can request several function calls in a single completion. Each invocation is returned as a dictionary
+        with the same "name" and "arguments" keys as in `extract_function_invocation`, plus an "id" key holding the
+        tool call id, if the LLM provider assigns one, or None otherwise. Invocations are returned in the order they
+        appear in the payload; if none are found, an empty list should be returned.
+
+        A function call whose arguments cannot be parsed, e.g. truncated JSON, must not prevent the other calls from
+        being invoked. It is returned with None arguments and the parsing error under an "error" key instead, and is
+        reported as failed without being invoked.
+
+        :param payload: The LLM generated function call payload.
+        :returns: A list of dictionaries, each containing the id, name and arguments of a function invocation.
+        """
+        pass
+
+
+class PayloadPath:
+    """
+    A precompiled direct-access path to the function calls in a known LLM completion shape.
+
+    A path is a sequence of steps, each either a field name or `EACH`, which fans out over the items of a list.
+    Fields are read with plain key or attribute access, so dictionaries, dataclasses and SDK model objects (e.g.
+    Pydantic models) are traversed as they are, without converting the whole completion to a dictionary first.
+
+    For example, OpenAI chat completions keep tool calls at `PayloadPath("choices", EACH, "message", "tool_calls",
+    EACH, function_field="function")`, where each tool call carries the id and nests the function name and
+    arguments under `function`.
+    """
+
+    __slots__ = ("function_field", "steps", "where")
+
+    def __init__(self, *steps: str, where: Optional[Dict[str, Any]] = None, function_field: Optional[str] = None):
+        """
+        :param steps: The field names and `EACH` markers leading to the tool calls.
+        :param where: Field values a tool call must have to be selected, e.g. `{"type": "tool_use"}`.
+        :param function_field: The tool call field holding the function name and arguments, if they are nested.
+        """
+        self.steps = steps
+        self.where = where or {}
+        self.function_field = function_field
+
+    def find(self, payload: Any) -> Iterator[Tuple[Any, Optional[str]]]:
+        """
+        Yields each function call found at this path, paired with its tool call id.
+
+        :param payload: The LLM generated completion.
+        :return: An iterator of (function call, tool call id) tuples.
+        """
+        nodes = [payload]
+        for step in self.steps:
+            if step == EACH:
+                nodes = [item for node in nodes if isinstance(node, (list, tuple)) for item in node]
+            else:
+                nodes = [value for value in (get_field(node, step) for node in nodes) if value is not None]
+            if not nodes:
+                return
+        for node in nodes:
+            if all(get_field(node, key) == value for key, value in self.where.items()):
+                tool_call_id = get_field(node, "id")
+                function = get_field(node, self.function_field) if self.function_field else node
+                if function is not None:
+                    yield function, tool_call_id if isinstance(tool_call_id, str) else None
+
+
+def get_field(obj: Any, name: str) -> Any:
+    """
+    Reads a field of a dictionary or an attribute of any other object, returning None if it is missing.
+    """
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
 
 class DefaultPayloadExtractor(FunctionPayloadExtractor):
     """
@@ -33,27 +111,74 @@ class DefaultPayloadExtractor(FunctionPayloadExtractor):
     searching for and extracting necessary fields as specified in the required_fields method.
 
     When encountering a non-dictionary or non-list payload, the extractor will attempt to convert the payload to a
-    dictionary using the get_dict_converter method. If the payload is successfully converted, the extractor will
-    continue the recursive search in the converted dictionary. This allows the extractor to handle payloads that are
+    dictionary using the as_dict method. If the payload is successfully converted, the extractor will continue the
+    recursive search in the converted dictionary. This allows the extractor to handle payloads that are
     instances of dataclasses or other objects that can be converted to dictionaries (e.g. Pydantic models).
+
+    Since the recursive search has to visit every node of a completion, providers can also pass precompiled
+    `PayloadPath`s pointing to where their completions keep function calls. These are tried first and the recursive
+    search only runs if none of them finds a function call.
     """
 
-    def __init__(self, arguments_field_name: str):
+    def __init__(self, arguments_field_name: str, fast_paths: Sequence[PayloadPath] = ()):
         self.arguments_field_name = arguments_field_name
+        self.fast_paths = tuple(fast_paths)
 
     def extract_function_invocation(self, payload: Any) -> Dict[str, Any]:
-        fields_and_values = self.search(payload)
-        if fields_and_values:
-            arguments = fields_and_values.get(self.arguments_field_name)
-            if not isinstance(arguments, (str, dict)):
-                raise ValueError(
-                    f"Invalid {self.arguments_field_name} type {type(arguments)} for function call, expected str/dict"
-                )
+        for fields_and_values, tool_call_id in self.search_fast_paths(payload):
+            return self.to_invocation(fields_and_values, tool_call_id)
+        for fields_and_values, tool_call_id in self.iter_search(payload):
+            return self.to_invocation(fields_and_values, tool_call_id)
+        return {}
+
+    def extract_function_invocations(self, payload: Any) -> List[Dict[str, Any]]:
+        matches = list(self.search_fast_paths(payload)) or self.search_all(payload)
+        return [
+            self._to_invocation_or_error(fields_and_values, tool_call_id) for fields_and_values, tool_call_id in matches
+        ]
+
+    def search_fast_paths(self, payload: Any) -> Iterator[Tuple[Dict[str, Any], Optional[str]]]:
+        """
+        Searches the payload along the precompiled fast paths, stopping at the first path that yields matches.
+
+        :param payload: The LLM generated completion.
+        :return: An iterator of (function payload, tool call id) tuples, empty if no fast path matches.
+        """
+        required_fields = self.required_fields()
+        for path in self.fast_paths:
+            found = False
+            for function, tool_call_id in path.find(payload):
+                fields_and_values = {field: get_field(function, field) for field in required_fields}
+                if all(fields_and_values[field] is not None for field in required_fields):
+                    found = True
+                    yield fields_and_values, tool_call_id
+            if found:
+                return
+
+    def to_invocation(self, fields_and_values: Dict[str, Any], tool_call_id: Optional[str] = None) -> Dict[str, Any]:
+        arguments = fields_and_values.get(self.arguments_field_name)
+        if not isinstance(arguments, (str, dict)):
+            raise ValueError(
+                f"Invalid {self.arguments_field_name} type {type(arguments)} for function call, expected str/dict"
+            )
+        return {
+            "id": fields_and_values.get("id") or tool_call_id,
+            "name": fields_and_values.get("name"),
+            "arguments": json.loads(arguments) if isinstance(arguments, str) else arguments,
+        }
+
+    def _to_invocation_or_error(
+        self, fields_and_values: Dict[str, Any], tool_call_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        try:
+            return self.to_invocation(fields_and_values, tool_call_id)
+        except ValueError as e:
             return {
+                "id": fields_and_values.get("id") or tool_call_id,
                 "name": fields_and_values.get("name"),
-                "arguments": json.loads(arguments) if isinstance(arguments, str) else arguments,
+                "arguments": None,
+                "error": ValueError(f"Invalid arguments of function call {fields_and_values.get('name')!r}: {e}"),
             }
-        return {}
 
     def required_fields(self) -> List[str]:
         return ["name", self.arguments_field_name]
@@ -62,10 +187,8 @@ class DefaultPayloadExtractor(FunctionPayloadExtractor):
         if self.is_primitive(payload):
             return {}
 
-        if dict_converter := self.get_dict_converter(payload):
-            payload = dict_converter()
-        elif dataclasses.is_dataclass(payload):
-            payload = dataclasses.asdict(payload)
+        if not isinstance(payload, (dict, list)):
+            payload = self.as_dict(payload)
 
         if isinstance(payload, dict):
             if all(field in payload for field in self.required_fields()):
@@ -84,6 +207,63 @@ class DefaultPayloadExtractor(FunctionPayloadExtractor):
 
         return {}
 
+    def search_all(self, payload: Any) -> List[Tuple[Dict[str, Any], Optional[str]]]:
+        """
+        Like `search`, but collects every matching payload instead of stopping at the first one.
+
+        Tool call ids are often kept next to the function payload rather than in it, e.g. OpenAI wraps each
+        `{"name": ..., "arguments": ...}` function in a tool call carrying the id. Each match is therefore returned
+        together with the id of the dictionary directly enclosing it.
+
+        :param payload: The payload to search.
+        :return: A list of (matching payload, enclosing id) tuples in the order they were found.
+        """
+        return list(self.iter_search(payload))
+
+    def iter_search(
+        self, payload: Any, parent_id: Optional[str] = None
+    ) -> Iterator[Tuple[Dict[str, Any], Optional[str]]]:
+        """
+        Lazily yields the matches `search_all` returns, so callers interested in the first match only stop early.
+
+        :param payload: The payload to search.
+        :param parent_id: The id of the dictionary directly enclosing the payload, if any.
+        :return: An iterator of (matching payload, enclosing id) tuples in the order they are found.
+        """
+        if self.is_primitive(payload):
+            return
+
+        if not isinstance(payload, (dict, list)):
+            payload = self.as_dict(payload)
+
+        if isinstance(payload, dict):
+            if all(field in payload for field in self.required_fields()):
+                yield payload, parent_id
+                return
+            payload_id = payload.get("id")
+            own_id = payload_id if isinstance(payload_id, str) else None
+            for value in payload.values():
+                yield from self.iter_search(value, own_id)
+
+        elif isinstance(payload, list):
+            for item in payload:
+                yield from self.iter_search(item)
+
+    def as_dict(self, obj: Any) -> Any:
+        """
+        Converts an object to a dictionary the search can descend into.
+
+        Objects with a dict converter (e.g. Pydantic models) are converted with it. Dataclasses are viewed as a
+        shallow dictionary of their fields, leaving nested objects as they are, rather than deep-copied with
+        `dataclasses.asdict`, so the search only converts the parts of a payload it actually visits. Other objects
+        are returned unchanged.
+        """
+        if dict_converter := self.get_dict_converter(obj):
+            return dict_converter()
+        if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+            return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+        return obj
+
     def get_dict_converter(
         self, obj: Any, method_names: Optional[List[str]] = None
     ) -> Union[Callable[[], Dict[str, Any]], None]:
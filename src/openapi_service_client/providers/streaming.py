@@ -0,0 +1,246 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Protocol
+
+from openapi_service_client.providers.payload_extractor import get_field
+
+
+class StreamingPayloadExtractor(Protocol):
+    """
+    StreamingPayloadExtractor specifies the interface for assembling function invocations from the chunks of a
+    streamed LLM completion.
+
+    Function call arguments are streamed as JSON fragments. A streaming extractor accumulates the fragments of each
+    function call and hands out the invocation as soon as its JSON arguments are complete, so it can be invoked while
+    the LLM is still generating the rest of the completion. Streaming extractors are stateful, use a new extractor
+    (see `LLMProvider.get_streaming_payload_extractor`) for each streamed completion.
+    """
+
+    def feed(self, chunk: Any) -> List[Dict[str, Any]]:
+        """
+        Consumes one chunk (delta, event) of the streamed completion.
+
+        :param chunk: The streamed completion chunk.
+        :returns: The function invocations completed by this chunk, as dictionaries with the "id", "name" and
+        "arguments" keys also returned by `FunctionPayloadExtractor.extract_function_invocations`. Like there, an
+        invocation whose arguments cannot be parsed carries the parsing error under an "error" key instead of
+        ending the stream.
+        """
+        pass
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """
+        Signals the end of the stream.
+
+        :returns: The function invocations that were still pending when the stream ended.
+        """
+        pass
+
+
+class _PendingCall:
+    """
+    A function call being assembled from streamed fragments.
+    """
+
+    __slots__ = ("arguments", "depth", "emitted", "escaped", "id", "in_string", "name", "started")
+
+    def __init__(self):
+        self.id: Optional[str] = None
+        self.name: Optional[str] = None
+        self.arguments: List[str] = []
+        self.emitted = False
+        # incremental JSON scanner state, tracks object/array nesting outside of string literals
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def append(self, fragment: str) -> bool:
+        """
+        Appends an arguments fragment.
+
+        :return: True if the fragment closed the top-level JSON value of the arguments.
+        """
+        self.arguments.append(fragment)
+        for char in fragment:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+                self.started = True
+            elif char in "}]":
+                self.depth -= 1
+                if self.started and self.depth == 0:
+                    return True
+        return False
+
+
+class _ToolCallAssembler:
+    """
+    Assembles streamed function calls keyed by their position in the completion, emitting each one exactly once:
+    either as soon as its JSON arguments close, or when the call or the stream ends.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Any, _PendingCall] = {}
+
+    def start(self, key: Any, call_id: Optional[str] = None, name: Optional[str] = None) -> _PendingCall:
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = _PendingCall()
+        if call_id:
+            call.id = call_id
+        if name and not call.name:
+            call.name = name
+        return call
+
+    def append(self, key: Any, fragment: Optional[str]) -> List[Dict[str, Any]]:
+        call = self.start(key)
+        if fragment and not call.emitted and call.append(fragment):
+            return self._emit(call)
+        return []
+
+    def complete(self, key: Any, arguments: Any = None) -> List[Dict[str, Any]]:
+        call = self._calls.get(key)
+        if call is None or call.emitted:
+            return []
+        return self._emit(call, arguments)
+
+    def complete_all(self) -> List[Dict[str, Any]]:
+        return [invocation for key in list(self._calls) for invocation in self.complete(key)]
+
+    def _emit(self, call: _PendingCall, arguments: Any = None) -> List[Dict[str, Any]]:
+        call.emitted = True
+        if not call.name:
+            # deltas that never named a function, e.g. text-only deltas, are not function calls
+            return []
+        if arguments is None:
+            arguments = "".join(call.arguments)
+        if isinstance(arguments, str):
+            try:
+                arguments = json.loads(arguments) if arguments.strip() else {}
+            except ValueError as e:
+                # the other calls of the stream are still assembled and invoked
+                error = ValueError(f"Invalid arguments of function call {call.name!r}: {e}")
+                return [{"id": call.id, "name": call.name, "arguments": None, "error": error}]
+        return [{"id": call.id, "name": call.name, "arguments": arguments}]
+
+
+class OpenAIStreamingPayloadExtractor(StreamingPayloadExtractor):
+    """
+    Assembles function invocations from OpenAI chat completion chunks, where each chunk carries
+    `choices[].delta.tool_calls[]` deltas with the tool call index, and on its first delta the id and function name,
+    followed by `function.arguments` fragments.
+    """
+
+    def __init__(self):
+        self._assembler = _ToolCallAssembler()
+
+    def feed(self, chunk: Any) -> List[Dict[str, Any]]:
+        invocations = []
+        for choice in get_field(chunk, "choices") or []:
+            delta = get_field(choice, "delta")
+            for tool_call in get_field(delta, "tool_calls") or []:
+                key = (get_field(choice, "index"), get_field(tool_call, "index"))
+                function = get_field(tool_call, "function")
+                self._assembler.start(key, get_field(tool_call, "id"), get_field(function, "name"))
+                invocations.extend(self._assembler.append(key, get_field(function, "arguments")))
+            if get_field(choice, "finish_reason"):
+                invocations.extend(self._assembler.complete_all())
+        return invocations
+
+    def finish(self) -> List[Dict[str, Any]]:
+        return self._assembler.complete_all()
+
+
+class AnthropicStreamingPayloadExtractor(StreamingPayloadExtractor):
+    """
+    Assembles function invocations from Anthropic message stream events: a `content_block_start` event opens a
+    `tool_use` block with its id and name, `content_block_delta` events stream its input as `input_json_delta`
+    fragments and `content_block_stop` closes it.
+    """
+
+    def __init__(self):
+        self._assembler = _ToolCallAssembler()
+
+    def feed(self, chunk: Any) -> List[Dict[str, Any]]:
+        event_type = get_field(chunk, "type")
+        key = get_field(chunk, "index")
+        if event_type == "content_block_start":
+            block = get_field(chunk, "content_block")
+            if get_field(block, "type") == "tool_use":
+                self._assembler.start(key, get_field(block, "id"), get_field(block, "name"))
+        elif event_type == "content_block_delta":
+            delta = get_field(chunk, "delta")
+            if get_field(delta, "type") == "input_json_delta":
+                return self._assembler.append(key, get_field(delta, "partial_json"))
+        elif event_type == "content_block_stop":
+            return self._assembler.complete(key)
+        elif event_type == "message_stop":
+            return self._assembler.complete_all()
+        return []
+
+    def finish(self) -> List[Dict[str, Any]]:
+        return self._assembler.complete_all()
+
+
+class CohereStreamingPayloadExtractor(StreamingPayloadExtractor):
+    """
+    Assembles function invocations from Cohere chat stream events.
+
+    Both stream formats are supported: v1 `tool-calls-chunk` events streaming `tool_call_delta` name and parameters
+    fragments, completed by a `tool-calls-generation` event, and v2 `tool-call-start`, `tool-call-delta` and
+    `tool-call-end` events carrying `delta.message.tool_calls`.
+    """
+
+    def __init__(self):
+        self._assembler = _ToolCallAssembler()
+
+    def feed(self, chunk: Any) -> List[Dict[str, Any]]:
+        event_type = get_field(chunk, "event_type") or get_field(chunk, "type")
+        if event_type == "tool-calls-chunk":
+            delta = get_field(chunk, "tool_call_delta")
+            if delta is None:
+                return []
+            key = get_field(delta, "index")
+            self._assembler.start(key, name=get_field(delta, "name"))
+            return self._assembler.append(key, get_field(delta, "parameters"))
+        if event_type == "tool-calls-generation":
+            invocations = []
+            for index, tool_call in enumerate(get_field(chunk, "tool_calls") or []):
+                self._assembler.start(index, name=get_field(tool_call, "name"))
+                invocations.extend(self._assembler.complete(index, get_field(tool_call, "parameters") or {}))
+            return invocations
+        if event_type in ("tool-call-start", "tool-call-delta", "tool-call-end"):
+            key = get_field(chunk, "index")
+            if event_type == "tool-call-end":
+                return self._assembler.complete(key)
+            tool_call = get_field(get_field(get_field(chunk, "delta"), "message"), "tool_calls")
+            function = get_field(tool_call, "function")
+            self._assembler.start(key, get_field(tool_call, "id"), get_field(function, "name"))
+            return self._assembler.append(key, get_field(function, "arguments"))
+        if event_type in ("stream-end", "message-end"):
+            return self._assembler.complete_all()
+        return []
+
+    def finish(self) -> List[Dict[str, Any]]:
+        return self._assembler.complete_all()
+
+
+def iter_function_invocations(extractor: StreamingPayloadExtractor, chunks: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the function invocations of a streamed completion as soon as each one is complete.
+
+    :param extractor: A fresh streaming extractor for the provider that generated the stream.
+    :param chunks: The chunks of the streamed completion.
+    :returns: An iterator of function invocations in completion order.
+    """
+    for chunk in chunks:
+        yield from extractor.feed(chunk)
+    yield from extractor.finish()
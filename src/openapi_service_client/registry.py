@@ -0,0 +1,261 @@
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from openapi_service_client.client import (
+    InvocationResult,
+    OpenAPIClientError,
+    OpenAPIServiceClient,
+    extraction_error,
+    invoke_all_safely,
+)
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.config import AuthenticationStrategy, HttpClientConfig, ResponseShapingConfig
+from openapi_service_client.http_client import HttpClient, RequestsHttpClient, ResponseCache
+from openapi_service_client.providers import LLMProvider, OpenAILLMProvider, get_definition_name
+from openapi_service_client.spec import CompiledSpecCache, ReloadableSpec, SpecFetcher
+
+
+class _Service:
+    """
+    A service registered with a `ServiceRegistry`, and its client once the specification is loaded.
+    """
+
+    __slots__ = ("client", "credentials", "name", "openapi_spec", "response_shaping_config")
+
+    def __init__(
+        self,
+        name: str,
+        openapi_spec: Union[str, Path, Dict[str, Any], ReloadableSpec],
+        credentials: Optional[Union[str, Dict[str, Any], AuthenticationStrategy]],
+        response_shaping_config: Optional[ResponseShapingConfig],
+    ):
+        self.name = name
+        self.openapi_spec = openapi_spec
+        self.credentials = credentials
+        self.response_shaping_config = response_shaping_config
+        self.client: Optional[OpenAPIServiceClient] = None
+
+
+class ServiceRegistry:
+    """
+    Exposes the operations of many OpenAPI specifications to one LLM as a single set of tools, and routes the
+    function invocations of the LLM to the service they belong to.
+
+    Each service is registered under a name with its specification and credentials. Specifications are loaded on
+    first use: `get_client` loads the specification of one service, while `get_tools_definitions` and `invoke`
+    load all specifications not loaded yet, since tool names must be unique across all of them. Operations keep
+    their operationId as tool name unless it is used by more than one service; such operations are exposed as
+    `<service name><separator><operationId>` instead, in every service declaring them. With `namespace_all`, all
+    tool names are prefixed this way. Invocations are routed to their service and operation with a single lookup
+    of the tool name.
+
+    All services share one LLM provider and one HTTP client, and therefore one connection pool, response cache
+    and set of rate limits.
+
+    Example usage:
+
+    ```python
+    registry = (
+        ServiceRegistry(provider=AnthropicLLMProvider())
+        .register("serper", "https://bit.ly/serper_dev_spec_yaml", credentials=os.getenv("SERPERDEV_API_KEY"))
+        .register("github", "specs/github.yml", credentials=os.getenv("GITHUB_TOKEN"))
+    )
+    tools = registry.get_tools_definitions()
+    # ... pass the tools to the LLM, then
+    service_response = registry.invoke(response)
+    ```
+    """
+
+    def __init__(
+        self,
+        provider: Optional[LLMProvider] = None,
+        *,
+        http_client: Optional[HttpClient] = None,
+        http_client_config: Optional[HttpClientConfig] = None,
+        response_cache: Optional[ResponseCache] = None,
+        namespace_all: bool = False,
+        separator: str = "__",
+        spec_cache: Optional[CompiledSpecCache] = None,
+        spec_fetcher: Optional[SpecFetcher] = None,
+    ):
+        """
+        :param provider: The LLM provider of the tool definitions and function invocations, defaults to
+        `OpenAILLMProvider`.
+        :param http_client: The HTTP client shared by all services, defaults to a `RequestsHttpClient`.
+        :param http_client_config: The configuration of the default HTTP client.
+        :param response_cache: The response cache of the default HTTP client.
+        :param namespace_all: Whether all tool names are prefixed with their service name, not only colliding ones.
+        :param separator: The separator between the service name and the operationId in prefixed tool names.
+        :param spec_cache: The cache of compiled specifications and tool definitions shared by all services, see
+        `CompiledSpecCache`.
+        :param spec_fetcher: Fetches the specifications given as a URL, see `SpecFetcher`.
+        """
+        self.provider = provider or OpenAILLMProvider()
+        self.http_client_config = http_client_config or HttpClientConfig()
+        self.http_client = http_client or RequestsHttpClient(self.http_client_config, cache=response_cache)
+        self.payload_extractor = self.provider.get_payload_extractor()
+        self.namespace_all = namespace_all
+        self.separator = separator
+        self.spec_cache = spec_cache
+        self.spec_fetcher = spec_fetcher
+        self._services: Dict[str, _Service] = {}
+        # tool name -> (service name, operationId), built once all specifications are loaded
+        self._routes: Optional[Dict[str, Tuple[str, str]]] = None
+        self._lock = threading.RLock()
+
+    def register(
+        self,
+        name: str,
+        openapi_spec: Union[str, Path, Dict[str, Any], ReloadableSpec],
+        credentials: Optional[Union[str, Dict[str, Any], AuthenticationStrategy]] = None,
+        response_shaping_config: Optional[ResponseShapingConfig] = None,
+    ) -> "ServiceRegistry":
+        """
+        Registers a service. Its specification is not loaded until it is used.
+
+        :param name: The unique name of the service, used to prefix colliding tool names.
+        :param openapi_spec: The OpenAPI specification as a URL, file path, or dictionary, or a `ReloadableSpec`;
+        tool names are routed anew whenever it is reloaded.
+        :param credentials: The credentials of the service, see `ClientConfigurationBuilder.with_credentials`.
+        :param response_shaping_config: How the responses of the service are shaped, see `ResponseShapingConfig`.
+        :return: The registry, to allow for method chaining.
+        :raises ValueError: If a service with the same name is already registered.
+        """
+        with self._lock:
+            if name in self._services:
+                raise ValueError(f"A service named {name!r} is already registered")
+            self._services[name] = _Service(name, openapi_spec, credentials, response_shaping_config)
+            self._routes = None
+        return self
+
+    def get_service_names(self) -> List[str]:
+        return list(self._services)
+
+    def get_client(self, name: str) -> OpenAPIServiceClient:
+        """
+        Returns the client of a registered service, loading its specification on first use.
+
+        :raises ValueError: If no service with this name is registered.
+        """
+        service = self._services.get(name)
+        if service is None:
+            raise ValueError(f"No service named {name!r} is registered")
+        if service.client is None:
+            with self._lock:
+                if service.client is None:
+                    builder = (
+                        ClientConfigurationBuilder()
+                        .with_openapi_spec(service.openapi_spec)
+                        .with_provider(self.provider)
+                        .with_http_client(self.http_client)
+                        .with_http_client_config(self.http_client_config)
+                    )
+                    if self.spec_cache is not None:
+                        builder.with_spec_cache(self.spec_cache)
+                    if self.spec_fetcher is not None:
+                        builder.with_spec_fetcher(self.spec_fetcher)
+                    if service.credentials is not None:
+                        builder.with_credentials(service.credentials)
+                    if service.response_shaping_config is not None:
+                        builder.with_response_shaping(service.response_shaping_config)
+                    if isinstance(service.openapi_spec, ReloadableSpec):
+                        service.openapi_spec.add_listener(self._reset_routes)
+                    service.client = OpenAPIServiceClient(builder.build())
+        return service.client
+
+    def get_tools_definitions(self) -> List[Dict[str, Any]]:
+        """
+        Returns the LLM specific function definitions of the operations of all registered services, named as they
+        are routed by `invoke`.
+        """
+        tool_names = {route: name for name, route in self._get_routes().items()}
+        definitions = []
+        for service_name in self._services:
+            for definition in self.get_client(service_name).client_config.get_tools_definitions():
+                name = get_definition_name(definition)
+                tool_name = tool_names.get((service_name, name))
+                if tool_name is None:
+                    raise OpenAPIClientError(
+                        f"Tool {name!r} of service {service_name!r} does not name an operation of the service"
+                    )
+                definitions.append(_renamed(definition, tool_name))
+        return definitions
+
+    def resolve(self, tool_name: str) -> Tuple[str, str]:
+        """
+        Returns the service name and operationId a tool name is routed to.
+
+        :raises OpenAPIClientError: If no registered service has an operation with this tool name.
+        """
+        route = self._get_routes().get(tool_name)
+        if route is None:
+            raise OpenAPIClientError(f"No registered service has an operation named {tool_name!r}")
+        return route
+
+    def invoke(self, function_payload: Any) -> Any:
+        """
+        Invokes the function specified in the function payload on the service it belongs to.
+
+        :param function_payload: The function payload containing the details of the function to be invoked.
+        :returns: The response from the service after invoking the function.
+        :raises OpenAPIClientError: If the function invocation payload cannot be extracted from the function payload
+        or does not name an operation of a registered service.
+        :raises HttpClientError: If an error occurs while sending the request and receiving the response.
+        """
+        fn_invocation_payload = self.payload_extractor.extract_function_invocation(function_payload)
+        if not fn_invocation_payload:
+            raise extraction_error(self.payload_extractor, function_payload)
+        return self._invoke(fn_invocation_payload)
+
+    def invoke_all(self, function_payload: Any, max_workers: Optional[int] = None) -> List[InvocationResult]:
+        """
+        Invokes all functions specified in the function payload in parallel, each on the service it belongs to,
+        see `OpenAPIServiceClient.invoke_all`.
+        """
+        return invoke_all_safely(self.payload_extractor, function_payload, self._invoke, max_workers)
+
+    def _invoke(self, fn_invocation_payload: Dict[str, Any]) -> Any:
+        service_name, operation_id = self.resolve(fn_invocation_payload.get("name"))
+        client = self.get_client(service_name)
+        return client.invoke_function({**fn_invocation_payload, "name": operation_id})
+
+    def _reset_routes(self, *_):
+        with self._lock:
+            self._routes = None
+
+    def _get_routes(self) -> Dict[str, Tuple[str, str]]:
+        routes = self._routes
+        if routes is None:
+            with self._lock:
+                routes = self._routes
+                if routes is None:
+                    routes = self._routes = self._build_routes()
+        return routes
+
+    def _build_routes(self) -> Dict[str, Tuple[str, str]]:
+        operation_ids = {name: self.get_client(name).openapi_spec.get_operation_ids() for name in self._services}
+        declared_by: Dict[str, int] = {}
+        for ids in operation_ids.values():
+            for operation_id in ids:
+                declared_by[operation_id] = declared_by.get(operation_id, 0) + 1
+        routes: Dict[str, Tuple[str, str]] = {}
+        for service_name, ids in operation_ids.items():
+            for operation_id in ids:
+                if self.namespace_all or declared_by[operation_id] > 1:
+                    tool_name = f"{service_name}{self.separator}{operation_id}"
+                else:
+                    tool_name = operation_id
+                if tool_name in routes:
+                    raise ValueError(f"Tool name {tool_name!r} is ambiguous, rename service {service_name!r}")
+                routes[tool_name] = (service_name, operation_id)
+        return routes
+
+
+def _renamed(definition: Dict[str, Any], name: str) -> Dict[str, Any]:
+    # OpenAI wraps each definition as {"type": "function", "function": {...}}, other providers don't
+    if definition.get("name") == name or definition.get("function", {}).get("name") == name:
+        return definition
+    if "function" in definition:
+        return {**definition, "function": {**definition["function"], "name": name}}
+    return {**definition, "name": name}
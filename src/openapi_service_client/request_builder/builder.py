@@ -1,8 +1,8 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 from openapi_service_client.client import ClientConfiguration
-from openapi_service_client.config import PassThroughAuthentication
-from openapi_service_client.spec import Operation
+from openapi_service_client.config import AuthenticationStrategy, PassThroughAuthentication
+from openapi_service_client.spec import OpenAPISpecification, Operation
 
 
 class RequestBuilder:
@@ -10,14 +10,30 @@ class RequestBuilder:
         self,
         client_config: ClientConfiguration,
     ):
-        self.openapi_parser = client_config.get_openapi_spec()
+        self.client_config = client_config
         self.http_client = client_config.get_http_client()
-        self.auth_config = client_config.get_auth_config() or PassThroughAuthentication()
+        # the authentication strategy and the spec version it was created for
+        self._auth: Tuple[Optional[OpenAPISpecification], AuthenticationStrategy] = (None, PassThroughAuthentication())
+
+    @property
+    def openapi_parser(self) -> OpenAPISpecification:
+        return self.client_config.get_openapi_spec()
+
+    @property
+    def auth_config(self) -> AuthenticationStrategy:
+        # string credentials are turned into a strategy for the security schemes of the spec, so the strategy is
+        # created anew when a reloadable spec is swapped
+        openapi_spec = self.client_config.get_openapi_spec()
+        auth_spec, auth_config = self._auth
+        if auth_spec is not openapi_spec:
+            auth_config = self.client_config.get_auth_config() or PassThroughAuthentication()
+            self._auth = (openapi_spec, auth_config)
+        return auth_config
 
     def build_request(self, operation: Operation, **kwargs) -> Any:
         url = self._build_url(operation, **kwargs)
         method = operation.method.lower()
-        headers = self._build_headers(operation)
+        headers = self._build_headers(operation, **kwargs)
         query_params = self._build_query_params(operation, **kwargs)
         body = self._build_request_body(operation, **kwargs)
 
@@ -27,43 +43,58 @@ class RequestBuilder:
             "headers": headers,
             "params": query_params,
             "json": body,
+            "operation_id": operation.get_field("operationId"),
+            "server_url": operation.get_server_url(),
+            "response_mode": operation.get_response_mode(),
         }
+        # per-operation time budgets declared in the spec, HTTP clients read them from the request
+        if timeout := operation.get_field("x-timeout"):
+            request["timeout"] = float(timeout)
+        if deadline := operation.get_field("x-deadline"):
+            request["deadline"] = float(deadline)
+        # non-idempotent operations that are safe to retry, e.g. POST operations taking an idempotency key
+        if operation.get_field("x-idempotent"):
+            request["idempotent"] = True
+        # client-side rate limits declared in the spec, per operation and for the spec's server host
+        if operation_rate_limit := operation.get_field("x-ratelimit"):
+            request["operation_rate_limit"] = operation_rate_limit
+        if host_rate_limit := operation.spec_dict.get("x-ratelimit"):
+            request["host_rate_limit"] = host_rate_limit
         self._apply_authentication(operation, request)
         return request
 
     def _build_headers(self, operation: Operation, **kwargs) -> Dict[str, str]:
         headers = {}
-
+        required = operation.get_required_parameter_names("header")
         for parameter in operation.get_parameters("header"):
             param_value = kwargs.get(parameter["name"], None)
             if param_value:
                 headers[parameter["name"]] = str(param_value)
-            elif parameter.get("required", False):
+            elif parameter["name"] in required:
                 raise ValueError(f"Missing required header parameter: {parameter['name']}")
         return headers
 
     def _build_url(self, operation: Operation, **kwargs) -> str:
-        server_url = operation.get_server_url()
-        path = operation.path
-
+        path_params = {}
+        required = operation.get_required_parameter_names("path")
         for parameter in operation.get_parameters("path"):
             param_value = kwargs.get(parameter["name"], None)
             if param_value:
-                path = path.replace(f"{{{parameter['name']}}}", str(param_value))
-            elif parameter.get("required", False):
+                path_params[parameter["name"]] = str(param_value)
+            elif parameter["name"] in required:
                 raise ValueError(f"Missing required path parameter: {parameter['name']}")
 
-        return server_url + path
+        return operation.get_server_url() + operation.render_path(path_params)
 
     def _build_query_params(self, operation: Operation, **kwargs) -> Dict[str, Any]:
         query_params = {}
-
+        required = operation.get_required_parameter_names("query")
         # Simplify query parameter assembly using _get_parameter_value
         for parameter in operation.get_parameters("query"):
             param_value = kwargs.get(parameter["name"], None)
             if param_value:
                 query_params[parameter["name"]] = param_value
-            elif parameter.get("required", False):
+            elif parameter["name"] in required:
                 raise ValueError(f"Missing required query parameter: {parameter['name']}")
         return query_params
 
@@ -87,9 +118,22 @@ class RequestBuilder:
         security_schemes = operation.spec_dict.get("components", {}).get("securitySchemes", {})
 
         if security_requirements:
+            auth_config = self.auth_config
+            params_before = dict(request["params"])
+            headers_before = dict(request["headers"])
+            cookies_before = dict(request.get("cookies") or {})
             for requirement in security_requirements:
                 for scheme_name in requirement:
                     if scheme_name in security_schemes:
                         security_scheme = security_schemes[scheme_name]
-                        self.auth_config.apply_auth(security_scheme, request)
+                        auth_config.apply_auth(security_scheme, request)
                     break
+            # credentials placed in the query, headers and cookies, left out of cache keys by the HTTP clients
+            for key, location, before in (
+                ("auth_params", "params", params_before),
+                ("auth_headers", "headers", headers_before),
+                ("auth_cookies", "cookies", cookies_before),
+            ):
+                added = [name for name, value in (request.get(location) or {}).items() if before.get(name) != value]
+                if added:
+                    request[key] = added
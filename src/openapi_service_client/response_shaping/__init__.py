@@ -0,0 +1,3 @@
+from openapi_service_client.response_shaping.shaper import ResponseShaper
+
+__all__ = ["ResponseShaper"]
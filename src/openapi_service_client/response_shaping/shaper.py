@@ -0,0 +1,184 @@
+from typing import Any, Dict, List, Optional, Set
+
+from openapi_service_client.config import ResponseShapingConfig
+from openapi_service_client.http_client import ResponseTooLargeError
+
+# matches any object key or array index in a pointer of `ResponseShapingConfig.include_fields`
+WILDCARD = "*"
+
+# trie node marking a pointer's target, kept together with everything below it
+_KEEP: Dict[str, Any] = {}
+
+
+class _ShapingReport:
+    __slots__ = ("dropped_fields", "trimmed_arrays")
+
+    def __init__(self):
+        self.dropped_fields: Set[str] = set()
+        self.trimmed_arrays: Dict[str, int] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {}
+        if self.dropped_fields:
+            report["dropped_fields"] = sorted(self.dropped_fields)
+        if self.trimmed_arrays:
+            report["trimmed_arrays"] = dict(sorted(self.trimmed_arrays.items()))
+        return report
+
+
+class ResponseShaper:
+    """
+    Shapes service responses before they are returned to the LLM, according to a `ResponseShapingConfig`: caps the
+    response size, prunes JSON responses to the allowed fields, trims arrays and reports what was dropped.
+
+    The byte cap is enforced by the HTTP client while the response is downloaded; `prepare` adds it to the request
+    as the `max_response_bytes` key.
+    """
+
+    def __init__(self, config: Optional[ResponseShapingConfig] = None):
+        self.config = config
+        # compiled include_fields allowlists, per operationId
+        self._allowlists: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def prepare(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adds the byte cap of the request's operation to the request, if any.
+
+        :param request: The request built by the `RequestBuilder`.
+        :return: The same request.
+        """
+        if self.config is not None:
+            max_bytes = self.config.get_max_response_bytes(request.get("operation_id"))
+            if max_bytes:
+                request["max_response_bytes"] = max_bytes
+        return request
+
+    def shape(self, request: Dict[str, Any], response: Any) -> Any:
+        """
+        Prunes and trims a decoded response.
+
+        :param request: The request the response was received for.
+        :param response: The decoded response.
+        :return: The shaped response, with a report of what was dropped if anything was.
+        """
+        if self.config is None or not isinstance(response, (dict, list)):
+            return response
+        operation_id = request.get("operation_id")
+        allowlist = self._get_allowlist(operation_id)
+        max_items = self.config.get_max_array_items(operation_id)
+        if allowlist is None and not max_items:
+            return response
+        report = _ShapingReport()
+        shaped = _shape(response, allowlist, "", max_items, report)
+        return self._with_report(shaped, report.to_dict())
+
+    def shape_truncated(self, error: ResponseTooLargeError) -> Any:
+        """
+        Turns a response cut at its byte cap into a shaped response: the received part of the body, as text.
+
+        :param error: The error raised by the HTTP client when the byte cap was reached.
+        :return: The truncated body with a report of the byte cap.
+        """
+        content = error.content.decode("utf-8", errors="ignore")
+        return self._with_report(content, {"max_response_bytes": error.limit})
+
+    def _with_report(self, response: Any, report: Dict[str, Any]) -> Any:
+        report_field = self.config.report_field
+        if not report or not report_field:
+            return response
+        if isinstance(response, dict):
+            return {**response, report_field: report}
+        return {"content": response, report_field: report}
+
+    def _get_allowlist(self, operation_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        if operation_id not in self._allowlists:
+            pointers = self.config.include_fields.get(operation_id) if operation_id else None
+            self._allowlists[operation_id] = compile_pointers(pointers) if pointers else None
+        return self._allowlists[operation_id]
+
+
+def compile_pointers(pointers: List[str]) -> Dict[str, Any]:
+    """
+    Compiles JSON pointers into a trie of their reference tokens.
+
+    :param pointers: JSON pointers, where the `*` token matches any object key or array index.
+    :return: The trie, nested dictionaries keyed by reference token.
+    :raises ValueError: If a pointer is not a valid JSON pointer.
+    """
+    trie: Dict[str, Any] = {}
+    for pointer in pointers:
+        if pointer == "":
+            return _KEEP
+        if not pointer.startswith("/"):
+            raise ValueError(f"Invalid JSON pointer {pointer!r}, must be empty or start with '/'")
+        tokens = [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+        node = trie
+        for token in tokens[:-1]:
+            child = node.get(token)
+            if child is _KEEP:
+                break
+            node = node.setdefault(token, {})
+        else:
+            node[tokens[-1]] = _KEEP
+    return trie
+
+
+def _child(trie: Dict[str, Any], token: str) -> Optional[Dict[str, Any]]:
+    return _merge(trie.get(token), trie.get(WILDCARD))
+
+
+def _merge(first: Optional[Dict[str, Any]], second: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if first is None or second is None:
+        return second if first is None else first
+    if first is _KEEP or second is _KEEP:
+        return _KEEP
+    return {token: _merge(first.get(token), second.get(token)) for token in {*first, *second}}
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _shape(
+    value: Any, allowlist: Optional[Dict[str, Any]], path: str, max_items: Optional[int], report: _ShapingReport
+) -> Any:
+    # allowlist None means no allowlist applies (any longer), _KEEP that the value is kept as a whole
+    if allowlist is _KEEP:
+        allowlist = None
+    if isinstance(value, dict):
+        if allowlist is None and not max_items:
+            return value
+        shaped = {}
+        for key, item in value.items():
+            child = allowlist
+            if allowlist is not None:
+                child = _child(allowlist, key)
+                if child is None:
+                    report.dropped_fields.add(f"{path}/{_escape(key)}")
+                    continue
+            if isinstance(item, (dict, list)):
+                shaped[key] = _shape(item, child, f"{path}/{_escape(key)}", max_items, report)
+            else:
+                shaped[key] = item
+        return shaped
+    if isinstance(value, list):
+        if max_items and len(value) > max_items:
+            report.trimmed_arrays[path] = max(len(value), report.trimmed_arrays.get(path, 0))
+            value = value[:max_items]
+        elif allowlist is None and not max_items:
+            return value
+        items_path = f"{path}/{WILDCARD}"
+        shaped_items = []
+        for index, item in enumerate(value):
+            child = allowlist
+            if allowlist is not None:
+                child = _child(allowlist, str(index))
+                if child is None:
+                    report.dropped_fields.add(items_path)
+                    continue
+            if isinstance(item, (dict, list)):
+                shaped_items.append(_shape(item, child, items_path, max_items, report))
+            else:
+                shaped_items.append(item)
+        return shaped_items
+    return value
@@ -1,4 +1,16 @@
+from openapi_service_client.spec.cache import CompiledSpecCache
+from openapi_service_client.spec.fetcher import FetchedSpec, SpecFetcher
 from openapi_service_client.spec.open_api_spec import OpenAPISpecification
 from openapi_service_client.spec.operation import Operation
+from openapi_service_client.spec.reloadable import ReloadableSpec
+from openapi_service_client.spec.resolver import RefResolver
 
-__all__ = ["OpenAPISpecification", "Operation"]
+__all__ = [
+    "CompiledSpecCache",
+    "FetchedSpec",
+    "OpenAPISpecification",
+    "Operation",
+    "RefResolver",
+    "ReloadableSpec",
+    "SpecFetcher",
+]
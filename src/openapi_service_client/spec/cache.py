@@ -0,0 +1,121 @@
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# bump whenever the classes stored in compiled specifications change, so that older cache files are not loaded
+CACHE_FORMAT_VERSION = 3
+
+
+def _library_version() -> str:
+    try:
+        return version("openapi-service-client")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class CompiledSpecCache:
+    """
+    A directory of compiled OpenAPI specifications, for a fast cold start of processes loading large specifications.
+
+    A compiled specification is an `OpenAPISpecification` as it is after loading: the parsed specification
+    dictionary, its compiled operations and the operationId index. It is stored under a hash of the specification
+    source, so a changed source is simply a cache miss, and read back with a single read, skipping the JSON or YAML
+    parsing and compilation. Tool definitions converted for an LLM provider are stored alongside, keyed by the
+    specification fingerprint and the provider.
+
+    Cache keys also include `CACHE_FORMAT_VERSION`, the library version and the Python version, so cache files
+    written by another version are never loaded. Files that cannot be loaded are ignored and rewritten.
+
+    Cache files are pickles, and loading a pickle can execute arbitrary code: the cache directory must be trusted,
+    only use a directory that cannot be written by untrusted parties. The cache key and version checks guard against
+    stale files, not against tampered ones.
+
+    To compile specifications ahead of time, e.g. while building a container image, build a configuration with the
+    cache and request its tool definitions:
+
+    ```python
+    cache = CompiledSpecCache(".spec-cache")
+    for spec in ["specs/search.yml", "specs/github.yml"]:
+        ClientConfigurationBuilder().with_openapi_spec(spec).with_spec_cache(cache).build().get_tools_definitions()
+    ```
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._version = f"{CACHE_FORMAT_VERSION}:{_library_version()}:{sys.version_info[0]}.{sys.version_info[1]}"
+
+    def get_key(self, content: Union[str, bytes]) -> str:
+        """
+        Returns the cache key of a specification source.
+        """
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        return hashlib.sha256(self._version.encode("utf-8") + b"\0" + data).hexdigest()
+
+    def load(self, content: Union[str, bytes]) -> Optional[Any]:
+        """
+        Returns the compiled specification of a specification source, or None if it is not in the cache.
+        """
+        return self._read(self.directory / f"{self.get_key(content)}.spec")
+
+    def store(self, content: Union[str, bytes], openapi_spec: Any) -> None:
+        """
+        Stores the compiled specification of a specification source.
+        """
+        # the fingerprint is computed upfront, so that it is part of the compiled specification
+        openapi_spec.get_fingerprint()
+        self._write(self.directory / f"{self.get_key(content)}.spec", openapi_spec)
+
+    def load_tools_definitions(self, fingerprint: str, provider: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Returns the tool definitions of a specification converted for a provider, or None if they are not cached.
+
+        :param fingerprint: The fingerprint of the specification, see `OpenAPISpecification.get_fingerprint`.
+        :param provider: The fully qualified class name of the LLM provider.
+        """
+        return self._read(self._tools_path(fingerprint, provider))
+
+    def store_tools_definitions(self, fingerprint: str, provider: str, definitions: List[Dict[str, Any]]) -> None:
+        self._write(self._tools_path(fingerprint, provider), definitions)
+
+    def clear(self) -> None:
+        """
+        Removes all compiled specifications and tool definitions.
+        """
+        for path in self.directory.iterdir():
+            if path.suffix in (".spec", ".tools"):
+                path.unlink(missing_ok=True)
+
+    def _tools_path(self, fingerprint: str, provider: str) -> Path:
+        return self.directory / f"{self.get_key(f'{fingerprint}:{provider}')}.tools"
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Any]:
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            # cache files are only read from the trusted cache directory, see the class docstring
+            return pickle.loads(data)  # noqa: S301
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable compiled specification cache file {path}: {e}")
+            return None
+
+    def _write(self, path: Path, value: Any) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
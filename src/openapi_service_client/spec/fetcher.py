@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FETCH_TIMEOUT = 10.0
+
+# a mirrored specification source and its metadata: URL, validators, content type and size
+_Mirrored = Tuple[bytes, Dict[str, Any]]
+
+
+class FetchedSpec(NamedTuple):
+    """
+    A specification source fetched by a `SpecFetcher`.
+    """
+
+    content: bytes
+    content_type: Optional[str]
+    # whether the content was served from the mirror without confirming it is current
+    stale: bool = False
+
+
+class SpecFetcher:
+    """
+    Fetches specification sources over HTTP through a pooled session, optionally keeping an on-disk mirror of them.
+
+    With a mirror, every fetched specification is stored along with its `ETag` and `Last-Modified` validators.
+    Later fetches are conditional requests, answered with a cheap `304 Not Modified` while the specification is
+    unchanged. If the host is slow or down, the mirrored copy is used instead of failing, so processes still start
+    with the last specification they saw.
+
+    With `stale_while_revalidate`, a mirrored specification is returned at once, without waiting for the host, and
+    revalidated in the background; the refreshed copy is used by the next fetch, e.g. the next process start.
+
+    Example usage:
+
+    ```python
+    fetcher = SpecFetcher(mirror_dir=".spec-mirror", stale_while_revalidate=True)
+    config = ClientConfigurationBuilder().with_openapi_spec(url).with_spec_fetcher(fetcher).build()
+    ```
+    """
+
+    def __init__(
+        self,
+        mirror_dir: Optional[Union[str, Path]] = None,
+        *,
+        stale_while_revalidate: bool = False,
+        timeout: float = DEFAULT_FETCH_TIMEOUT,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        :param mirror_dir: The directory of the on-disk mirror, specifications are not mirrored if not given.
+        :param stale_while_revalidate: Whether mirrored specifications are returned at once and revalidated in the
+        background, rather than revalidated before they are returned.
+        :param timeout: The timeout of fetch requests, in seconds.
+        :param session: The session fetch requests are sent with, defaults to a new session.
+        """
+        self.mirror_dir = Path(mirror_dir) if mirror_dir is not None else None
+        if self.mirror_dir is not None:
+            self.mirror_dir.mkdir(parents=True, exist_ok=True)
+        self.stale_while_revalidate = stale_while_revalidate
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self._refreshes: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str) -> FetchedSpec:
+        """
+        Fetches a specification source.
+
+        :param url: The URL of the specification.
+        :return: The fetched specification.
+        :raises ConnectionError: If the specification can neither be fetched nor served from the mirror.
+        """
+        mirrored = self._read_mirror(url)
+        if mirrored is not None and self.stale_while_revalidate:
+            self._refresh_in_background(url, mirrored)
+            return FetchedSpec(mirrored[0], mirrored[1].get("content_type"), stale=True)
+        try:
+            return self._fetch(url, mirrored)
+        except requests.RequestException as e:
+            if mirrored is None:
+                raise ConnectionError(f"Failed to fetch the specification from URL: {url}. {e!s}") from e
+            logger.warning(f"Failed to fetch the specification from URL: {url}, using the mirrored copy. {e!s}")
+            return FetchedSpec(mirrored[0], mirrored[1].get("content_type"), stale=True)
+
+    def wait_for_refreshes(self, timeout: Optional[float] = None) -> None:
+        """
+        Waits for the background revalidations started so far to complete, e.g. before a process exits.
+        """
+        with self._lock:
+            refreshes = list(self._refreshes.values())
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in refreshes:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def _fetch(self, url: str, mirrored: Optional[_Mirrored]) -> FetchedSpec:
+        headers = {}
+        if mirrored is not None:
+            if etag := mirrored[1].get("etag"):
+                headers["If-None-Match"] = etag
+            if last_modified := mirrored[1].get("last_modified"):
+                headers["If-Modified-Since"] = last_modified
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == HTTPStatus.NOT_MODIFIED and mirrored is not None:
+            logger.debug(f"Mirrored specification of {url} is current")
+            return FetchedSpec(mirrored[0], mirrored[1].get("content_type"))
+        response.raise_for_status()
+        fetched = FetchedSpec(response.content, response.headers.get("Content-Type"))
+        if self.mirror_dir is not None:
+            metadata = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content_type": fetched.content_type,
+            }
+            self._write_mirror(url, fetched.content, metadata)
+        return fetched
+
+    def _refresh_in_background(self, url: str, mirrored: _Mirrored) -> None:
+        def refresh():
+            try:
+                self._fetch(url, mirrored)
+            except requests.RequestException as e:
+                logger.warning(f"Failed to revalidate the mirrored specification of {url}: {e!s}")
+            finally:
+                with self._lock:
+                    self._refreshes.pop(url, None)
+
+        with self._lock:
+            if url in self._refreshes:
+                return
+            thread = threading.Thread(target=refresh, name=f"spec-refresh-{url}", daemon=True)
+            self._refreshes[url] = thread
+        thread.start()
+
+    def _mirror_paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.mirror_dir / f"{key}.body", self.mirror_dir / f"{key}.json"
+
+    def _read_mirror(self, url: str) -> Optional[_Mirrored]:
+        if self.mirror_dir is None:
+            return None
+        body_path, metadata_path = self._mirror_paths(url)
+        try:
+            metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+            content = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        if metadata.get("url") != url or metadata.get("size") != len(content):
+            return None
+        return content, metadata
+
+    def _write_mirror(self, url: str, content: bytes, metadata: Dict[str, Any]) -> None:
+        body_path, metadata_path = self._mirror_paths(url)
+        # the body is replaced before its metadata, and the size check in _read_mirror ignores mismatched pairs
+        self._write(body_path, content)
+        self._write(metadata_path, json.dumps({**metadata, "size": len(content)}).encode("utf-8"))
+
+    def _write(self, path: Path, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.mirror_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
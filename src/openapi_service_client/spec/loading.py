@@ -0,0 +1,69 @@
+from pathlib import PurePosixPath
+from typing import IO, Any, Optional, Union
+
+import yaml
+
+from openapi_service_client.http_client.decoding import loads_json
+
+# Specification source formats
+JSON_FORMAT = "json"
+YAML_FORMAT = "yaml"
+
+_FORMATS_BY_EXTENSION = {".json": JSON_FORMAT, ".yaml": YAML_FORMAT, ".yml": YAML_FORMAT}
+
+# the libyaml based loader is an order of magnitude faster than the pure Python one, PyYAML ships it when libyaml
+# is available at build time
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+SpecSource = Union[str, bytes, IO[bytes]]
+
+
+def format_for_name(name: Optional[str]) -> Optional[str]:
+    """
+    Returns the specification format a file name or URL path implies by its extension, or None if it implies none.
+    """
+    if not name:
+        return None
+    return _FORMATS_BY_EXTENSION.get(PurePosixPath(str(name).split("?", 1)[0]).suffix.lower())
+
+
+def sniff_format(content: Union[str, bytes]) -> str:
+    """
+    Tells JSON from YAML specification sources by their first significant character: JSON documents describing
+    an OpenAPI specification are objects, while YAML documents start with a key, a comment or a document marker.
+    """
+    head = content[:64].lstrip(b"\xef\xbb\xbf \t\r\n" if isinstance(content, bytes) else "﻿ \t\r\n")
+    return JSON_FORMAT if head[:1] in ("{", b"{") else YAML_FORMAT
+
+
+def parse_spec(source: SpecSource, spec_format: Optional[str] = None) -> Any:
+    """
+    Parses a JSON or YAML specification source.
+
+    JSON is parsed with the fastest available decoder, see `loads_json`, and YAML with the libyaml based loader
+    when available. Bytes and binary file objects are parsed without decoding them to a string first; YAML file
+    objects are streamed to the parser.
+
+    :param source: The specification source, as a string, bytes or a binary file object.
+    :param spec_format: `JSON_FORMAT` or `YAML_FORMAT`, sniffed from the content if not given.
+    :return: The parsed specification.
+    :raises ValueError: If the source cannot be parsed as JSON or YAML.
+    """
+    if not isinstance(source, (str, bytes)):
+        if spec_format == YAML_FORMAT:
+            return _load_yaml(source)
+        source = source.read()
+    if (spec_format or sniff_format(source)) == JSON_FORMAT:
+        try:
+            return loads_json(source)
+        except ValueError:
+            # JSON is a subset of YAML, e.g. a mislabeled YAML flow mapping still parses as YAML
+            pass
+    return _load_yaml(source)
+
+
+def _load_yaml(source: SpecSource) -> Any:
+    try:
+        return yaml.load(source, Loader=YAML_LOADER)  # noqa: S506 - a safe loader
+    except yaml.YAMLError as e:
+        raise ValueError("Content cannot be decoded as JSON or YAML: " + str(e)) from e
@@ -1,17 +1,42 @@
+import hashlib
 import json
 import logging
+import re
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-
-import jsonref
-import requests
-import yaml
+from typing import IO, Any, Dict, List, Optional, Union
+from urllib.parse import urlparse
 
 from openapi_service_client.http_client import VALID_HTTP_METHODS
+from openapi_service_client.spec.cache import CompiledSpecCache
+from openapi_service_client.spec.fetcher import SpecFetcher
+from openapi_service_client.spec.loading import (
+    JSON_FORMAT,
+    YAML_FORMAT,
+    SpecSource,
+    format_for_name,
+    parse_spec,
+    sniff_format,
+)
 from openapi_service_client.spec.operation import Operation
+from openapi_service_client.spec.resolver import RefResolver
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_FETCHER: Optional[SpecFetcher] = None
+
+# operationIds differing only by case or separators, e.g. `get_user` and `getUser`, collide once an LLM provider
+# or a tool registry normalizes tool names
+_OPERATION_ID_SEPARATORS = re.compile(r"[^a-z0-9]")
+
+
+def _default_fetcher() -> SpecFetcher:
+    # created on first use, so that its connection pool is shared by all specifications loaded from URLs
+    global _DEFAULT_FETCHER  # noqa: PLW0603
+    if _DEFAULT_FETCHER is None:
+        _DEFAULT_FETCHER = SpecFetcher()
+    return _DEFAULT_FETCHER
+
 
 class OpenAPISpecification:
     def __init__(self, spec_dict: Dict[str, Any]):
@@ -23,7 +48,14 @@ class OpenAPISpecification:
             raise ValueError(
                 "Invalid OpenAPI specification format. See https://swagger.io/specification/ for details.", spec_dict
             )
+        start = time.perf_counter()
         self.spec_dict = spec_dict
+        self._resolver = RefResolver(spec_dict)
+        self._operations = self._compile_operations()
+        self._operations_by_id = self._build_operation_index()
+        self._fingerprint: Optional[str] = None
+        self._operation_fingerprints: Optional[Dict[str, str]] = None
+        self._load_stats: Dict[str, Any] = {"compile_seconds": time.perf_counter() - start}
 
     @classmethod
     def from_dict(cls, spec_dict: Dict[str, Any]) -> "OpenAPISpecification":
@@ -31,35 +63,171 @@ class OpenAPISpecification:
         return parser
 
     @classmethod
-    def from_str(cls, content: str) -> "OpenAPISpecification":
-        try:
-            loaded_spec = json.loads(content)
-        except json.JSONDecodeError:
-            try:
-                loaded_spec = yaml.safe_load(content)
-            except yaml.YAMLError as e:
-                raise ValueError("Content cannot be decoded as JSON or YAML: " + str(e)) from e
-        return cls(loaded_spec)
+    def from_str(
+        cls,
+        content: Union[str, bytes],
+        cache: Optional[CompiledSpecCache] = None,
+        spec_format: Optional[str] = None,
+    ) -> "OpenAPISpecification":
+        """
+        Loads a specification from its JSON or YAML source.
+
+        :param content: The specification source, as a string or as bytes, which are parsed without decoding them.
+        :param cache: If given, the compiled specification is loaded from this cache, or stored in it on a miss.
+        :param spec_format: `"json"` or `"yaml"`, sniffed from the content if not given.
+        """
+        return cls._load(content, cache, spec_format)
+
+    @classmethod
+    def from_file(
+        cls, spec_file: Union[str, Path, IO[bytes]], cache: Optional[CompiledSpecCache] = None
+    ) -> "OpenAPISpecification":
+        """
+        Loads a specification from a JSON or YAML file. The format is chosen by the file extension, or sniffed from
+        the content for other extensions.
+
+        :param spec_file: The path of the file, or a file object opened in binary mode.
+        :param cache: If given, the compiled specification is loaded from this cache, or stored in it on a miss.
+        """
+        if not isinstance(spec_file, (str, Path)):
+            return cls._load(spec_file, cache, format_for_name(getattr(spec_file, "name", None)))
+        with open(spec_file, "rb") as file:
+            return cls._load(file, cache, format_for_name(str(spec_file)))
 
     @classmethod
-    def from_file(cls, spec_file: Union[str, Path]) -> "OpenAPISpecification":
-        with open(spec_file, encoding="utf-8") as file:
-            content = file.read()
-        return cls.from_str(content)
+    def from_url(
+        cls, url: str, cache: Optional[CompiledSpecCache] = None, fetcher: Optional[SpecFetcher] = None
+    ) -> "OpenAPISpecification":
+        """
+        Loads a specification from a URL.
+
+        :param url: The URL of the specification.
+        :param cache: If given, the compiled specification is loaded from this cache, or stored in it on a miss.
+        :param fetcher: Fetches the specification, e.g. through an on-disk mirror, see `SpecFetcher`. Defaults to
+        a shared fetcher without a mirror.
+        :raises ConnectionError: If the specification cannot be fetched.
+        """
+        fetched = (fetcher or _default_fetcher()).fetch(url)
+        content_type = fetched.content_type or ""
+        spec_format = format_for_name(urlparse(url).path)
+        if spec_format is None and "json" in content_type:
+            spec_format = JSON_FORMAT
+        elif spec_format is None and "yaml" in content_type:
+            spec_format = YAML_FORMAT
+        return cls._load(fetched.content, cache, spec_format)
 
     @classmethod
-    def from_url(cls, url: str) -> "OpenAPISpecification":
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            content = response.text
-        except requests.RequestException as e:
-            raise ConnectionError(f"Failed to fetch the specification from URL: {url}. {e!s}") from e
-        return cls.from_str(content)
+    def _load(
+        cls, source: SpecSource, cache: Optional[CompiledSpecCache], spec_format: Optional[str]
+    ) -> "OpenAPISpecification":
+        start = time.perf_counter()
+        if cache is not None:
+            # cache keys are computed from the whole source
+            if not isinstance(source, (str, bytes)):
+                source = source.read()
+            compiled = cache.load(source)
+            if isinstance(compiled, cls):
+                compiled._load_stats = {"cached": True, "parse_seconds": 0.0, "compile_seconds": 0.0}
+                compiled._load_stats["load_seconds"] = time.perf_counter() - start
+                return compiled
+        if spec_format is None:
+            if not isinstance(source, (str, bytes)):
+                source = source.read()
+            spec_format = sniff_format(source)
+        loaded_spec = parse_spec(source, spec_format)
+        parse_seconds = time.perf_counter() - start
+        spec = cls(loaded_spec)
+        spec._load_stats.update(cached=False, format=spec_format, parse_seconds=parse_seconds)
+        if cache is not None:
+            cache.store(source, spec)
+        spec._load_stats["load_seconds"] = time.perf_counter() - start
+        logger.debug(f"Loaded OpenAPI specification {spec.get_name()!r}: {spec.get_load_stats()}")
+        return spec
+
+    def get_load_stats(self) -> Dict[str, Any]:
+        """
+        Returns how long loading this specification took: the seconds spent parsing its source (`parse_seconds`),
+        compiling its operations (`compile_seconds`) and in total (`load_seconds`), the source format, and whether
+        it was loaded from a compiled specification cache (`cached`).
+        """
+        return dict(self._load_stats)
 
     def get_name(self) -> str:
         return self.spec_dict.get("info", {}).get("title", "")
 
+    def get_fingerprint(self) -> str:
+        """
+        Returns a content hash of the specification, computed on first use.
+
+        Specifications are treated as immutable once loaded; the fingerprint identifies their content in caches, e.g.
+        of LLM tool definitions, so that a changed specification is never served stale cached data.
+
+        :return: A hex digest of the specification content.
+        """
+        if self._fingerprint is None:
+            canonical = json.dumps(self.spec_dict, sort_keys=True, separators=(",", ":"), default=str)
+            self._fingerprint = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return self._fingerprint
+
+    def get_operation_fingerprints(self) -> Dict[str, str]:
+        """
+        Returns a content hash of each operation with an operationId, computed on first use.
+
+        An operation fingerprint covers everything requests to the operation and its tool definitions are built
+        from, with all references resolved: the operation, the parameters and servers of its path, the servers,
+        security requirements and rate limits of the specification, and the security schemes the operation
+        requires. An operation with the same fingerprint in two versions of a specification behaves the same in
+        both, see `ReloadableSpec`.
+
+        :return: A dictionary mapping each operationId to the hex digest of its content.
+        """
+        if self._operation_fingerprints is None:
+            resolve = self._resolver.resolve
+            shared = {key: resolve(self.spec_dict.get(key)) for key in ("servers", "security", "x-ratelimit")}
+            security_schemes = self._resolver.deref(self.get_security_schemes())
+            fingerprints = {}
+            for op_id, operation in self._operations_by_id.items():
+                path_item = self._resolver.deref(self.get_paths().get(operation.path, {}))
+                scheme_names = sorted({name for req in operation.get_security_requirements() for name in req})
+                content = {
+                    "path": operation.path,
+                    "method": operation.method,
+                    "operation": resolve(operation.operation_dict),
+                    "parameters": resolve(path_item.get("parameters", [])),
+                    "servers": resolve(path_item.get("servers")),
+                    "shared": shared,
+                    "security_schemes": {name: resolve(security_schemes.get(name)) for name in scheme_names},
+                }
+                canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+                fingerprints[op_id] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+            self._operation_fingerprints = fingerprints
+        return self._operation_fingerprints
+
+    def _reuse_operations(self, previous: "OpenAPISpecification") -> int:
+        """
+        Replaces the operations that are unchanged since a previous version of this specification with the
+        operations of that version, rebound to this version, so that what was compiled and cached for them stays
+        valid. Must be called before the specification is used.
+
+        :return: The number of reused operations.
+        """
+        fingerprints = self.get_operation_fingerprints()
+        previous_fingerprints = previous.get_operation_fingerprints()
+        reused: Dict[int, Operation] = {}
+        for op_id, operation in self._operations_by_id.items():
+            previous_operation = previous._operations_by_id.get(op_id)
+            if previous_operation is not None and previous_fingerprints.get(op_id) == fingerprints[op_id]:
+                reused[id(operation)] = self._operations_by_id[op_id] = previous_operation._rebind(self.spec_dict)
+        self._operations = [reused.get(id(operation), operation) for operation in self._operations]
+        return len(reused)
+
+    def get_resolver(self) -> RefResolver:
+        """
+        Returns the `$ref` resolver of this specification, shared by everything reading it: operations, request
+        builders and LLM schema converters. Each referenced component is resolved once, on first access.
+        """
+        return self._resolver
+
     def get_paths(self) -> Dict[str, Dict[str, Any]]:
         return self.spec_dict.get("paths", {})
 
@@ -74,33 +242,77 @@ class OpenAPISpecification:
         raise ValueError(f"No operation found with path containing {path_partial}")
 
     def find_operation_by_id(self, op_id: str, method: Optional[str] = None) -> Operation:
-        for path, path_item in self.get_paths().items():
-            op: Operation = self.get_operation_item(path, path_item, method)
-            if op_id in op.get_field("operationId", ""):
-                return self.get_operation_item(path, path_item, method)
-        raise ValueError(f"No operation found with operationId {op_id}")
+        operation = self._operations_by_id.get(op_id)
+        if operation is None or (method and operation.method != method.lower()):
+            raise ValueError(f"No operation found with operationId {op_id}")
+        return operation
+
+    def get_operation_ids(self) -> List[str]:
+        return list(self._operations_by_id)
 
     def get_operation_item(self, path: str, path_item: Dict[str, Any], method: Optional[str] = None) -> Operation:
+        path_item = self._resolver.deref(path_item)
         if method:
             operation_dict = path_item.get(method.lower(), {})
             if not operation_dict:
                 raise ValueError(f"No operation found for method {method} at path {path}")
-            return Operation(path, method.lower(), operation_dict, self.spec_dict)
+            return Operation(path, method.lower(), operation_dict, self.spec_dict, self._resolver)
         if len(path_item) == 1:
             method, operation_dict = next(iter(path_item.items()))
-            return Operation(path, method, operation_dict, self.spec_dict)
+            return Operation(path, method, operation_dict, self.spec_dict, self._resolver)
         if len(path_item) > 1:
             raise ValueError(f"Multiple operations found at path {path}, method parameter is required.")
         raise ValueError(f"No operations found at path {path}.")
 
     def get_operations(self) -> List[Operation]:
+        return list(self._operations)
+
+    def _compile_operations(self) -> List[Operation]:
         operations = []
         for path, path_item in self.get_paths().items():
-            for method, operation_dict in path_item.items():
+            for method, operation_dict in self._resolver.deref(path_item).items():
                 if method.lower() in VALID_HTTP_METHODS:
-                    operations.append(Operation(path, method, operation_dict, self.spec_dict))
+                    operations.append(Operation(path, method, operation_dict, self.spec_dict, self._resolver))
         return operations
 
+    def _build_operation_index(self) -> Dict[str, Operation]:
+        """
+        Builds the operationId -> Operation index used for invocation lookups.
+
+        Operations without an operationId are not indexed. If the same operationId is declared by more than one
+        operation, the first declaration wins, just as it would in a linear scan, and all duplicates are reported.
+        Distinct operationIds that differ only by case or separators are reported as colliding.
+
+        :return: A dictionary mapping each operationId to its Operation.
+        """
+        index: Dict[str, Operation] = {}
+        duplicates: Dict[str, List[str]] = {}
+        for operation in self._operations:
+            op_id = operation.get_field("operationId")
+            if not op_id:
+                continue
+            if op_id in index:
+                first = index[op_id]
+                duplicates.setdefault(op_id, [f"{first.method.upper()} {first.path}"]).append(
+                    f"{operation.method.upper()} {operation.path}"
+                )
+                continue
+            index[op_id] = operation
+        if duplicates:
+            details = "; ".join(f"{op_id}: {', '.join(locations)}" for op_id, locations in duplicates.items())
+            logger.warning(f"OpenAPI specification {self.get_name()!r} contains duplicate operationIds ({details})")
+        normalized: Dict[str, List[str]] = {}
+        for op_id in index:
+            normalized.setdefault(_OPERATION_ID_SEPARATORS.sub("", op_id.lower()), []).append(op_id)
+        collisions = [op_ids for op_ids in normalized.values() if len(op_ids) > 1]
+        if collisions:
+            details = "; ".join(", ".join(op_ids) for op_ids in collisions)
+            logger.warning(
+                f"OpenAPI specification {self.get_name()!r} contains operationIds differing only by case or "
+                f"separators ({details})"
+            )
+        return index
+
     def get_security_schemes(self) -> Dict[str, Dict[str, Any]]:
         components = self.spec_dict.get("components", {})
         return components.get("securitySchemes", {})
@@ -111,9 +323,12 @@ class OpenAPISpecification:
         all $ref references within the spec, returning a fully resolved specification
         dictionary if `resolve_references` is set to True.
 
+        The resolved dictionary shares the components it references with the specification, see `RefResolver`,
+        and must not be modified. Recursive references are kept as `$ref` nodes.
+
         :param resolve_references: If True, resolve references in the specification.
         :return: A dictionary representation of the OpenAPI specification, optionally fully resolved.
         """
         if resolve_references:
-            return jsonref.replace_refs(self.spec_dict, proxies=False)
+            return self._resolver.resolve(self.spec_dict)
         return self.spec_dict
@@ -1,9 +1,45 @@
-from typing import Any, Dict, List, Literal, Optional
+import re
+from typing import Any, Callable, Dict, FrozenSet, List, Literal, Mapping, Optional, Tuple
 
 from openapi_service_client.http_client import VALID_HTTP_METHODS
+from openapi_service_client.http_client.decoding import response_mode_for
+from openapi_service_client.spec.resolver import RefResolver
+
+PARAMETER_LOCATIONS = ("header", "query", "path", "cookie")
+
+_PATH_TEMPLATE_PARAM = re.compile(r"\{([^{}/]+)\}")
+
+
+def _identity(node: Any) -> Any:
+    return node
 
 
 class Operation:
+    """
+    A single operation (path + HTTP method) of an OpenAPI specification.
+
+    Everything the request builder needs on every invocation is compiled once, when the operation is created: the
+    effective parameters split by location, the names of required parameters per location, the server URL, the
+    path template and how its responses are decoded. Operations are immutable and never modify the specification
+    dictionaries they are created from.
+
+    Given the resolver of the specification, parameters, the request body and responses declared as `$ref` are
+    followed to the components they point to.
+    """
+
+    __slots__ = (
+        "_parameters",
+        "_parameters_by_location",
+        "_path_template",
+        "_request_body",
+        "_required_by_location",
+        "_response_mode",
+        "_server_url",
+        "method",
+        "operation_dict",
+        "path",
+        "spec_dict",
+    )
 
     def __init__(
         self,
@@ -11,28 +47,88 @@ class Operation:
         method: str,
         operation_dict: Dict[str, Any],
         spec_dict: Dict[str, Any],
+        resolver: Optional[RefResolver] = None,
     ):
         if method.lower() not in VALID_HTTP_METHODS:
             raise ValueError(f"Invalid HTTP method: {method}")
-        self.path = path
-        self.method = method.lower()
-        self.operation_dict = operation_dict
-        self.spec_dict = spec_dict
-
-    def get_parameters(self, location: Optional[Literal["header", "query", "path"]] = None) -> List[Dict[str, Any]]:
-        parameters = self.operation_dict.get("parameters", [])
-        path_item = self.spec_dict.get("paths", {}).get(self.path, {})
-        parameters.extend(path_item.get("parameters", []))
+        deref = resolver.deref if resolver is not None else _identity
+        path_item = deref(spec_dict.get("paths", {}).get(path, {}))
+        parameters = self._merge_parameters(operation_dict, path_item, deref)
+        parameters_by_location = {
+            location: tuple(param for param in parameters if param.get("in") == location)
+            for location in PARAMETER_LOCATIONS
+        }
+
+        set_attr = object.__setattr__
+        set_attr(self, "path", path)
+        set_attr(self, "method", method.lower())
+        set_attr(self, "operation_dict", operation_dict)
+        set_attr(self, "spec_dict", spec_dict)
+        set_attr(self, "_parameters", parameters)
+        set_attr(self, "_request_body", deref(operation_dict.get("requestBody", {})))
+        set_attr(self, "_parameters_by_location", parameters_by_location)
+        set_attr(
+            self,
+            "_required_by_location",
+            {
+                location: frozenset(param["name"] for param in params if param.get("required", False))
+                for location, params in parameters_by_location.items()
+            },
+        )
+        set_attr(self, "_server_url", self._resolve_server_url(operation_dict, path_item, spec_dict))
+        set_attr(self, "_path_template", tuple(_PATH_TEMPLATE_PARAM.split(path)))
+        set_attr(self, "_response_mode", response_mode_for(self._success_content_types(operation_dict, deref)))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{self.__class__.__name__} is immutable, cannot set attribute {name!r}")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{self.__class__.__name__} is immutable, cannot delete attribute {name!r}")
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        # operations are restored from compiled specification caches, see CompiledSpecCache
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __repr__(self) -> str:
+        return f"Operation({self.method.upper()} {self.path})"
+
+    def _rebind(self, spec_dict: Dict[str, Any]) -> "Operation":
+        """
+        Returns a copy of this operation bound to another version of its specification, sharing everything compiled
+        for it. Only valid if the operation is unchanged in that version, see
+        `OpenAPISpecification.get_operation_fingerprints`.
+        """
+        operation = object.__new__(Operation)
+        operation.__setstate__({**self.__getstate__(), "spec_dict": spec_dict})
+        return operation
+
+    def get_parameters(
+        self, location: Optional[Literal["header", "query", "path", "cookie"]] = None
+    ) -> List[Dict[str, Any]]:
         if location:
-            return [param for param in parameters if param["in"] == location]
-        return parameters
+            return list(self._parameters_by_location.get(location, ()))
+        return list(self._parameters)
+
+    def get_required_parameter_names(self, location: Literal["header", "query", "path", "cookie"]) -> FrozenSet[str]:
+        return self._required_by_location.get(location, frozenset())
 
     def get_request_body(self) -> Dict[str, Any]:
-        return self.operation_dict.get("requestBody", {})
+        return self._request_body
 
     def get_responses(self) -> Dict[str, Any]:
         return self.operation_dict.get("responses", {})
 
+    def get_response_mode(self) -> str:
+        """
+        Returns how responses of this operation are decoded, derived from the content types declared for its
+        successful responses, see `response_mode_for`.
+        """
+        return self._response_mode
+
     def get_security_requirements(self) -> List[Dict[str, List[str]]]:
         security_requirements = self.operation_dict.get("security", [])
 
@@ -42,12 +138,65 @@ class Operation:
         return security_requirements
 
     def get_server_url(self) -> str:
-        servers = self.operation_dict.get("servers", [])
-        if not servers:
-            servers = self.spec_dict.get("servers", [])
-        if servers:
-            return servers[0].get("url", "")
-        return ""
+        return self._server_url
+
+    def get_path_template(self) -> Tuple[str, ...]:
+        """
+        Returns the compiled path template: literal path segments at even indices and the names of the path
+        parameters between them at odd indices, e.g. `("/users/", "id", "/orders")` for `/users/{id}/orders`.
+        """
+        return self._path_template
+
+    def render_path(self, path_params: Mapping[str, str]) -> str:
+        """
+        Renders the path template, substituting the given path parameter values. Placeholders without a value are
+        left as they appear in the specification.
+
+        :param path_params: A mapping of path parameter names to their string values.
+        :return: The rendered path.
+        """
+        template = self._path_template
+        if len(template) == 1:
+            return template[0]
+        parts = list(template)
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            parts[i] = path_params[name] if name in path_params else f"{{{name}}}"
+        return "".join(parts)
 
     def get_field(self, key: str, default: Any = None) -> Any:
         return self.operation_dict.get(key, default)
+
+    @staticmethod
+    def _merge_parameters(
+        operation_dict: Dict[str, Any], path_item: Dict[str, Any], deref: Callable[[Any], Any] = _identity
+    ) -> Tuple[Dict[str, Any], ...]:
+        # path-level parameters apply to all operations under the path unless an operation-level parameter with the
+        # same name and location overrides them, see https://swagger.io/specification/#path-item-object
+        operation_parameters = [deref(param) for param in operation_dict.get("parameters", [])]
+        overridden = {(param.get("name"), param.get("in")) for param in operation_parameters}
+        path_parameters = [
+            param
+            for param in map(deref, path_item.get("parameters", []))
+            if (param.get("name"), param.get("in")) not in overridden
+        ]
+        return (*operation_parameters, *path_parameters)
+
+    @staticmethod
+    def _success_content_types(operation_dict: Dict[str, Any], deref: Callable[[Any], Any] = _identity) -> List[str]:
+        content_types: List[str] = []
+        for status, response_or_ref in operation_dict.get("responses", {}).items():
+            if str(status).startswith("2") or str(status) == "default":
+                response = deref(response_or_ref)
+                if isinstance(response, dict):
+                    content_types.extend(response.get("content", {}))
+        return content_types
+
+    @staticmethod
+    def _resolve_server_url(
+        operation_dict: Dict[str, Any], path_item: Dict[str, Any], spec_dict: Dict[str, Any]
+    ) -> str:
+        servers = operation_dict.get("servers") or path_item.get("servers") or spec_dict.get("servers", [])
+        if servers:
+            return servers[0].get("url", "")
+        return ""
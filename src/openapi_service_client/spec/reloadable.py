@@ -0,0 +1,157 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from openapi_service_client.spec.cache import CompiledSpecCache
+from openapi_service_client.spec.fetcher import SpecFetcher
+from openapi_service_client.spec.open_api_spec import OpenAPISpecification
+
+logger = logging.getLogger(__name__)
+
+SpecListener = Callable[[OpenAPISpecification, OpenAPISpecification], None]
+
+
+class ReloadableSpec:
+    """
+    Holds the current version of an OpenAPI specification loaded from a file or URL, and replaces it when the
+    source changes, without rebuilding the configuration and client using it, their connection pool or caches.
+
+    A new version is loaded and compiled by `reload`, on the calling thread or on the watcher thread started by
+    `watch`, and then swapped in with a single reference assignment. Invocations read the current version once,
+    when their request is built, so invocations in flight finish on the version they started with while new
+    invocations use the new one. Operations that are unchanged in the new version, by their fingerprint (see
+    `OpenAPISpecification.get_operation_fingerprints`), are taken over from the previous version, together with
+    their converted tool definitions.
+
+    Example usage:
+
+    ```python
+    spec = ReloadableSpec("specs/search.yml").watch(poll_interval=5)
+    config = ClientConfigurationBuilder().with_openapi_spec(spec).build()
+    client = OpenAPIServiceClient(config)  # always invokes the latest version of specs/search.yml
+    ```
+    """
+
+    def __init__(
+        self,
+        source: Union[str, Path],
+        cache: Optional[CompiledSpecCache] = None,
+        fetcher: Optional[SpecFetcher] = None,
+    ):
+        """
+        :param source: The file path or URL of the specification.
+        :param cache: If given, versions are loaded through this cache of compiled specifications.
+        :param fetcher: Fetches the specification if it is given as a URL, see `SpecFetcher`.
+        :raises ValueError: If the source is neither a file nor a URL.
+        :raises ConnectionError: If the specification cannot be fetched from its URL.
+        """
+        self.source = source
+        self.cache = cache
+        self.fetcher = fetcher
+        self._is_url = isinstance(source, str) and urlparse(source).scheme in ("http", "https")
+        if not self._is_url and not os.path.isfile(source):
+            raise ValueError(f"OpenAPI specification source {source} is neither a file nor an HTTP(S) URL")
+        self._listeners: List[SpecListener] = []
+        self._lock = threading.Lock()
+        self._stop: Optional[threading.Event] = None
+        self._file_stat: Optional[Tuple[int, int]] = None
+        self._version = 1
+        self._spec = self._load()
+
+    def get(self) -> OpenAPISpecification:
+        """
+        Returns the current version of the specification.
+        """
+        return self._spec
+
+    def get_version(self) -> int:
+        """
+        Returns the number of the current version, starting at 1 and incremented with each swap.
+        """
+        return self._version
+
+    def add_listener(self, listener: SpecListener) -> "ReloadableSpec":
+        """
+        Registers a function called with the previous and the new version of the specification after each swap.
+        """
+        self._listeners.append(listener)
+        return self
+
+    def reload(self) -> bool:
+        """
+        Loads the specification source and swaps in the new version if its content changed. Files are only read
+        again once their modification time or size changed.
+
+        :return: Whether a new version was swapped in.
+        :raises ValueError: If the changed specification is invalid, the current version is kept.
+        :raises ConnectionError: If the specification cannot be fetched from its URL.
+        """
+        with self._lock:
+            if not self._is_url and self._stat() == self._file_stat:
+                return False
+            previous = self._spec
+            spec = self._load()
+            if spec.get_fingerprint() == previous.get_fingerprint():
+                return False
+            reused = spec._reuse_operations(previous)
+            self._spec = spec
+            self._version += 1
+            logger.info(
+                f"Reloaded OpenAPI specification {spec.get_name()!r} from {self.source} as version {self._version}, "
+                f"{reused} of {len(spec.get_operation_ids())} operations unchanged"
+            )
+        for listener in self._listeners:
+            listener(previous, spec)
+        return True
+
+    def watch(self, poll_interval: float = 5.0) -> "ReloadableSpec":
+        """
+        Starts a daemon thread checking the specification source for changes every `poll_interval` seconds.
+        Versions that fail to load are logged and skipped, the current version is kept.
+
+        :return: The instance, to allow for method chaining.
+        """
+        with self._lock:
+            if self._stop is not None:
+                return self
+            stop = self._stop = threading.Event()
+
+        def poll():
+            while not stop.wait(poll_interval):
+                try:
+                    self.reload()
+                except Exception as e:
+                    logger.warning(f"Failed to reload the OpenAPI specification from {self.source}: {e}")
+
+        threading.Thread(target=poll, name=f"spec-watch-{self.source}", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops watching the specification source.
+        """
+        with self._lock:
+            if self._stop is not None:
+                self._stop.set()
+                self._stop = None
+
+    def _load(self) -> OpenAPISpecification:
+        if self._is_url:
+            return OpenAPISpecification.from_url(str(self.source), self.cache, self.fetcher)
+        stat = self._stat()
+        spec = OpenAPISpecification.from_file(self.source, self.cache)
+        self._file_stat = stat
+        return spec
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.source)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def __repr__(self) -> str:
+        return f"ReloadableSpec({self.source!r}, version={self._version})"
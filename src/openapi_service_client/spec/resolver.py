@@ -0,0 +1,149 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote, urldefrag, urljoin
+
+import jsonref
+
+logger = logging.getLogger(__name__)
+
+
+class RefResolver:
+    """
+    Resolves the JSON references (`$ref`) of an OpenAPI specification lazily, on first access, and memoizes every
+    referenced component, so that each component is resolved once and shared by everything referring to it.
+
+    `resolve` returns a node of the specification with all references below it replaced by the (memoized)
+    components they point to. Subtrees without references are returned as they are rather than copied, so resolved
+    nodes share structure with the specification and with each other and must not be modified. A reference back to
+    a component that is still being resolved, i.e. a recursive schema, is kept as the `{"$ref": ...}` node, so
+    recursive schemas resolve to a finite structure instead of expanding without bounds.
+
+    References to other documents (`other.yaml#/components/schemas/Pet`, absolute URLs) are loaded with `loader`,
+    once per document, and resolved against that document. One resolver is shared by all users of a specification,
+    see `OpenAPISpecification.get_resolver`; it is thread-safe.
+    """
+
+    def __init__(
+        self,
+        document: Dict[str, Any],
+        base_uri: str = "",
+        loader: Optional[Callable[[str], Any]] = None,
+        documents: Optional[Dict[str, "RefResolver"]] = None,
+    ):
+        self.document = document
+        self.base_uri = base_uri
+        self.loader = loader or jsonref.jsonloader
+        # resolvers of the documents referenced so far, shared by the resolvers of all of them
+        self._documents = documents if documents is not None else {base_uri: self}
+        # id of a node -> (node, resolved node), for the nodes that contain references
+        self._resolved: Dict[int, Tuple[Any, Any]] = {}
+        self._resolving: Set[int] = set()
+        self._lock = threading.RLock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # resolved components are not persisted, e.g. in compiled specification caches, they are resolved again
+        return {"document": self.document, "base_uri": self.base_uri, "loader": self.loader}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__init__(state["document"], state["base_uri"], state["loader"])
+
+    def resolve(self, node: Any) -> Any:
+        """
+        Returns the node with all references below it resolved.
+        """
+        with self._lock:
+            return self._resolve_node(node)
+
+    def deref(self, node: Any) -> Any:
+        """
+        Follows a reference node to the node it points to, without resolving the references below it. Any other
+        node is returned as it is.
+        """
+        with self._lock:
+            seen: List[str] = []
+            resolver = self
+            while isinstance(node, dict) and isinstance(node.get("$ref"), str):
+                ref = node["$ref"]
+                if ref in seen:
+                    raise ValueError(f"Circular $ref chain: {' -> '.join([*seen, ref])}")
+                seen.append(ref)
+                resolver, pointer = resolver._locate(ref)
+                node = resolver._lookup(pointer, ref)
+            return node
+
+    def _resolve_node(self, node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                return self._resolve_ref(ref)
+        elif not isinstance(node, list):
+            return node
+        # resolved nodes are memoized by the identity of the node they are resolved from, so a component is
+        # resolved once, whether it is reached by a reference or by walking the document
+        cached = self._resolved.get(id(node))
+        if cached is not None and cached[0] is node:
+            return cached[1]
+        self._resolving.add(id(node))
+        try:
+            resolved = self._resolve_children(node)
+        finally:
+            self._resolving.discard(id(node))
+        if resolved is not node:
+            self._resolved[id(node)] = (node, resolved)
+        return resolved
+
+    def _resolve_children(self, node: Any) -> Any:
+        resolved = None
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, value in items:
+            resolved_value = self._resolve_node(value)
+            if resolved_value is not value:
+                if resolved is None:
+                    resolved = dict(node) if isinstance(node, dict) else list(node)
+                resolved[key] = resolved_value
+        return node if resolved is None else resolved
+
+    def _resolve_ref(self, ref: str) -> Any:
+        resolver, pointer = self._locate(ref)
+        if resolver is self:
+            return self._resolve_target(pointer, ref)
+        with resolver._lock:
+            return resolver._resolve_target(pointer, ref)
+
+    def _resolve_target(self, pointer: str, ref: str) -> Any:
+        target = self._lookup(pointer, ref)
+        if id(target) in self._resolving:
+            # a back-edge of a recursive schema
+            return {"$ref": ref}
+        if not (isinstance(target, dict) and "$ref" in target):
+            return self._resolve_node(target)
+        # a reference to a reference, guarded against circular chains as well
+        self._resolving.add(id(target))
+        try:
+            return self._resolve_node(target)
+        finally:
+            self._resolving.discard(id(target))
+
+    def _locate(self, ref: str) -> Tuple["RefResolver", str]:
+        # the resolver of the document a reference points into, and the pointer within that document
+        uri, fragment = urldefrag(ref)
+        if not uri:
+            return self, f"#{fragment}"
+        uri = urljoin(self.base_uri, uri)
+        resolver = self._documents.get(uri)
+        if resolver is None:
+            logger.debug(f"Loading referenced document {uri}")
+            resolver = RefResolver(self.loader(uri), uri, self.loader, self._documents)
+            self._documents[uri] = resolver
+        return resolver, f"#{fragment}"
+
+    def _lookup(self, pointer: str, ref: str) -> Any:
+        node: Any = self.document
+        for escaped in pointer[1:].split("/")[1:] if pointer != "#" else []:
+            token = unquote(escaped).replace("~1", "/").replace("~0", "~")
+            try:
+                node = node[int(token)] if isinstance(node, list) else node[token]
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                raise ValueError(f"Unresolvable $ref {ref!r}") from e
+        return node
@@ -0,0 +1,3 @@
+from openapi_service_client.tool_selection.selector import ToolSelector, tokenize
+
+__all__ = ["ToolSelector", "tokenize"]
@@ -0,0 +1,157 @@
+import heapq
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from openapi_service_client.spec import OpenAPISpecification
+
+# how much a term occurrence in each part of an operation counts, the operationId and summary name the operation
+# while descriptions are long and wordy
+FIELD_WEIGHTS = {
+    "operationId": 3,
+    "summary": 2,
+    "tags": 2,
+    "path": 1,
+    "parameters": 1,
+    "description": 1,
+}
+
+_WORD = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+_STOP_WORDS = frozenset(
+    "a an and are as at be by can do does for from get give how i in is it me my of on or please show that the "
+    "this to what when where which who with you your".split()
+)
+
+# shorter words keep their endings, e.g. "lies", "bus" and "gas"
+_MIN_IES_PLURAL_LENGTH = 5
+_MIN_S_PLURAL_LENGTH = 4
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lower-case terms for tool selection: identifiers are split at case changes, underscores and
+    digits (`listUserRepos` gives `list`, `user`, `repo`), stop words are dropped and plural endings removed.
+    """
+    terms = []
+    for word in _WORD.findall(text):
+        term = word.lower()
+        if term in _STOP_WORDS:
+            continue
+        if len(term) >= _MIN_IES_PLURAL_LENGTH and term.endswith("ies"):
+            term = term[:-3] + "y"
+        elif len(term) >= _MIN_S_PLURAL_LENGTH and term.endswith("s") and not term.endswith("ss"):
+            term = term[:-1]
+        terms.append(term)
+    return terms
+
+
+class ToolSelector:
+    """
+    Ranks the operations of an OpenAPI specification by their relevance to a query, typically the latest user
+    message, so that only the top-k tool definitions are sent to the LLM instead of all of them.
+
+    Operations are ranked with BM25 over their operationId, summary, description, tags, path and parameter names,
+    see `FIELD_WEIGHTS`. The index is built once, when the selector is created, in pure Python; a query only
+    visits the operations sharing a term with it.
+
+    Example usage:
+
+    ```python
+    selector = ToolSelector(config.get_openapi_spec())
+    tools = config.get_tools_definitions(selector.select("Which repositories did octocat star?", top_k=8))
+    ```
+
+    `DefaultClientConfiguration.select_tools_definitions` keeps a selector per specification version and does both
+    steps.
+    """
+
+    def __init__(self, openapi_spec: OpenAPISpecification, k1: float = 1.2, b: float = 0.75):
+        """
+        :param openapi_spec: The specification whose operations are ranked.
+        :param k1: The BM25 term frequency saturation.
+        :param b: The BM25 document length normalization.
+        """
+        self.openapi_spec = openapi_spec
+        self.k1 = k1
+        self.b = b
+        self._operation_ids: List[str] = []
+        # term -> [(document, weighted term frequency)]
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths: List[int] = []
+        for op_id in openapi_spec.get_operation_ids():
+            frequencies: Dict[str, int] = {}
+            for field, text in self._fields(openapi_spec, op_id):
+                weight = FIELD_WEIGHTS[field]
+                for term in tokenize(text):
+                    frequencies[term] = frequencies.get(term, 0) + weight
+            document = len(self._operation_ids)
+            self._operation_ids.append(op_id)
+            lengths.append(sum(frequencies.values()))
+            for term, frequency in frequencies.items():
+                self._postings.setdefault(term, []).append((document, frequency))
+
+        count = len(self._operation_ids)
+        average_length = sum(lengths) / count if count else 0.0
+        self._idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+        # the length normalization of each document, the only per-document part of the BM25 denominator
+        self._norms = [k1 * (1 - b + b * length / average_length) if average_length else k1 for length in lengths]
+
+    def rank(self, query: str, top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Ranks the operations sharing at least one term with the query.
+
+        :param query: The query, e.g. the latest user message.
+        :param top_k: The maximum number of operations returned, all matching operations if not given.
+        :return: The operationIds and scores of the matching operations, best first; ties keep the order of the
+        specification.
+        """
+        scores: Dict[int, float] = {}
+        k1 = self.k1
+        norms = self._norms
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            idf = self._idf[term]
+            for document, frequency in postings:
+                score = idf * frequency * (k1 + 1) / (frequency + norms[document])
+                scores[document] = scores.get(document, 0.0) + score
+        ranked: Iterable[Tuple[int, float]]
+        if top_k is None:
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        else:
+            ranked = heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(self._operation_ids[document], score) for document, score in ranked]
+
+    def select(self, query: str, top_k: int = 10) -> List[str]:
+        """
+        Returns the operationIds of the `top_k` operations most relevant to the query, best first. Operations
+        sharing no term with the query are never selected, so fewer operations, or none, may be returned.
+        """
+        return [op_id for op_id, _ in self.rank(query, top_k)]
+
+    def __len__(self) -> int:
+        return len(self._operation_ids)
+
+    @staticmethod
+    def _fields(openapi_spec: OpenAPISpecification, op_id: str) -> Iterable[Tuple[str, str]]:
+        operation = openapi_spec.find_operation_by_id(op_id)
+        yield "operationId", op_id
+        yield "summary", str(operation.get_field("summary") or "")
+        yield "description", str(operation.get_field("description") or "")
+        yield "tags", " ".join(str(tag) for tag in operation.get_field("tags") or [])
+        yield "path", operation.path
+        names = [str(param.get("name", "")) for param in operation.get_parameters()]
+        names.extend(_body_property_names(openapi_spec, operation.get_request_body()))
+        yield "parameters", " ".join(names)
+
+
+def _body_property_names(openapi_spec: OpenAPISpecification, request_body: Dict[str, Any]) -> List[str]:
+    schema = request_body.get("content", {}).get("application/json", {}).get("schema", {})
+    schema = openapi_spec.get_resolver().deref(schema)
+    properties = schema.get("properties", {}) if isinstance(schema, dict) else {}
+    return [str(name) for name in properties]
@@ -0,0 +1,184 @@
+import asyncio
+import time
+
+import pytest
+
+from openapi_service_client import AsyncOpenAPIServiceClient, OpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.config import CircuitBreakerConfig, HttpClientConfig, RateLimit
+from openapi_service_client.http_client import CircuitBreaker, CircuitOpenError, HttpClientError
+from tests.conftest import send_json
+
+
+def spec_for(server_url: str):
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Weather Service", "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "paths": {
+            "/forecast": {"get": {"operationId": "forecast", "responses": {"200": {"description": "OK"}}}},
+            "/alerts": {"get": {"operationId": "alerts", "responses": {"200": {"description": "OK"}}}},
+        },
+    }
+
+
+def call(operation_id: str):
+    return {"type": "function", "function": {"name": operation_id, "arguments": "{}"}}
+
+
+def client_for(server_url: str, breaker_config: CircuitBreakerConfig, client_class=OpenAPIServiceClient):
+    config = (
+        ClientConfigurationBuilder()
+        .with_openapi_spec(spec_for(server_url))
+        .with_http_client_config(HttpClientConfig(max_retries=0, circuit_breaker=breaker_config))
+        .build()
+    )
+    return client_class(config)
+
+
+class Upstream:
+    """
+    A request handler that fails with 503 while `failing` is set.
+    """
+
+    def __init__(self, *, failing: bool = True, seconds: float = 0.0):
+        self.failing = failing
+        self.seconds = seconds
+
+    def __call__(self, handler, number):
+        time.sleep(self.seconds)
+        if self.failing:
+            send_json(handler, {"error": "unavailable"}, status=503)
+        else:
+            send_json(handler, {"request": number})
+
+
+def request_for(url: str, operation_id: str):
+    return {"method": "get", "url": f"{url}/path", "server_url": url, "operation_id": operation_id}
+
+
+class TestCircuitBreaker:
+
+    def test_opens_on_failure_rate_and_fails_fast(self, local_http_server):
+        server = local_http_server(Upstream())
+        client = client_for(server.url, CircuitBreakerConfig(minimum_calls=3, window_size=5, open_seconds=60))
+        for _ in range(3):
+            with pytest.raises(HttpClientError, match="503"):
+                client.invoke(call("forecast"))
+        assert client.get_circuit_state("forecast") == "open"
+
+        with pytest.raises(CircuitOpenError) as error:
+            client.invoke(call("forecast"))
+        assert error.value.circuit == "server"
+        assert error.value.retry_in > 50
+        # the server circuit rejects the other operations of the server as well
+        with pytest.raises(CircuitOpenError):
+            client.invoke(call("alerts"))
+        assert len(server.requests) == 3
+
+    def test_half_open_probe_closes_the_circuit(self, local_http_server):
+        upstream = Upstream()
+        server = local_http_server(upstream)
+        client = client_for(server.url, CircuitBreakerConfig(minimum_calls=2, open_seconds=0.2))
+        for _ in range(2):
+            with pytest.raises(HttpClientError):
+                client.invoke(call("forecast"))
+        assert client.get_circuit_state("forecast") == "open"
+
+        time.sleep(0.25)
+        assert client.get_circuit_state("forecast") == "half_open"
+        upstream.failing = False
+        assert client.invoke(call("forecast")) == {"request": 3}
+        assert client.get_circuit_state("forecast") == "closed"
+
+    def test_failed_probe_reopens_the_circuit(self, local_http_server):
+        server = local_http_server(Upstream())
+        client = client_for(server.url, CircuitBreakerConfig(minimum_calls=2, open_seconds=0.2))
+        for _ in range(2):
+            with pytest.raises(HttpClientError):
+                client.invoke(call("forecast"))
+        time.sleep(0.25)
+        with pytest.raises(HttpClientError, match="503"):
+            client.invoke(call("forecast"))
+        assert client.get_circuit_state("forecast") == "open"
+
+    def test_probe_refused_by_rate_limiter_is_released(self, local_http_server):
+        upstream = Upstream()
+        server = local_http_server(upstream)
+        http_config = HttpClientConfig(
+            max_retries=0,
+            deadline=0.1,
+            circuit_breaker=CircuitBreakerConfig(minimum_calls=2, open_seconds=0.2, half_open_probes=1),
+            # the first call takes the only token, the next one would have to wait past its deadline
+            operation_rate_limits={"forecast": RateLimit(requests_per_second=0.1, burst=1)},
+        )
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(spec_for(server.url))
+            .with_http_client_config(http_config)
+            .build()
+        )
+        client = OpenAPIServiceClient(config)
+        for operation_id in ("forecast", "alerts"):
+            with pytest.raises(HttpClientError, match="503"):
+                client.invoke(call(operation_id))
+        assert client.get_circuit_state("alerts") == "open"
+
+        time.sleep(0.25)
+        with pytest.raises(HttpClientError, match="deadline"):
+            client.invoke(call("forecast"))
+        # the refused request did not keep the only probe slot of the half-open server circuit
+        upstream.failing = False
+        assert client.invoke(call("alerts")) == {"request": 3}
+        assert client.get_circuit_state("forecast") == "closed"
+
+    def test_opens_on_slow_calls(self, local_http_server):
+        server = local_http_server(Upstream(failing=False, seconds=0.1))
+        breaker_config = CircuitBreakerConfig(minimum_calls=2, slow_call_seconds=0.05, open_seconds=60)
+        client = client_for(server.url, breaker_config)
+        client.invoke(call("forecast"))
+        client.invoke(call("forecast"))
+        with pytest.raises(CircuitOpenError):
+            client.invoke(call("forecast"))
+
+    def test_half_open_admits_limited_probes(self):
+        breaker = CircuitBreaker(CircuitBreakerConfig(minimum_calls=1, open_seconds=0.1, half_open_probes=1))
+        request = request_for("https://api.example.com/v1", "forecast")
+        assert breaker.acquire(request) is None
+        breaker.record(request, failed=True)
+        assert breaker.acquire(request)[0] == ("server", "https://api.example.com/v1")
+
+        time.sleep(0.15)
+        assert breaker.acquire(request) is None
+        # a second request waits while the probe is in flight
+        assert breaker.acquire(request) is not None
+        breaker.record(request, failed=False, latency=0.01)
+        assert breaker.get_states() == {
+            ("server", "https://api.example.com/v1"): "closed",
+            ("operation", "forecast"): "closed",
+        }
+
+    def test_operation_circuit_does_not_affect_other_operations(self):
+        breaker = CircuitBreaker(CircuitBreakerConfig(minimum_calls=1, open_seconds=60))
+        breaker.record(request_for("https://a.example.com", "forecast"), failed=True)
+        # the same operation served by another server is rejected by its operation circuit
+        rejected = breaker.acquire(request_for("https://b.example.com", "forecast"))
+        assert rejected[0] == ("operation", "forecast")
+        assert breaker.get_state("https://b.example.com", "alerts") == "closed"
+        assert CircuitBreaker().acquire(request_for("https://a.example.com", "forecast")) is None
+
+    def test_async_client_fails_fast(self, local_http_server):
+        server = local_http_server(Upstream())
+        breaker_config = CircuitBreakerConfig(minimum_calls=2, open_seconds=60)
+        client = client_for(server.url, breaker_config, client_class=AsyncOpenAPIServiceClient)
+
+        async def run():
+            for _ in range(2):
+                with pytest.raises(HttpClientError, match="503"):
+                    await client.ainvoke(call("alerts"))
+            with pytest.raises(CircuitOpenError):
+                await client.ainvoke(call("alerts"))
+
+        asyncio.run(run())
+        assert client.get_circuit_state("alerts") == "open"
+        assert len(server.requests) == 2
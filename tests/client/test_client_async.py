@@ -0,0 +1,100 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from openapi_service_client import AsyncOpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.config import HttpClientConfig
+from openapi_service_client.http_client import HttpClientError, HttpxAsyncHttpClient
+from tests.conftest import send_json
+
+
+class MessageBody(BaseModel):
+    message: str
+
+
+def create_greet_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/greet/{name}")
+    async def greet(name: str, body: MessageBody):
+        if name == "error":
+            raise HTTPException(status_code=404, detail="Not found")
+        await asyncio.sleep(0.01)
+        return JSONResponse(content={"greeting": f"{body.message}, {name} from mix_params_body!"})
+
+    return app
+
+
+def create_async_client(test_files_path, app: FastAPI) -> AsyncOpenAPIServiceClient:
+    # httpx ASGITransport routes requests straight to the FastAPI app, no network involved
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    config = (
+        ClientConfigurationBuilder()
+        .with_openapi_spec(test_files_path / "openapi_greeting_service.yml")
+        .with_async_http_client(HttpxAsyncHttpClient(HttpClientConfig(max_retries=0), client=http_client))
+        .build()
+    )
+    return AsyncOpenAPIServiceClient(config)
+
+
+def greet_payload(name: str, message: str):
+    return {
+        "id": "call_NJr1NBz2Th7iUWJpRIJZoJIA",
+        "function": {"arguments": f'{{"name": "{name}", "message": "{message}"}}', "name": "greet"},
+        "type": "function",
+    }
+
+
+class TestAsyncClient:
+
+    def test_ainvoke(self, test_files_path):
+        client = create_async_client(test_files_path, create_greet_app())
+        response = asyncio.run(client.ainvoke(greet_payload("John", "Bonjour")))
+        assert response == {"greeting": "Bonjour, John from mix_params_body!"}
+
+    def test_ainvoke_concurrently(self, test_files_path):
+        client = create_async_client(test_files_path, create_greet_app())
+
+        async def invoke_all():
+            return await asyncio.gather(*(client.ainvoke(greet_payload(f"John{i}", "Hola")) for i in range(50)))
+
+        responses = asyncio.run(invoke_all())
+        assert responses == [{"greeting": f"Hola, John{i} from mix_params_body!"} for i in range(50)]
+
+    def test_ainvoke_http_error(self, test_files_path):
+        client = create_async_client(test_files_path, create_greet_app())
+        with pytest.raises(HttpClientError, match="404"):
+            asyncio.run(client.ainvoke(greet_payload("error", "Hola")))
+
+    def test_configurations_without_async_http_client(self, local_http_server):
+        server = local_http_server(lambda handler, _: send_json(handler, {"greeting": "Hello"}))
+        spec = {
+            "openapi": "3.0.0",
+            "info": {"title": "Greeting Service", "version": "1.0.0"},
+            "servers": [{"url": server.url}],
+            "paths": {"/hello": {"get": {"operationId": "hello", "responses": {"200": {"description": "OK"}}}}},
+        }
+        http_client_config = HttpClientConfig(max_retries=0)
+        config = (
+            ClientConfigurationBuilder().with_openapi_spec(spec).with_http_client_config(http_client_config).build()
+        )
+
+        class BaselineConfiguration:
+            # implements the methods of the ClientConfiguration protocol that predate the asynchronous client
+            get_http_client = config.get_http_client
+            get_http_client_config = config.get_http_client_config
+            get_auth_config = config.get_auth_config
+            get_openapi_spec = config.get_openapi_spec
+            get_tools_definitions = config.get_tools_definitions
+            get_payload_extractor = config.get_payload_extractor
+
+        client = AsyncOpenAPIServiceClient(BaselineConfiguration())
+        assert isinstance(client.async_http_client, HttpxAsyncHttpClient)
+        assert client.async_http_client.config is http_client_config
+        payload = {"type": "function", "function": {"name": "hello", "arguments": "{}"}}
+        assert asyncio.run(client.ainvoke(payload)) == {"greeting": "Hello"}
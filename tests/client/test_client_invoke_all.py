@@ -0,0 +1,242 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+
+from openapi_service_client import AsyncOpenAPIServiceClient, OpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.config import HttpClientConfig
+from openapi_service_client.http_client import HttpClientError, HttpxAsyncHttpClient
+from openapi_service_client.providers import AnthropicLLMProvider, CohereLLMProvider, OpenAILLMProvider
+from tests.conftest import FastAPITestClient
+
+
+def create_greet_params_app(delay: float = 0.0) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/greet-params/{name}")
+    def greet_params(name: str):
+        if name == "error":
+            raise HTTPException(status_code=500, detail="Internal error")
+        time.sleep(delay)
+        return JSONResponse(content={"greeting": f"Hello, {name} from params_only!"})
+
+    return app
+
+
+def openai_completion(*names: str):
+    return {
+        "id": "chatcmpl-123",
+        "object": "chat.completion",
+        "choices": [
+            {
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": f"call_{i}",
+                            "type": "function",
+                            "function": {"name": "greetParams", "arguments": json.dumps({"name": name})},
+                        }
+                        for i, name in enumerate(names)
+                    ],
+                },
+            }
+        ],
+    }
+
+
+class TestExtractFunctionInvocations:
+
+    def test_openai(self):
+        extractor = OpenAILLMProvider().get_payload_extractor()
+        invocations = extractor.extract_function_invocations(openai_completion("John", "Jane"))
+        assert invocations == [
+            {"id": "call_0", "name": "greetParams", "arguments": {"name": "John"}},
+            {"id": "call_1", "name": "greetParams", "arguments": {"name": "Jane"}},
+        ]
+
+    def test_anthropic(self):
+        message = {
+            "id": "msg_01",
+            "type": "message",
+            "role": "assistant",
+            "content": [
+                {"type": "text", "text": "Let me greet both."},
+                {"type": "tool_use", "id": "toolu_01", "name": "greetParams", "input": {"name": "John"}},
+                {"type": "tool_use", "id": "toolu_02", "name": "greetParams", "input": {"name": "Jane"}},
+            ],
+        }
+        extractor = AnthropicLLMProvider().get_payload_extractor()
+        assert extractor.extract_function_invocations(message) == [
+            {"id": "toolu_01", "name": "greetParams", "arguments": {"name": "John"}},
+            {"id": "toolu_02", "name": "greetParams", "arguments": {"name": "Jane"}},
+        ]
+
+    def test_cohere(self):
+        response = {
+            "generation_id": "gen_01",
+            "tool_calls": [
+                {"name": "greetParams", "parameters": {"name": "John"}},
+                {"name": "greetParams", "parameters": {"name": "Jane"}},
+            ],
+        }
+        extractor = CohereLLMProvider().get_payload_extractor()
+        assert extractor.extract_function_invocations(response) == [
+            {"id": None, "name": "greetParams", "arguments": {"name": "John"}},
+            {"id": None, "name": "greetParams", "arguments": {"name": "Jane"}},
+        ]
+
+
+class TestInvokeAll:
+
+    def test_invoke_all_in_parallel(self, test_files_path):
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(test_files_path / "openapi_greeting_service.yml")
+            .with_http_client(FastAPITestClient(create_greet_params_app(delay=0.3)))
+            .build()
+        )
+        client = OpenAPIServiceClient(config)
+        names = ["John", "Jane", "Jack", "Jill"]
+
+        start = time.perf_counter()
+        results = client.invoke_all(openai_completion(*names))
+        elapsed = time.perf_counter() - start
+
+        assert [result.id for result in results] == ["call_0", "call_1", "call_2", "call_3"]
+        assert [result.response for result in results] == [
+            {"greeting": f"Hello, {name} from params_only!"} for name in names
+        ]
+        assert all(result.ok for result in results)
+        # calls run in parallel, so the whole turn takes about as long as the slowest call
+        assert elapsed < 0.3 * len(names)
+
+    def test_invoke_all_isolates_failures(self, test_files_path):
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(test_files_path / "openapi_greeting_service.yml")
+            .with_http_client(FastAPITestClient(create_greet_params_app()))
+            .build()
+        )
+        client = OpenAPIServiceClient(config)
+        results = client.invoke_all(openai_completion("John", "error", "Jane"))
+
+        assert [result.ok for result in results] == [True, False, True]
+        assert isinstance(results[1].error, HttpClientError)
+        assert results[1].response is None
+        assert results[2].response == {"greeting": "Hello, Jane from params_only!"}
+
+    def test_invoke_all_isolates_malformed_arguments(self, test_files_path):
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(test_files_path / "openapi_greeting_service.yml")
+            .with_http_client(FastAPITestClient(create_greet_params_app()))
+            .build()
+        )
+        client = OpenAPIServiceClient(config)
+        completion = openai_completion("John", "Jane")
+        # a truncated arguments string, e.g. of a completion cut off at the token limit
+        completion["choices"][0]["message"]["tool_calls"][1]["function"]["arguments"] = '{"name": "Ja'
+        results = client.invoke_all(completion)
+
+        assert [result.id for result in results] == ["call_0", "call_1"]
+        assert [result.ok for result in results] == [True, False]
+        assert results[0].response == {"greeting": "Hello, John from params_only!"}
+        assert isinstance(results[1].error, ValueError)
+        assert results[1].name == "greetParams"
+
+    def test_invoke_function_of_extracted_invocation(self, test_files_path):
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(test_files_path / "openapi_greeting_service.yml")
+            .with_http_client(FastAPITestClient(create_greet_params_app()))
+            .build()
+        )
+        client = OpenAPIServiceClient(config)
+        invocations = config.get_payload_extractor().extract_function_invocations(openai_completion("John", "Jane"))
+        assert [client.invoke_function(invocation) for invocation in invocations] == [
+            {"greeting": "Hello, John from params_only!"},
+            {"greeting": "Hello, Jane from params_only!"},
+        ]
+
+    def test_ainvoke_all(self, test_files_path):
+        http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_greet_params_app()))
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(test_files_path / "openapi_greeting_service.yml")
+            .with_async_http_client(HttpxAsyncHttpClient(HttpClientConfig(max_retries=0), client=http_client))
+            .build()
+        )
+        client = AsyncOpenAPIServiceClient(config)
+        results = asyncio.run(client.ainvoke_all(openai_completion("John", "error", "Jane"), max_concurrency=2))
+
+        assert [result.id for result in results] == ["call_0", "call_1", "call_2"]
+        assert [result.ok for result in results] == [True, False, True]
+        assert results[0].response == {"greeting": "Hello, John from params_only!"}
+
+
+def greet_call(name: str):
+    return {"type": "function", "function": {"name": "greetParams", "arguments": json.dumps({"name": name})}}
+
+
+class TestInvokeBatch:
+
+    def test_invoke_batch_in_input_order(self, test_files_path):
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(test_files_path / "openapi_greeting_service.yml")
+            .with_http_client(FastAPITestClient(create_greet_params_app(delay=0.1)))
+            .build()
+        )
+        client = OpenAPIServiceClient(config)
+        names = [f"user{i}" for i in range(12)] + ["error"]
+
+        start = time.perf_counter()
+        results = list(client.invoke_batch((greet_call(name) for name in names), max_workers=6))
+        elapsed = time.perf_counter() - start
+
+        assert results[:-1] == [{"greeting": f"Hello, {name} from params_only!"} for name in names[:-1]]
+        assert isinstance(results[-1], HttpClientError)
+        assert elapsed < 0.1 * len(names) / 2
+
+    def test_invoke_batch_raises_without_return_exceptions(self, test_files_path):
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(test_files_path / "openapi_greeting_service.yml")
+            .with_http_client(FastAPITestClient(create_greet_params_app()))
+            .build()
+        )
+        client = OpenAPIServiceClient(config)
+        results = client.invoke_batch([greet_call("John"), greet_call("error")], return_exceptions=False)
+        assert next(results) == {"greeting": "Hello, John from params_only!"}
+        with pytest.raises(HttpClientError):
+            next(results)
+
+    def test_ainvoke_batch(self, test_files_path):
+        http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_greet_params_app()))
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(test_files_path / "openapi_greeting_service.yml")
+            .with_async_http_client(HttpxAsyncHttpClient(HttpClientConfig(max_retries=0), client=http_client))
+            .build()
+        )
+        client = AsyncOpenAPIServiceClient(config)
+
+        async def payloads():
+            for name in ["John", "error", "Jane"]:
+                yield greet_call(name)
+
+        async def run():
+            return [result async for result in client.ainvoke_batch(payloads(), max_concurrency=2)]
+
+        results = asyncio.run(run())
+        assert results[0] == {"greeting": "Hello, John from params_only!"}
+        assert isinstance(results[1], HttpClientError)
+        assert results[2] == {"greeting": "Hello, Jane from params_only!"}
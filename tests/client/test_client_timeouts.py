@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from openapi_service_client import OpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.config import HttpClientConfig
+from openapi_service_client.http_client import HttpClientError
+from tests.conftest import send_json
+
+
+def spec_for(server_url: str, **operation_extensions):
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Slow Service", "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "paths": {
+            "/slow": {"get": {"operationId": "slow", "responses": {"200": {"description": "OK"}}}},
+            "/slow-extension": {
+                "get": {
+                    "operationId": "slowExtension",
+                    "responses": {"200": {"description": "OK"}},
+                    **operation_extensions,
+                }
+            },
+        },
+    }
+
+
+def call(operation_id: str):
+    return {"type": "function", "function": {"name": operation_id, "arguments": "{}"}}
+
+
+def sleeping_handler(seconds: float):
+    def handle(handler, _number):
+        time.sleep(seconds)
+        send_json(handler, {"slept": seconds})
+
+    return handle
+
+
+class TestTimeouts:
+
+    def test_read_timeout_is_honored(self, local_http_server):
+        server = local_http_server(sleeping_handler(2))
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(spec_for(server.url))
+            .with_http_client_config(HttpClientConfig(read_timeout=0.2, max_retries=0))
+            .build()
+        )
+        client = OpenAPIServiceClient(config)
+        start = time.monotonic()
+        with pytest.raises(HttpClientError, match="timed out"):
+            client.invoke(call("slow"))
+        assert time.monotonic() - start < 1.5
+
+    def test_per_operation_timeouts(self, local_http_server):
+        server = local_http_server(sleeping_handler(0.5))
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(spec_for(server.url, **{"x-timeout": 0.1}))
+            .with_http_client_config(HttpClientConfig(timeout=5, max_retries=0, operation_timeouts={"slow": 0.1}))
+            .build()
+        )
+        client = OpenAPIServiceClient(config)
+        with pytest.raises(HttpClientError, match="timed out"):
+            client.invoke(call("slow"))
+        with pytest.raises(HttpClientError, match="timed out"):
+            client.invoke(call("slowExtension"))
+
+        # operation_timeouts takes precedence over the x-timeout extension
+        config.get_http_client().config.operation_timeouts["slowExtension"] = 2
+        assert client.invoke(call("slowExtension")) == {"slept": 0.5}
+
+    def test_deadline_stops_retries(self, local_http_server):
+        def unavailable(handler, _number):
+            send_json(handler, {"error": "unavailable"}, status=503)
+
+        server = local_http_server(unavailable)
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(spec_for(server.url))
+            .with_http_client_config(HttpClientConfig(max_retries=10, backoff_factor=0.1, deadline=0.5))
+            .build()
+        )
+        client = OpenAPIServiceClient(config)
+        start = time.monotonic()
+        with pytest.raises(HttpClientError):
+            client.invoke(call("slow"))
+        assert time.monotonic() - start < 1
+        # jittered backoffs of at least 0.1 seconds, the budget is spent before the 10 retries are
+        assert 1 < len(server.requests) <= 5
@@ -0,0 +1,43 @@
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from openapi_service_client.config import HttpClientConfig
+from openapi_service_client.http_client import RequestsHttpClient
+from tests.conftest import send_json
+
+
+def slow_ok(handler, number):
+    time.sleep(0.05)
+    send_json(handler, {"n": number})
+
+
+class TestConnectionPooling:
+
+    def test_pool_is_shared_across_threads(self, local_http_server):
+        server = local_http_server(slow_ok)
+        client = RequestsHttpClient(HttpClientConfig(pool_maxsize=4, pool_block=True))
+        request = {"url": f"{server.url}/items", "method": "get"}
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda _: client.send_request(dict(request)), range(40)))
+
+        assert len(responses) == 40
+        stats = client.get_pool_stats()
+        host_stats = stats[f"http://127.0.0.1:{server.url.rsplit(':', 1)[1]}"]
+        assert host_stats["num_requests"] == 40
+        assert host_stats["maxsize"] == 4
+        # a blocking pool never opens more connections than it keeps, so connections are reused, not re-opened
+        assert host_stats["num_connections"] <= 4
+        assert 0 < host_stats["idle"] <= 4
+
+    def test_tcp_keepalive_socket_options(self):
+        client = RequestsHttpClient(HttpClientConfig(tcp_keepalive=True, tcp_keepalive_idle=30))
+        adapter = client.session.get_adapter("https://api.example.com")
+        socket_options = adapter.poolmanager.connection_pool_kw["socket_options"]
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in socket_options
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            assert (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30) in socket_options
+
+        default_adapter = RequestsHttpClient().session.get_adapter("https://api.example.com")
+        assert "socket_options" not in default_adapter.poolmanager.connection_pool_kw
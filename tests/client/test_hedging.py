@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from openapi_service_client import AsyncOpenAPIServiceClient, OpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.config import HttpClientConfig
+from openapi_service_client.http_client import Hedger, LatencyTracker
+from tests.conftest import send_json
+
+
+def spec_for(server_url: str):
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Lookup Service", "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "paths": {
+            "/lookup": {
+                "get": {"operationId": "lookup", "responses": {"200": {"description": "OK"}}},
+                "post": {"operationId": "store", "responses": {"200": {"description": "OK"}}},
+            },
+        },
+    }
+
+
+def call(operation_id: str):
+    return {"type": "function", "function": {"name": operation_id, "arguments": "{}"}}
+
+
+def client_for(server_url: str, client_class=OpenAPIServiceClient):
+    http_client_config = HttpClientConfig(hedged_operations={"lookup", "store"}, hedge_initial_delay=0.1)
+    config = (
+        ClientConfigurationBuilder()
+        .with_openapi_spec(spec_for(server_url))
+        .with_http_client_config(http_client_config)
+        .build()
+    )
+    return client_class(config)
+
+
+def slow_first(seconds: float):
+    # the first request hangs, later ones are answered right away
+    def handle(handler, number):
+        if number == 1:
+            time.sleep(seconds)
+        send_json(handler, {"request": number})
+
+    return handle
+
+
+class TestHedging:
+
+    def test_hedge_wins_over_slow_request(self, local_http_server):
+        server = local_http_server(slow_first(1.0))
+        client = client_for(server.url)
+        start = time.monotonic()
+        assert client.invoke(call("lookup")) == {"request": 2}
+        assert time.monotonic() - start < 0.8
+        assert client.http_client.hedger.get_stats() == {"requests": 1, "hedged": 1, "won": 1}
+
+    def test_fast_requests_are_not_hedged(self, local_http_server):
+        server = local_http_server(lambda handler, number: send_json(handler, {"request": number}))
+        client = client_for(server.url)
+        assert client.invoke(call("lookup")) == {"request": 1}
+        assert len(server.requests) == 1
+        assert client.http_client.hedger.get_stats() == {"requests": 1, "hedged": 0, "won": 0}
+
+    def test_non_idempotent_methods_are_not_hedged(self, local_http_server):
+        server = local_http_server(slow_first(0.3))
+        client = client_for(server.url)
+        assert client.invoke(call("store")) == {"request": 1}
+        assert len(server.requests) == 1
+
+    def test_delay_follows_latency_percentile(self):
+        hedger = Hedger(HttpClientConfig(hedged_operations={"lookup"}, hedge_percentile=0.9, hedge_initial_delay=2))
+        request = {"method": "get", "url": "http://localhost/lookup", "operation_id": "lookup"}
+        assert hedger.get_delay(request) == 2
+        for latency in range(1, 101):
+            hedger._tracker("lookup").record(latency / 100)
+        assert hedger.get_delay(request) == 0.91
+        assert LatencyTracker().percentile(0.5) is None
+
+    def test_async_hedge_cancels_the_slow_request(self, local_http_server):
+        server = local_http_server(slow_first(1.0))
+        client = client_for(server.url, client_class=AsyncOpenAPIServiceClient)
+
+        async def run():
+            start = time.monotonic()
+            response = await client.ainvoke(call("lookup"))
+            return response, time.monotonic() - start
+
+        response, elapsed = asyncio.run(run())
+        assert response == {"request": 2}
+        assert elapsed < 0.8
+        assert client.async_http_client.hedger.get_stats() == {"requests": 1, "hedged": 1, "won": 1}
@@ -2,6 +2,7 @@ import json
 
 import pytest
 
+from src.openapi_service_client.spec.loading import JSON_FORMAT, YAML_FORMAT, format_for_name, parse_spec, sniff_format
 from src.openapi_service_client.spec.open_api_spec import OpenAPISpecification
 
 
@@ -121,3 +122,88 @@ class TestOpenAPISpecification:
         assert "#/" not in schema
 
         assert schema == raw_spec
+
+    #  finds operations by exact operationId using the prebuilt index
+    def test_find_operation_by_id(self):
+        spec_dict = {
+            "openapi": "3.0.0",
+            "info": {"title": "Test API", "version": "1.0.0"},
+            "servers": [{"url": "https://api.example.com"}],
+            "paths": {
+                "/users": {"get": {"operationId": "getUsers"}, "post": {"operationId": "createUser"}},
+                "/users/{id}": {"get": {"operationId": "getUser"}},
+            },
+        }
+        openapi_spec = OpenAPISpecification(spec_dict)
+        operation = openapi_spec.find_operation_by_id("getUser")
+        assert operation.path == "/users/{id}"
+        assert operation.method == "get"
+        assert openapi_spec.find_operation_by_id("createUser", "POST").method == "post"
+        # lookups return the same cached operation
+        assert openapi_spec.find_operation_by_id("getUser") is operation
+        assert openapi_spec.get_operation_ids() == ["getUsers", "createUser", "getUser"]
+
+        # operationIds are matched exactly, not by substring
+        with pytest.raises(ValueError, match="No operation found with operationId"):
+            openapi_spec.find_operation_by_id("User")
+        with pytest.raises(ValueError, match="No operation found with operationId"):
+            openapi_spec.find_operation_by_id("getUser", "post")
+
+    #  reports duplicate operationIds when the spec is loaded
+    def test_duplicate_operation_ids(self, caplog):
+        spec_dict = {
+            "openapi": "3.0.0",
+            "info": {"title": "Test API", "version": "1.0.0"},
+            "servers": [{"url": "https://api.example.com"}],
+            "paths": {
+                "/users": {"get": {"operationId": "getUsers"}},
+                "/people": {"get": {"operationId": "getUsers"}},
+            },
+        }
+        openapi_spec = OpenAPISpecification(spec_dict)
+        assert "duplicate operationIds" in caplog.text
+        assert "GET /users, GET /people" in caplog.text
+        assert openapi_spec.find_operation_by_id("getUsers").path == "/users"
+
+    #  reports operationIds that differ only by case or separators when the spec is loaded
+    def test_colliding_operation_ids(self, caplog):
+        spec_dict = {
+            "openapi": "3.0.0",
+            "info": {"title": "Test API", "version": "1.0.0"},
+            "servers": [{"url": "https://api.example.com"}],
+            "paths": {
+                "/users": {"get": {"operationId": "get_users"}, "post": {"operationId": "createUser"}},
+                "/people": {"get": {"operationId": "getUsers"}},
+            },
+        }
+        openapi_spec = OpenAPISpecification(spec_dict)
+        assert "differing only by case or separators (get_users, getUsers)" in caplog.text
+        assert "createUser" not in caplog.text
+        assert openapi_spec.find_operation_by_id("getUsers").path == "/people"
+
+    #  sniffs the source format and parses bytes and binary file objects without decoding them first
+    def test_format_sniffing_and_binary_sources(self, test_files_path):
+        assert sniff_format(b'\xef\xbb\xbf  {"openapi": "3.0.0"}') == JSON_FORMAT
+        assert sniff_format("# comment\nopenapi: 3.0.0") == YAML_FORMAT
+        assert format_for_name("https://example.com/specs/api.YML?raw=1") == YAML_FORMAT
+        assert format_for_name("spec.txt") is None
+        # a mislabeled source still parses
+        assert parse_spec("openapi: 3.0.0", JSON_FORMAT) == {"openapi": "3.0.0"}
+        with pytest.raises(ValueError, match="cannot be decoded"):
+            parse_spec("openapi: [3.0.0")
+
+        json_file = test_files_path / "complex_types_openapi_service.json"
+        expected = OpenAPISpecification.from_file(json_file).spec_dict
+        assert OpenAPISpecification.from_str(json_file.read_bytes()).spec_dict == expected
+        with open(json_file, "rb") as file:
+            assert OpenAPISpecification.from_file(file).spec_dict == expected
+        with open(test_files_path / "serper.yaml", "rb") as file:
+            assert OpenAPISpecification.from_file(file).get_operation_ids() == ["serperdev_search"]
+
+    #  reports how long loading took
+    def test_load_stats(self, test_files_path):
+        stats = OpenAPISpecification.from_file(test_files_path / "serper.yaml").get_load_stats()
+        assert stats["format"] == YAML_FORMAT
+        assert not stats["cached"]
+        assert 0 <= stats["parse_seconds"] <= stats["load_seconds"]
+        assert stats["compile_seconds"] >= 0
@@ -0,0 +1,77 @@
+import copy
+
+import pytest
+
+from openapi_service_client.spec import OpenAPISpecification, Operation
+
+SPEC_DICT = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test API", "version": "1.0.0"},
+    "servers": [{"url": "https://api.example.com"}],
+    "paths": {
+        "/users/{id}/orders/{orderId}": {
+            "parameters": [
+                {"name": "id", "in": "path", "required": True, "schema": {"type": "string"}},
+                {"name": "X-Trace", "in": "header", "schema": {"type": "string"}},
+            ],
+            "get": {
+                "operationId": "getOrder",
+                "parameters": [
+                    {"name": "orderId", "in": "path", "required": True, "schema": {"type": "string"}},
+                    {"name": "X-Trace", "in": "header", "required": True, "schema": {"type": "string"}},
+                    {"name": "expand", "in": "query", "schema": {"type": "boolean"}},
+                ],
+            },
+            "delete": {
+                "operationId": "deleteOrder",
+                "servers": [{"url": "https://admin.example.com"}],
+                "parameters": [{"name": "orderId", "in": "path", "required": True, "schema": {"type": "string"}}],
+            },
+        }
+    },
+}
+
+
+class TestOperation:
+
+    def test_parameters_are_partitioned_by_location(self):
+        spec = OpenAPISpecification.from_dict(copy.deepcopy(SPEC_DICT))
+        operation = spec.find_operation_by_id("getOrder")
+
+        assert [p["name"] for p in operation.get_parameters("path")] == ["orderId", "id"]
+        assert [p["name"] for p in operation.get_parameters("query")] == ["expand"]
+        # the operation-level header parameter overrides the path-level one
+        assert operation.get_parameters("header") == [
+            {"name": "X-Trace", "in": "header", "required": True, "schema": {"type": "string"}}
+        ]
+        assert len(operation.get_parameters()) == 4
+        assert operation.get_required_parameter_names("path") == frozenset({"id", "orderId"})
+        assert operation.get_required_parameter_names("query") == frozenset()
+
+    def test_spec_dict_is_never_mutated(self):
+        spec_dict = copy.deepcopy(SPEC_DICT)
+        spec = OpenAPISpecification.from_dict(spec_dict)
+        operation = spec.find_operation_by_id("getOrder")
+        for _ in range(3):
+            operation.get_parameters("path").append({"name": "injected", "in": "path"})
+            operation.get_parameters()
+        assert spec_dict == SPEC_DICT
+        assert len(operation.get_parameters()) == 4
+
+    def test_server_url_and_path_template(self):
+        spec = OpenAPISpecification.from_dict(copy.deepcopy(SPEC_DICT))
+        get_order = spec.find_operation_by_id("getOrder")
+        delete_order = spec.find_operation_by_id("deleteOrder")
+
+        assert get_order.get_server_url() == "https://api.example.com"
+        assert delete_order.get_server_url() == "https://admin.example.com"
+        assert get_order.get_path_template() == ("/users/", "id", "/orders/", "orderId", "")
+        assert get_order.render_path({"id": "42", "orderId": "7"}) == "/users/42/orders/7"
+        assert get_order.render_path({"id": "42"}) == "/users/42/orders/{orderId}"
+
+    def test_operation_is_immutable(self):
+        operation = Operation("/users", "GET", {"operationId": "getUsers"}, copy.deepcopy(SPEC_DICT))
+        with pytest.raises(AttributeError):
+            operation.path = "/other"
+        with pytest.raises(AttributeError):
+            operation.extra = True
@@ -0,0 +1,139 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from openapi_service_client.providers import AnthropicLLMProvider, CohereLLMProvider, OpenAILLMProvider
+from openapi_service_client.providers.payload_extractor import DefaultPayloadExtractor
+
+
+# Minimal stand-ins for the OpenAI SDK ChatCompletion response models
+class Function(BaseModel):
+    name: str
+    arguments: str
+
+
+class ChatCompletionMessageToolCall(BaseModel):
+    id: str
+    type: str = "function"
+    function: Function
+
+
+class ChatCompletionMessage(BaseModel):
+    role: str = "assistant"
+    content: Optional[str] = None
+    tool_calls: Optional[List[ChatCompletionMessageToolCall]] = None
+
+
+class Choice(BaseModel):
+    index: int
+    message: ChatCompletionMessage
+    finish_reason: str = "tool_calls"
+
+
+class ChatCompletion(BaseModel):
+    id: str
+    choices: List[Choice]
+
+
+# Minimal stand-ins for the Anthropic SDK Message response models
+@dataclass
+class TextBlock:
+    text: str
+    type: str = "text"
+
+
+@dataclass
+class ToolUseBlock:
+    id: str
+    name: str
+    input: dict
+    type: str = "tool_use"
+
+
+@dataclass
+class Message:
+    id: str
+    content: list
+
+
+def chat_completion() -> ChatCompletion:
+    tool_calls = [
+        ChatCompletionMessageToolCall(id=f"call_{i}", function=Function(name="search", arguments=f'{{"q": "{i}"}}'))
+        for i in range(2)
+    ]
+    return ChatCompletion(
+        id="chatcmpl-1", choices=[Choice(index=0, message=ChatCompletionMessage(tool_calls=tool_calls))]
+    )
+
+
+@pytest.fixture()
+def no_generic_search(monkeypatch):
+    def fail(*_args, **_kwargs):
+        raise AssertionError("generic search should not run for known payload shapes")
+
+    monkeypatch.setattr(DefaultPayloadExtractor, "iter_search", fail)
+
+
+class TestPayloadExtractorFastPaths:
+
+    @pytest.mark.usefixtures("no_generic_search")
+    def test_openai_sdk_model(self):
+        extractor = OpenAILLMProvider().get_payload_extractor()
+        assert extractor.extract_function_invocations(chat_completion()) == [
+            {"id": "call_0", "name": "search", "arguments": {"q": "0"}},
+            {"id": "call_1", "name": "search", "arguments": {"q": "1"}},
+        ]
+        assert extractor.extract_function_invocation(chat_completion()) == {
+            "id": "call_0",
+            "name": "search",
+            "arguments": {"q": "0"},
+        }
+
+    @pytest.mark.usefixtures("no_generic_search")
+    def test_openai_tool_call_dict(self):
+        extractor = OpenAILLMProvider().get_payload_extractor()
+        tool_call = {"id": "call_1", "type": "function", "function": {"name": "search", "arguments": '{"q": "a"}'}}
+        assert extractor.extract_function_invocation(tool_call) == {
+            "id": "call_1",
+            "name": "search",
+            "arguments": {"q": "a"},
+        }
+
+    @pytest.mark.usefixtures("no_generic_search")
+    def test_anthropic_message(self):
+        message = Message(
+            id="msg_1",
+            content=[TextBlock(text="Searching"), ToolUseBlock(id="toolu_1", name="search", input={"q": "a"})],
+        )
+        extractor = AnthropicLLMProvider().get_payload_extractor()
+        assert extractor.extract_function_invocations(message) == [
+            {"id": "toolu_1", "name": "search", "arguments": {"q": "a"}}
+        ]
+
+    @pytest.mark.usefixtures("no_generic_search")
+    def test_cohere_response(self):
+        response = {"text": "", "tool_calls": [{"name": "search", "parameters": {"q": "a"}}]}
+        extractor = CohereLLMProvider().get_payload_extractor()
+        assert extractor.extract_function_invocation(response) == {
+            "id": None,
+            "name": "search",
+            "arguments": {"q": "a"},
+        }
+
+    def test_unknown_shape_falls_back_to_generic_search(self):
+        payload = {"wrapper": {"nested": [chat_completion().choices[0].message.tool_calls[1]]}}
+        extractor = OpenAILLMProvider().get_payload_extractor()
+        assert extractor.extract_function_invocation(payload) == {
+            "id": "call_1",
+            "name": "search",
+            "arguments": {"q": "1"},
+        }
+
+    def test_dataclasses_are_viewed_shallowly(self):
+        extractor = OpenAILLMProvider().get_payload_extractor()
+        content = [TextBlock(text="Searching")]
+        fields = extractor.as_dict(Message(id="msg_1", content=content))
+        assert fields == {"id": "msg_1", "content": content}
+        assert fields["content"] is content
@@ -0,0 +1,190 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openapi_service_client import AsyncOpenAPIServiceClient, OpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.config import HttpClientConfig, RateLimit
+from openapi_service_client.http_client import HttpClientError, TokenBucket
+from openapi_service_client.http_client.rate_limit import RateLimiter, quota_reset_delay, retry_after
+from tests.conftest import send_json
+
+
+def spec_for(server_url: str, **extensions):
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Quota Service", "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "paths": {
+            "/search": {"get": {"operationId": "search", "responses": {"200": {"description": "OK"}}, **extensions}},
+            "/other": {"get": {"operationId": "other", "responses": {"200": {"description": "OK"}}}},
+        },
+    }
+
+
+def call(operation_id: str):
+    return {"type": "function", "function": {"name": operation_id, "arguments": "{}"}}
+
+
+def client_for(server_url: str, http_client_config: HttpClientConfig, client_class=OpenAPIServiceClient, **extensions):
+    config = (
+        ClientConfigurationBuilder()
+        .with_openapi_spec(spec_for(server_url, **extensions))
+        .with_http_client_config(http_client_config)
+        .build()
+    )
+    return client_class(config)
+
+
+def elapsed(function, times: int) -> float:
+    start = time.monotonic()
+    for _ in range(times):
+        function()
+    return time.monotonic() - start
+
+
+class ConcurrencyProbe:
+    """
+    A request handler recording the highest number of requests it handled at the same time.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.current = 0
+        self.highest = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, handler, number):
+        with self.lock:
+            self.current += 1
+            self.highest = max(self.highest, self.current)
+        time.sleep(self.seconds)
+        with self.lock:
+            self.current -= 1
+        send_json(handler, {"request": number})
+
+
+class TestRateLimiting:
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+        assert bucket.reserve(max_wait=0.1) is None
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+    def test_host_rate_limit(self, local_http_server):
+        server = local_http_server(lambda handler, number: send_json(handler, {"request": number}))
+        config = HttpClientConfig(host_rate_limits={"127.0.0.1": RateLimit(requests_per_second=10, burst=1)})
+        client = client_for(server.url, config)
+        assert elapsed(lambda: client.invoke(call("other")), 4) >= 0.28
+
+    def test_operation_rate_limit_from_spec_extension(self, local_http_server):
+        server = local_http_server(lambda handler, number: send_json(handler, {"request": number}))
+        client = client_for(server.url, HttpClientConfig(), **{"x-ratelimit": {"requests-per-second": 5, "burst": 1}})
+        assert elapsed(lambda: client.invoke(call("search")), 3) >= 0.38
+        # other operations are not limited
+        assert elapsed(lambda: client.invoke(call("other")), 3) < 0.3
+
+    def test_max_in_flight_shared_across_threads(self, local_http_server):
+        probe = ConcurrencyProbe(0.1)
+        server = local_http_server(probe)
+        client = client_for(server.url, HttpClientConfig(operation_rate_limits={"search": RateLimit(max_in_flight=2)}))
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(executor.map(lambda _: client.invoke(call("search")), range(6)))
+        assert len(server.requests) == 6
+        assert probe.highest == 2
+
+    def test_adapts_to_retry_after(self, local_http_server):
+        def handle(handler, number):
+            if number == 1:
+                send_json(handler, {"error": "slow down"}, status=429, headers={"Retry-After": "0.5"})
+            else:
+                send_json(handler, {"request": number})
+
+        server = local_http_server(handle)
+        client = client_for(server.url, HttpClientConfig(max_retries=0))
+        with pytest.raises(HttpClientError, match="429"):
+            client.invoke(call("other"))
+        assert elapsed(lambda: client.invoke(call("other")), 1) >= 0.4
+
+    def test_adapts_to_exhausted_quota(self, local_http_server):
+        server = local_http_server(
+            lambda handler, number: send_json(
+                handler, {"request": number}, headers={"RateLimit-Remaining": "0", "RateLimit-Reset": "0.3"}
+            )
+        )
+        client = client_for(server.url, HttpClientConfig())
+        assert elapsed(lambda: client.invoke(call("other")), 3) >= 0.55
+
+    def test_never_waits_past_deadline(self, local_http_server):
+        server = local_http_server(lambda handler, number: send_json(handler, {"request": number}))
+        config = HttpClientConfig(deadline=0.2, host_rate_limits={"127.0.0.1": RateLimit(requests_per_second=1)})
+        client = client_for(server.url, config)
+        client.invoke(call("other"))
+        with pytest.raises(HttpClientError, match="past its deadline"):
+            client.invoke(call("other"))
+
+    def test_waits_only_for_the_remaining_deadline(self):
+        config = HttpClientConfig(deadline=1.0, host_rate_limits={"h": RateLimit(requests_per_second=10, burst=1)})
+        limiter = RateLimiter(config)
+        request = {"url": "http://h/search", "method": "get"}
+        with limiter.limit(request, remaining=0.05):
+            pass
+        # the next token is due in 0.1s, within the deadline of the request but not within what is left of it
+        with pytest.raises(TimeoutError, match="past its deadline"):
+            with limiter.limit(request, remaining=0.05):
+                pass
+
+    def test_reserved_tokens_are_refunded_when_another_limit_refuses(self):
+        config = HttpClientConfig(
+            host_rate_limits={"h": RateLimit(requests_per_second=10, burst=1)},
+            operation_rate_limits={"search": RateLimit(requests_per_second=0.1, burst=1)},
+        )
+        limiter = RateLimiter(config)
+        request = {"url": "http://h/search", "method": "get", "operation_id": "search"}
+        with limiter.limit(request, remaining=1.0):
+            pass
+        with pytest.raises(TimeoutError, match="operation 'search'"):
+            with limiter.limit(request, remaining=1.0):
+                pass
+        # only the token of the request that was sent is taken from the host bucket
+        assert limiter._buckets[("host", "h")].reserve() == pytest.approx(0.1, abs=0.02)
+
+    def test_limits_follow_changed_spec_extensions(self):
+        limiter = RateLimiter(HttpClientConfig())
+        request = {"url": "http://h/search", "method": "get", "operation_id": "search"}
+        slow = {**request, "operation_rate_limit": {"requests-per-second": 1, "burst": 1, "max-in-flight": 1}}
+        fast = {**request, "operation_rate_limit": {"requests-per-second": 100, "burst": 5, "max-in-flight": 3}}
+        with limiter.limit(slow):
+            pass
+        with pytest.raises(TimeoutError):
+            with limiter.limit(slow, remaining=0.5):
+                pass
+        # e.g. a reloaded spec raising the limit
+        with limiter.limit(fast, remaining=0.5):
+            assert limiter._buckets[("operation", "search")].capacity == 5
+            assert limiter._slots[("operation", "search")][0] == 3
+
+    def test_async_max_in_flight(self, local_http_server):
+        probe = ConcurrencyProbe(0.1)
+        server = local_http_server(probe)
+        config = HttpClientConfig(host_rate_limits={"127.0.0.1": RateLimit(max_in_flight=2)})
+        client = client_for(server.url, config, client_class=AsyncOpenAPIServiceClient)
+
+        async def run():
+            return await asyncio.gather(*(client.ainvoke(call("search")) for _ in range(6)))
+
+        assert len(asyncio.run(run())) == 6
+        assert probe.highest == 2
+
+    def test_header_parsing(self):
+        assert retry_after({"Retry-After": "2"}) == 2
+        assert retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0
+        assert quota_reset_delay({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 5)}) > 4
+        assert quota_reset_delay({"RateLimit-Remaining": "3", "RateLimit-Reset": "5"}) is None
+        assert RateLimit.from_extension({"requests-per-minute": 30, "max-in-flight": 1}) == RateLimit(0.5, None, 1)
@@ -0,0 +1,115 @@
+import pickle
+
+import pytest
+
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.providers import CohereLLMProvider, OpenAILLMProvider
+from openapi_service_client.request_builder import RequestBuilder
+from openapi_service_client.spec import OpenAPISpecification, RefResolver
+
+
+def spec_with_refs():
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Pet Service", "version": "1.0.0"},
+        "servers": [{"url": "http://localhost"}],
+        "paths": {
+            "/pets/{petId}": {
+                "parameters": [{"$ref": "#/components/parameters/PetId"}],
+                "put": {
+                    "operationId": "updatePet",
+                    "description": "Update a pet",
+                    "parameters": [{"$ref": "#/components/parameters/Verbose"}],
+                    "requestBody": {"$ref": "#/components/requestBodies/Pet"},
+                    "responses": {"200": {"$ref": "#/components/responses/Pet"}},
+                },
+            },
+            "/pets": {
+                "post": {
+                    "operationId": "createPet",
+                    "description": "Create a pet",
+                    "requestBody": {"$ref": "#/components/requestBodies/Pet"},
+                    "responses": {"200": {"$ref": "#/components/responses/Pet"}},
+                },
+            },
+        },
+        "components": {
+            "parameters": {
+                "PetId": {"name": "petId", "in": "path", "required": True, "schema": {"type": "string"}},
+                "Verbose": {"name": "verbose", "in": "query", "schema": {"type": "boolean"}},
+            },
+            "requestBodies": {
+                "Pet": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Pet"}}}},
+            },
+            "responses": {
+                "Pet": {
+                    "description": "A pet",
+                    "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Pet"}}},
+                },
+            },
+            "schemas": {
+                "Pet": {
+                    "type": "object",
+                    "required": ["name"],
+                    "properties": {
+                        "name": {"type": "string", "description": "The pet's name"},
+                        "parent": {"$ref": "#/components/schemas/Pet"},
+                        "tags": {"type": "array", "items": {"$ref": "#/components/schemas/Tag"}},
+                    },
+                },
+                "Tag": {"type": "string"},
+                "a/b~c": {"type": "integer"},
+            },
+        },
+    }
+
+
+class TestRefResolver:
+
+    def test_components_are_resolved_once_and_shared(self):
+        spec = OpenAPISpecification(spec_with_refs())
+        resolver = spec.get_resolver()
+        update = resolver.resolve(spec.spec_dict["paths"]["/pets/{petId}"]["put"])
+        create = resolver.resolve(spec.spec_dict["paths"]["/pets"]["post"])
+        assert update["requestBody"] is create["requestBody"]
+        pet = update["requestBody"]["content"]["application/json"]["schema"]
+        assert pet["properties"]["tags"]["items"] == {"type": "string"}
+        # subtrees without references are not copied
+        assert pet["properties"]["name"] is spec.spec_dict["components"]["schemas"]["Pet"]["properties"]["name"]
+
+    def test_recursive_schemas_keep_the_back_reference(self):
+        spec = OpenAPISpecification(spec_with_refs())
+        pet = spec.get_resolver().resolve({"$ref": "#/components/schemas/Pet"})
+        assert pet["properties"]["parent"] == {"$ref": "#/components/schemas/Pet"}
+        assert spec.to_dict(resolve_references=True)["components"]["schemas"]["Pet"] is pet
+
+    def test_json_pointer_escapes_and_errors(self):
+        resolver = RefResolver(spec_with_refs())
+        assert resolver.resolve({"$ref": "#/components/schemas/a~1b~0c"}) == {"type": "integer"}
+        with pytest.raises(ValueError, match="Unresolvable"):
+            resolver.resolve({"$ref": "#/components/schemas/Missing"})
+        with pytest.raises(ValueError, match="Circular"):
+            RefResolver({"a": {"$ref": "#/b"}, "b": {"$ref": "#/a"}}).deref({"$ref": "#/a"})
+
+    def test_operations_follow_referenced_parameters_and_bodies(self):
+        config = ClientConfigurationBuilder().with_openapi_spec(spec_with_refs()).build()
+        operation = config.get_openapi_spec().find_operation_by_id("updatePet")
+        assert [param["name"] for param in operation.get_parameters()] == ["verbose", "petId"]
+        assert operation.get_response_mode() == "json"
+        request = RequestBuilder(config).build_request(operation, petId="7", name="Rex")
+        assert request["url"] == "http://localhost/pets/7"
+        assert request["json"] == {"petId": "7", "name": "Rex"}
+
+    def test_converters_resolve_referenced_schemas(self):
+        spec = OpenAPISpecification(spec_with_refs())
+        openai_tools = OpenAILLMProvider().get_schema_converter(spec).convert(["createPet"])
+        assert openai_tools[0]["function"]["parameters"]["properties"]["name"] == {
+            "type": "string",
+            "description": "The pet's name",
+        }
+        cohere_tools = CohereLLMProvider().get_schema_converter(spec).convert()
+        assert [tool["name"] for tool in cohere_tools] == ["updatePet", "createPet"]
+
+    def test_pickled_specifications_resolve_again(self):
+        spec = pickle.loads(pickle.dumps(OpenAPISpecification(spec_with_refs())))  # noqa: S301 - pickled above
+        assert spec.get_resolver().resolve({"$ref": "#/components/schemas/Tag"}) == {"type": "string"}
@@ -0,0 +1,167 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+from openapi_service_client import OpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.providers.openai import OpenAIConverter
+from openapi_service_client.spec import ReloadableSpec
+from tests.conftest import send_json
+
+
+def spec_for(server_url: str, lookup_path: str = "/lookup", search_description: str = "Search", api_key_header=None):
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Lookup Service", "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "paths": {
+            lookup_path: {
+                "get": {
+                    "operationId": "lookup",
+                    "description": "Look up a key",
+                    "parameters": [{"name": "key", "in": "query", "schema": {"type": "string"}}],
+                    "responses": {"200": {"description": "OK"}},
+                }
+            },
+            "/search": {
+                "get": {
+                    "operationId": "search",
+                    "description": search_description,
+                    "parameters": [{"name": "q", "in": "query", "schema": {"type": "string"}}],
+                    "responses": {"200": {"description": "OK"}},
+                }
+            },
+        },
+    }
+    if api_key_header:
+        spec["components"] = {
+            "securitySchemes": {"ApiKeyAuth": {"type": "apiKey", "in": "header", "name": api_key_header}}
+        }
+        spec["security"] = [{"ApiKeyAuth": []}]
+    return spec
+
+
+def write_spec(path, spec):
+    path.write_text(yaml.safe_dump(spec))
+    # make sure the change is visible by modification time even on coarse-grained file systems
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def call(operation_id: str, arguments: str = "{}"):
+    return {"type": "function", "function": {"name": operation_id, "arguments": arguments}}
+
+
+class TestReloadableSpec:
+
+    def test_reload_swaps_changed_versions_and_reuses_unchanged_operations(self, tmp_path):
+        spec_file = tmp_path / "spec.yml"
+        write_spec(spec_file, spec_for("http://localhost"))
+        spec = ReloadableSpec(spec_file)
+        swaps = []
+        spec.add_listener(lambda previous, new: swaps.append((previous, new)))
+        first = spec.get()
+        assert not spec.reload()
+
+        write_spec(spec_file, spec_for("http://localhost", search_description="Search the web"))
+        assert spec.reload()
+        second = spec.get()
+        assert spec.get_version() == 2
+        assert swaps == [(first, second)]
+        # the unchanged operation keeps what was compiled for it, bound to the new version
+        lookup = second.find_operation_by_id("lookup")
+        assert lookup.get_parameters() == first.find_operation_by_id("lookup").get_parameters()
+        assert lookup._parameters_by_location is first.find_operation_by_id("lookup")._parameters_by_location
+        assert lookup.spec_dict is second.spec_dict
+        assert second.find_operation_by_id("search") is not first.find_operation_by_id("search")
+        assert second.get_operation_fingerprints()["lookup"] == first.get_operation_fingerprints()["lookup"]
+
+        # the same content is not swapped in again
+        write_spec(spec_file, spec_for("http://localhost", search_description="Search the web"))
+        assert not spec.reload()
+        assert spec.get() is second
+
+    def test_in_flight_invocations_finish_on_their_version(self, local_http_server, tmp_path):
+        release = threading.Event()
+
+        def handle(handler, number):
+            if number == 1:
+                release.wait(5)
+            send_json(handler, {"path": handler.path.split("?")[0]})
+
+        server = local_http_server(handle)
+        spec_file = tmp_path / "spec.yml"
+        write_spec(spec_file, spec_for(server.url))
+        spec = ReloadableSpec(spec_file)
+        client = OpenAPIServiceClient(ClientConfigurationBuilder().with_openapi_spec(spec).build())
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            in_flight = executor.submit(client.invoke, call("lookup"))
+            while not server.requests:
+                release.wait(0.01)
+            write_spec(spec_file, spec_for(server.url, lookup_path="/v2/lookup"))
+            assert spec.reload()
+            release.set()
+            assert in_flight.result() == {"path": "/lookup"}
+        assert client.invoke(call("lookup")) == {"path": "/v2/lookup"}
+
+    def test_tool_definitions_of_unchanged_operations_are_kept(self, tmp_path, monkeypatch):
+        converted = []
+        original_convert = OpenAIConverter.convert
+
+        def recording_convert(self, operation_ids=None):
+            converted.append(operation_ids)
+            return original_convert(self, operation_ids)
+
+        monkeypatch.setattr(OpenAIConverter, "convert", recording_convert)
+        spec_file = tmp_path / "spec.yml"
+        write_spec(spec_file, spec_for("http://localhost"))
+        spec = ReloadableSpec(spec_file)
+        config = ClientConfigurationBuilder().with_openapi_spec(spec).build()
+        lookup, _ = config.get_tools_definitions(["lookup", "search"])
+
+        write_spec(spec_file, spec_for("http://localhost", search_description="Search the web"))
+        spec.reload()
+        new_lookup, new_search = config.get_tools_definitions(["lookup", "search"])
+        # only the changed operation is converted again
+        assert converted == [["lookup", "search"], ["search"]]
+        assert new_lookup == lookup
+        assert new_search["function"]["description"] == "Search the web"
+        assert [d["function"]["name"] for d in config.get_tools_definitions()] == ["lookup", "search"]
+
+    def test_changed_security_schemes_apply_to_unchanged_operations(self, local_http_server, tmp_path):
+        server = local_http_server(lambda handler, _: send_json(handler, {"headers": dict(handler.headers)}))
+        spec_file = tmp_path / "spec.yml"
+        write_spec(spec_file, spec_for(server.url, api_key_header="X-Old"))
+        spec = ReloadableSpec(spec_file)
+        config = ClientConfigurationBuilder().with_openapi_spec(spec).with_credentials("secret").build()
+        client = OpenAPIServiceClient(config)
+        assert client.invoke(call("lookup"))["headers"]["X-Old"] == "secret"
+        fingerprint = spec.get().get_operation_fingerprints()["lookup"]
+
+        # only the name of the API key header changes
+        write_spec(spec_file, spec_for(server.url, api_key_header="X-New"))
+        assert spec.reload()
+        assert spec.get().get_operation_fingerprints()["lookup"] != fingerprint
+        headers = client.invoke(call("lookup"))["headers"]
+        assert headers["X-New"] == "secret"
+        assert "X-Old" not in headers
+
+    def test_changed_security_scheme_types_rebuild_the_authentication(self, local_http_server, tmp_path):
+        server = local_http_server(lambda handler, _: send_json(handler, {"headers": dict(handler.headers)}))
+        spec_file = tmp_path / "spec.yml"
+        write_spec(spec_file, spec_for(server.url, api_key_header="X-Api-Key"))
+        spec = ReloadableSpec(spec_file)
+        client = OpenAPIServiceClient(
+            ClientConfigurationBuilder().with_openapi_spec(spec).with_credentials("secret").build()
+        )
+        assert client.invoke(call("lookup"))["headers"]["X-Api-Key"] == "secret"
+
+        bearer_spec = spec_for(server.url)
+        bearer_spec["components"] = {"securitySchemes": {"BearerAuth": {"type": "http", "scheme": "bearer"}}}
+        bearer_spec["security"] = [{"BearerAuth": []}]
+        write_spec(spec_file, bearer_spec)
+        assert spec.reload()
+        assert client.invoke(call("lookup"))["headers"]["Authorization"] == "Bearer secret"
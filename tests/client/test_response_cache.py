@@ -0,0 +1,169 @@
+import asyncio
+import time
+
+from openapi_service_client import AsyncOpenAPIServiceClient, OpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.http_client import DiskCacheStore, InMemoryCacheStore, ResponseCache
+from openapi_service_client.http_client.cache import CacheEntry, parse_cache_control
+from tests.conftest import send_json
+
+
+def spec_for(server_url: str):
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Weather Service", "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "paths": {
+            "/weather": {
+                "get": {
+                    "operationId": "getWeather",
+                    "parameters": [
+                        {"name": "city", "in": "query", "schema": {"type": "string"}},
+                        {"name": "Accept-Language", "in": "header", "schema": {"type": "string"}},
+                    ],
+                    "security": [{"apiKey": []}],
+                    "responses": {"200": {"description": "OK"}},
+                },
+                "post": {
+                    "operationId": "reportWeather",
+                    "requestBody": {"content": {"application/json": {"schema": {"type": "object"}}}},
+                    "responses": {"200": {"description": "OK"}},
+                },
+            },
+        },
+        "components": {"securitySchemes": {"apiKey": {"type": "apiKey", "in": "query", "name": "key"}}},
+    }
+
+
+def call(operation_id: str, arguments: str = '{"city": "Berlin"}'):
+    return {"type": "function", "function": {"name": operation_id, "arguments": arguments}}
+
+
+def client_for(server_url: str, cache: ResponseCache, credentials: str = "secret", client_class=OpenAPIServiceClient):
+    config = (
+        ClientConfigurationBuilder()
+        .with_openapi_spec(spec_for(server_url))
+        .with_credentials(credentials)
+        .with_response_cache(cache)
+        .build()
+    )
+    return client_class(config)
+
+
+def handler_with(headers):
+    def handle(handler, number):
+        send_json(handler, {"request": number}, headers=headers)
+
+    return handle
+
+
+def revalidating_handler(handler, number):
+    if handler.headers.get("If-None-Match") == '"v1"':
+        handler.send_response(304)
+        handler.send_header("ETag", '"v1"')
+        handler.send_header("Content-Length", "0")
+        handler.end_headers()
+        return
+    send_json(handler, {"request": number}, headers={"ETag": '"v1"', "Cache-Control": "no-cache"})
+
+
+class TestResponseCache:
+
+    def test_serves_fresh_responses_from_cache(self, local_http_server):
+        server = local_http_server(handler_with({"Cache-Control": "max-age=60"}))
+        cache = ResponseCache()
+        client = client_for(server.url, cache)
+
+        assert client.invoke(call("getWeather")) == {"request": 1}
+        assert client.invoke(call("getWeather")) == {"request": 1}
+        assert client.invoke(call("getWeather", '{"city": "Paris"}')) == {"request": 2}
+        assert len(server.requests) == 2
+        assert cache.get_stats() == {"hits": 1, "misses": 2, "revalidated": 0, "stored": 2}
+
+    def test_auth_is_not_part_of_the_key(self, local_http_server):
+        server = local_http_server(handler_with({"Cache-Control": "max-age=60"}))
+        cache = ResponseCache()
+        client_for(server.url, cache, credentials="alice").invoke(call("getWeather"))
+        assert client_for(server.url, cache, credentials="bob").invoke(call("getWeather")) == {"request": 1}
+        assert server.requests == [("GET", "/weather?city=Berlin&key=alice")]
+
+    def test_header_parameters_are_part_of_the_key(self, local_http_server):
+        server = local_http_server(handler_with({"Cache-Control": "max-age=60"}))
+        client = client_for(server.url, ResponseCache())
+        assert client.invoke(call("getWeather", '{"city": "Berlin", "Accept-Language": "de"}')) == {"request": 1}
+        assert client.invoke(call("getWeather", '{"city": "Berlin", "Accept-Language": "en"}')) == {"request": 2}
+        assert client.invoke(call("getWeather", '{"city": "Berlin", "Accept-Language": "de"}')) == {"request": 1}
+        assert len(server.requests) == 2
+
+    def test_auth_headers_are_not_part_of_the_key(self):
+        cache = ResponseCache()
+
+        def key(token: str, language: str):
+            headers = {"Authorization": f"Bearer {token}", "Accept-Language": language}
+            return cache.get_key(
+                {"method": "get", "url": "https://example.com/", "headers": headers, "auth_headers": ["Authorization"]}
+            )
+
+        assert key("alice", "de") == key("bob", "de")
+        assert key("alice", "de") != key("alice", "en")
+
+    def test_only_idempotent_and_cacheable_responses_are_stored(self, local_http_server):
+        server = local_http_server(handler_with({"Cache-Control": "no-store"}))
+        client = client_for(server.url, ResponseCache(ttl=60))
+        client.invoke(call("getWeather"))
+        client.invoke(call("getWeather"))
+        client.invoke(call("reportWeather"))
+        client.invoke(call("reportWeather"))
+        assert len(server.requests) == 4
+
+    def test_revalidates_with_etag(self, local_http_server):
+        server = local_http_server(revalidating_handler)
+        cache = ResponseCache()
+        client = client_for(server.url, cache)
+
+        assert client.invoke(call("getWeather")) == {"request": 1}
+        assert client.invoke(call("getWeather")) == {"request": 1}
+        assert len(server.requests) == 2
+        assert cache.get_stats()["revalidated"] == 1
+
+    def test_operation_ttl_overrides_response(self, local_http_server):
+        server = local_http_server(handler_with({"Cache-Control": "max-age=0"}))
+        client = client_for(server.url, ResponseCache(operation_ttls={"getWeather": 60}))
+        client.invoke(call("getWeather"))
+        assert client.invoke(call("getWeather")) == {"request": 1}
+
+    def test_disk_store(self, local_http_server, tmp_path):
+        server = local_http_server(handler_with({}))
+        client_for(server.url, ResponseCache(DiskCacheStore(tmp_path), ttl=60)).invoke(call("getWeather"))
+        # a new cache over the same directory, e.g. after a restart
+        assert client_for(server.url, ResponseCache(DiskCacheStore(tmp_path))).invoke(call("getWeather")) == {
+            "request": 1
+        }
+        assert len(server.requests) == 1
+
+    def test_async_client(self, local_http_server):
+        server = local_http_server(revalidating_handler)
+        cache = ResponseCache()
+        client = client_for(server.url, cache, client_class=AsyncOpenAPIServiceClient)
+
+        async def run():
+            return [await client.ainvoke(call("getWeather")) for _ in range(2)]
+
+        assert asyncio.run(run()) == [{"request": 1}, {"request": 1}]
+        assert cache.get_stats()["revalidated"] == 1
+
+    def test_lru_eviction(self):
+        store = InMemoryCacheStore(max_entries=2)
+        for key in ("a", "b", "c"):
+            store.set(key, CacheEntry(b"{}", "application/json", time.time() + 60))
+            store.get("a")
+        assert store.get("a") is not None
+        assert store.get("b") is None
+        assert len(store) == 2
+
+    def test_parse_cache_control(self):
+        assert parse_cache_control('max-age=60, no-cache, private="x"') == {
+            "max-age": "60",
+            "no-cache": None,
+            "private": "x",
+        }
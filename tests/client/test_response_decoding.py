@@ -0,0 +1,112 @@
+import asyncio
+import json
+import math
+
+from openapi_service_client import AsyncOpenAPIServiceClient, OpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.config import HttpClientConfig
+from openapi_service_client.http_client.decoding import decode_content, iter_events, response_mode_for
+
+
+def spec_for(server_url: str):
+    def operation(operation_id: str, content_type: str):
+        return {
+            "get": {
+                "operationId": operation_id,
+                "responses": {"200": {"description": "OK", "content": {content_type: {"schema": {}}}}},
+            }
+        }
+
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Content Service", "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "paths": {
+            "/json": operation("getJson", "application/json"),
+            "/text": operation("getText", "text/plain"),
+            "/binary": operation("getBinary", "application/octet-stream"),
+            "/ndjson": operation("getNdjson", "application/x-ndjson"),
+            "/events": operation("getEvents", "text/event-stream"),
+        },
+    }
+
+
+RESPONSES = {
+    "/json": ("application/json", b'{"greeting": "Hello"}'),
+    "/text": ("text/plain; charset=utf-8", "Grüße".encode()),
+    "/binary": ("application/octet-stream", b"\x00\x01\x02"),
+    "/ndjson": ("application/x-ndjson", b'{"n": 1}\n{"n": 2}\n\n{"n": 3}\n'),
+    "/events": ("text/event-stream", b"event: greeting\ndata: Hello\ndata: World\nid: 1\n\n: comment\ndata: bye\n\n"),
+}
+
+
+def serve_content(handler, _number):
+    content_type, body = RESPONSES[handler.path]
+    handler.send_response(200)
+    handler.send_header("Content-Type", content_type)
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def call(operation_id: str):
+    return {"type": "function", "function": {"name": operation_id, "arguments": "{}"}}
+
+
+def client_for(server_url: str, http_client_config=None, client_class=OpenAPIServiceClient):
+    builder = ClientConfigurationBuilder().with_openapi_spec(spec_for(server_url))
+    if http_client_config:
+        builder = builder.with_http_client_config(http_client_config)
+    return client_class(builder.build())
+
+
+class TestResponseDecoding:
+
+    def test_response_mode_for(self):
+        assert response_mode_for([]) == "json"
+        assert response_mode_for(["application/problem+json", "text/plain"]) == "json"
+        assert response_mode_for(["text/event-stream"]) == "stream"
+        assert response_mode_for(["text/csv"]) == "text"
+        assert response_mode_for(["image/png"]) == "bytes"
+
+    def test_decode_content(self):
+        assert decode_content(b"", "application/json", "json") is None
+        assert math.isnan(decode_content(b'{"a": NaN}', "application/json", "json")["a"])
+        # the actual content type wins over the declared one
+        assert decode_content(b"Not found", "text/html", "json") == "Not found"
+        assert decode_content(b"\xe9", "text/plain; charset=latin-1", "text") == "é"
+        assert decode_content(b"{}", "application/json", "bytes") == b"{}"
+
+    def test_iter_events(self):
+        lines = ['data: {"a": 1}', "", "event: done", "data: ", ""]
+        assert list(iter_events(lines, "text/event-stream")) == [{"data": '{"a": 1}'}, {"event": "done", "data": ""}]
+
+    def test_decodes_by_declared_content_type(self, local_http_server):
+        client = client_for(local_http_server(serve_content).url)
+        assert client.invoke(call("getJson")) == {"greeting": "Hello"}
+        assert client.invoke(call("getText")) == "Grüße"
+        assert client.invoke(call("getBinary")) == b"\x00\x01\x02"
+
+    def test_streams_ndjson_and_server_sent_events(self, local_http_server):
+        client = client_for(local_http_server(serve_content).url)
+        assert list(client.invoke(call("getNdjson"))) == [{"n": 1}, {"n": 2}, {"n": 3}]
+        assert list(client.invoke(call("getEvents"))) == [
+            {"event": "greeting", "data": "Hello\nWorld", "id": "1"},
+            {"data": "bye"},
+        ]
+
+    def test_response_mode_override(self, local_http_server):
+        config = HttpClientConfig(response_modes={"getJson": "text", "getNdjson": "bytes"})
+        client = client_for(local_http_server(serve_content).url, config)
+        assert json.loads(client.invoke(call("getJson"))) == {"greeting": "Hello"}
+        assert client.invoke(call("getNdjson")) == RESPONSES["/ndjson"][1]
+
+    def test_async_decoding_and_streaming(self, local_http_server):
+        client = client_for(local_http_server(serve_content).url, client_class=AsyncOpenAPIServiceClient)
+
+        async def run():
+            text = await client.ainvoke(call("getText"))
+            stream = await client.ainvoke(call("getNdjson"))
+            return text, [event async for event in stream]
+
+        assert asyncio.run(run()) == ("Grüße", [{"n": 1}, {"n": 2}, {"n": 3}])
@@ -0,0 +1,133 @@
+import asyncio
+import json
+
+import pytest
+
+from openapi_service_client import AsyncOpenAPIServiceClient, OpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.config import ResponseShapingConfig
+from openapi_service_client.response_shaping import ResponseShaper
+from openapi_service_client.response_shaping.shaper import compile_pointers
+from tests.conftest import send_json
+
+SEARCH_RESULT = {
+    "searchParameters": {"q": "Nikola Tesla", "engine": "google"},
+    "organic": [
+        {"title": f"Result {i}", "link": f"https://example.com/{i}", "snippet": "...", "sitelinks": [1, 2, 3]}
+        for i in range(10)
+    ],
+    "credits": 1,
+}
+
+
+def spec_for(server_url: str):
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Search Service", "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "paths": {
+            "/search": {"get": {"operationId": "search", "responses": {"200": {"description": "OK"}}}},
+            "/other": {"get": {"operationId": "other", "responses": {"200": {"description": "OK"}}}},
+        },
+    }
+
+
+def call(operation_id: str):
+    return {"type": "function", "function": {"name": operation_id, "arguments": "{}"}}
+
+
+def client_for(server_url: str, shaping: ResponseShapingConfig, client_class=OpenAPIServiceClient):
+    config = ClientConfigurationBuilder().with_openapi_spec(spec_for(server_url)).with_response_shaping(shaping).build()
+    return client_class(config)
+
+
+class BaselineConfiguration:
+    """
+    A configuration implementing the methods of the ClientConfiguration protocol that predate response shaping,
+    without subclassing it.
+    """
+
+    def __init__(self, config):
+        self.get_http_client = config.get_http_client
+        self.get_http_client_config = config.get_http_client_config
+        self.get_auth_config = config.get_auth_config
+        self.get_openapi_spec = config.get_openapi_spec
+        self.get_tools_definitions = config.get_tools_definitions
+        self.get_payload_extractor = config.get_payload_extractor
+
+
+class TestResponseShaping:
+
+    def test_prunes_to_allowed_fields_and_trims_arrays(self, local_http_server):
+        server = local_http_server(lambda handler, _: send_json(handler, SEARCH_RESULT))
+        shaping = ResponseShapingConfig(
+            max_array_items=2, include_fields={"search": ["/searchParameters/q", "/organic/*/title", "/organic/*/link"]}
+        )
+        response = client_for(server.url, shaping).invoke(call("search"))
+        assert response == {
+            "searchParameters": {"q": "Nikola Tesla"},
+            "organic": [
+                {"title": "Result 0", "link": "https://example.com/0"},
+                {"title": "Result 1", "link": "https://example.com/1"},
+            ],
+            "_truncated": {
+                "dropped_fields": [
+                    "/credits",
+                    "/organic/*/sitelinks",
+                    "/organic/*/snippet",
+                    "/searchParameters/engine",
+                ],
+                "trimmed_arrays": {"/organic": 10},
+            },
+        }
+
+    def test_allowlists_apply_per_operation(self, local_http_server):
+        server = local_http_server(lambda handler, _: send_json(handler, SEARCH_RESULT))
+        shaping = ResponseShapingConfig(include_fields={"search": ["/credits"]})
+        assert client_for(server.url, shaping).invoke(call("other")) == SEARCH_RESULT
+
+    def test_byte_cap_stops_download(self, local_http_server):
+        large = {"items": ["x" * 100] * 10_000}
+        server = local_http_server(lambda handler, _: send_json(handler, large))
+        shaping = ResponseShapingConfig(max_response_bytes=1000, operation_max_response_bytes={"other": 10})
+        client = client_for(server.url, shaping)
+
+        response = client.invoke(call("search"))
+        assert len(response["content"]) == 1000
+        assert response["content"].startswith('{"items": ["xxx')
+        assert response["_truncated"] == {"max_response_bytes": 1000}
+        assert len(client.invoke(call("other"))["content"]) == 10
+
+    def test_small_responses_are_untouched(self, local_http_server):
+        server = local_http_server(lambda handler, _: send_json(handler, SEARCH_RESULT))
+        shaping = ResponseShapingConfig(max_response_bytes=100_000, max_array_items=20)
+        assert client_for(server.url, shaping).invoke(call("search")) == SEARCH_RESULT
+
+    def test_async_byte_cap_and_trimming(self, local_http_server):
+        server = local_http_server(lambda handler, _: send_json(handler, list(range(10_000))))
+        shaping = ResponseShapingConfig(operation_max_response_bytes={"other": 100}, max_array_items=3)
+        client = client_for(server.url, shaping, client_class=AsyncOpenAPIServiceClient)
+
+        async def run():
+            return await client.ainvoke(call("search")), await client.ainvoke(call("other"))
+
+        trimmed, truncated = asyncio.run(run())
+        assert trimmed == {"content": [0, 1, 2], "_truncated": {"trimmed_arrays": {"": 10_000}}}
+        assert truncated == {
+            "content": json.dumps(list(range(10_000)))[:100],
+            "_truncated": {"max_response_bytes": 100},
+        }
+
+    def test_configurations_without_shaping_config(self, local_http_server):
+        server = local_http_server(lambda handler, _: send_json(handler, SEARCH_RESULT))
+        config = ClientConfigurationBuilder().with_openapi_spec(spec_for(server.url)).build()
+        assert OpenAPIServiceClient(BaselineConfiguration(config)).invoke(call("search")) == SEARCH_RESULT
+
+    def test_without_report(self):
+        shaper = ResponseShaper(ResponseShapingConfig(max_array_items=1, report_field=None))
+        assert shaper.shape({"operation_id": "search"}, {"a": [1, 2], "b": [[1, 2], [3]]}) == {"a": [1], "b": [[1]]}
+
+    def test_compile_pointers(self):
+        assert compile_pointers(["/a/b", "/a", "/c~1d/~0e"]) == {"a": {}, "c/d": {"~e": {}}}
+        with pytest.raises(ValueError, match="Invalid JSON pointer"):
+            compile_pointers(["a/b"])
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import pytest
+
+from openapi_service_client import AsyncOpenAPIServiceClient, OpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.config import HttpClientConfig
+from openapi_service_client.http_client import HttpClientError, RetryBudget, RetryPolicy
+from tests.conftest import send_json
+
+
+def spec_for(server_url: str, **extensions):
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Order Service", "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "paths": {
+            "/orders": {
+                "get": {"operationId": "listOrders", "responses": {"200": {"description": "OK"}}},
+                "post": {
+                    "operationId": "createOrder",
+                    "requestBody": {"content": {"application/json": {"schema": {"type": "object"}}}},
+                    "responses": {"200": {"description": "OK"}},
+                    **extensions,
+                },
+            },
+        },
+    }
+
+
+def call(operation_id: str):
+    return {"type": "function", "function": {"name": operation_id, "arguments": "{}"}}
+
+
+def client_for(server_url: str, http_client_config: HttpClientConfig, client_class=OpenAPIServiceClient, **extensions):
+    config = (
+        ClientConfigurationBuilder()
+        .with_openapi_spec(spec_for(server_url, **extensions))
+        .with_http_client_config(http_client_config)
+        .build()
+    )
+    return client_class(config)
+
+
+def failing_handler(failures: int, status: int = 503, headers=None):
+    def handle(handler, number):
+        if number <= failures:
+            send_json(handler, {"error": "unavailable"}, status=status, headers=headers)
+        else:
+            send_json(handler, {"request": number})
+
+    return handle
+
+
+class TestRetries:
+
+    def test_retries_429_after_retry_after(self, local_http_server):
+        server = local_http_server(failing_handler(1, status=429, headers={"Retry-After": "0.3"}))
+        client = client_for(server.url, HttpClientConfig(backoff_factor=0.01))
+        start = time.monotonic()
+        assert client.invoke(call("listOrders")) == {"request": 2}
+        assert time.monotonic() - start >= 0.3
+
+    def test_non_idempotent_requests_are_not_retried(self, local_http_server):
+        server = local_http_server(failing_handler(1))
+        client = client_for(server.url, HttpClientConfig(backoff_factor=0.01))
+        with pytest.raises(HttpClientError, match="503"):
+            client.invoke(call("createOrder"))
+        assert len(server.requests) == 1
+
+    def test_idempotent_operations_are_retried(self, local_http_server):
+        server = local_http_server(failing_handler(1))
+        client = client_for(server.url, HttpClientConfig(backoff_factor=0.01, idempotent_operations={"createOrder"}))
+        assert client.invoke(call("createOrder")) == {"request": 2}
+
+        server = local_http_server(failing_handler(1))
+        client = client_for(server.url, HttpClientConfig(backoff_factor=0.01), **{"x-idempotent": True})
+        assert client.invoke(call("createOrder")) == {"request": 2}
+
+    def test_connect_errors_are_retried_for_any_method(self):
+        retry = RetryPolicy(HttpClientConfig()).start({"method": "post", "url": "http://127.0.0.1:1/orders"})
+        assert retry.retry_after_error(connect_error=True) is not None
+        assert retry.retry_after_error(connect_error=False) is None
+
+    def test_backoff_is_jittered_and_capped(self):
+        config = HttpClientConfig(max_retries=50, backoff_factor=0.1, max_backoff=2.0, retry_budget_ratio=None)
+        retry = RetryPolicy(config).start({"method": "get", "url": "http://127.0.0.1:1/orders"})
+        delays = [retry.retry_after_status(503, {}) for _ in range(50)]
+        assert all(0.1 <= delay <= 2.0 for delay in delays)
+        assert len(set(delays)) > 1
+        assert retry.retry_after_status(503, {}) is None
+
+    def test_retry_after_longer_than_max_backoff_is_not_retried(self):
+        retry = RetryPolicy(HttpClientConfig()).start({"method": "get", "url": "http://127.0.0.1:1/orders"})
+        assert retry.retry_after_status(429, {"Retry-After": "3600"}) is None
+        assert retry.retry_after_status(429, {"Retry-After": "2"}) == 2
+        assert retry.attempt == 1
+
+    def test_retry_after_past_the_deadline_is_not_retried(self):
+        config = HttpClientConfig(deadline=1.0)
+        retry = RetryPolicy(config).start({"method": "get", "url": "http://127.0.0.1:1/orders"})
+        assert retry.retry_after_status(429, {"Retry-After": "5"}) is None
+
+    def test_retry_budget(self):
+        budget = RetryBudget(ratio=0.5, min_per_second=0.1, window=10)
+        for _ in range(4):
+            budget.record_request()
+        assert budget.try_withdraw()
+        assert budget.try_withdraw()
+        assert not budget.try_withdraw()
+
+    def test_exhausted_budget_stops_retries(self, local_http_server):
+        server = local_http_server(failing_handler(100))
+        config = HttpClientConfig(backoff_factor=0.01, retry_budget_ratio=0.0, retry_budget_min_per_second=0.1)
+        client = client_for(server.url, config)
+        with pytest.raises(HttpClientError, match="503"):
+            client.invoke(call("listOrders"))
+        # the budget allows one retry in its 10 second window
+        assert len(server.requests) == 2
+
+    def test_async_retries(self, local_http_server):
+        server = local_http_server(failing_handler(2, status=502))
+        client = client_for(server.url, HttpClientConfig(backoff_factor=0.01), client_class=AsyncOpenAPIServiceClient)
+        assert asyncio.run(client.ainvoke(call("listOrders"))) == {"request": 3}
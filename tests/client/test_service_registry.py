@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from openapi_service_client import ServiceRegistry
+from openapi_service_client.client import OpenAPIClientError
+from openapi_service_client.providers import AnthropicLLMProvider
+from tests.conftest import send_json
+
+
+def spec_for(title: str, server_url: str, *operation_ids: str):
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": title, "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "paths": {
+            f"/{operation_id}": {
+                "get": {
+                    "operationId": operation_id,
+                    "description": f"{title} {operation_id}",
+                    "parameters": [{"name": "q", "in": "query", "schema": {"type": "string"}}],
+                    "responses": {"200": {"description": "OK"}},
+                }
+            }
+            for operation_id in operation_ids
+        },
+    }
+
+
+def echo(service: str):
+    return lambda handler, _: send_json(handler, {"service": service, "path": handler.path})
+
+
+def call(name: str, q: str = "tesla", call_id: str = "call_0"):
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps({"q": q})}}
+
+
+def completion(*calls):
+    return {"choices": [{"message": {"role": "assistant", "tool_calls": list(calls)}}]}
+
+
+def tool_names(definitions):
+    return [definition["function"]["name"] for definition in definitions]
+
+
+@pytest.fixture()
+def registry(local_http_server):
+    news = local_http_server(echo("news"))
+    web = local_http_server(echo("web"))
+    return (
+        ServiceRegistry()
+        .register("news", spec_for("News", news.url, "search", "headlines"))
+        .register("web", spec_for("Web", web.url, "search", "scrape"))
+    )
+
+
+class TestServiceRegistry:
+
+    def test_merges_tools_and_namespaces_collisions(self, registry):
+        definitions = registry.get_tools_definitions()
+        assert tool_names(definitions) == ["news__search", "headlines", "web__search", "scrape"]
+        assert definitions[2]["function"]["description"] == "Web search"
+
+    def test_routes_invocations(self, registry):
+        assert registry.invoke(call("web__search")) == {"service": "web", "path": "/search?q=tesla"}
+        assert registry.invoke(call("headlines", "ai")) == {"service": "news", "path": "/headlines?q=ai"}
+        assert registry.resolve("news__search") == ("news", "search")
+        with pytest.raises(OpenAPIClientError, match="search"):
+            registry.invoke(call("search"))
+
+    def test_invoke_all_across_services(self, registry):
+        results = registry.invoke_all(completion(call("scrape", call_id="a"), call("news__search", call_id="b")))
+        assert [(result.id, result.response["service"]) for result in results] == [("a", "web"), ("b", "news")]
+
+    def test_specs_load_lazily_and_share_the_http_client(self, registry):
+        assert all(service.client is None for service in registry._services.values())
+        news = registry.get_client("news")
+        assert registry._services["web"].client is None
+        registry.get_tools_definitions()
+        assert registry.get_client("web").http_client is news.http_client is registry.http_client
+
+    def test_namespace_all_with_other_provider(self, local_http_server):
+        server = local_http_server(echo("news"))
+        registry = ServiceRegistry(provider=AnthropicLLMProvider(), namespace_all=True).register(
+            "news", spec_for("News", server.url, "search")
+        )
+        assert [definition["name"] for definition in registry.get_tools_definitions()] == ["news__search"]
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register("news", spec_for("News", server.url, "search"))
+
+    def test_tool_definitions_without_route(self, registry, monkeypatch):
+        config = registry.get_client("web").client_config
+        monkeypatch.setattr(config, "get_tools_definitions", lambda: [{"type": "function", "function": {"name": "x"}}])
+        with pytest.raises(OpenAPIClientError, match="Tool 'x' of service 'web'"):
+            registry.get_tools_definitions()
@@ -0,0 +1,140 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openapi_service_client import AsyncOpenAPIServiceClient, OpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.config import HttpClientConfig
+from openapi_service_client.http_client import AsyncSingleFlight, HttpClientError, SingleFlight
+from tests.conftest import send_json
+
+
+def spec_for(server_url: str):
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Search Service", "version": "1.0.0"},
+        "servers": [{"url": server_url}],
+        "paths": {
+            "/search": {
+                "get": {
+                    "operationId": "search",
+                    "parameters": [{"name": "q", "in": "query", "schema": {"type": "string"}}],
+                    "responses": {"200": {"description": "OK"}},
+                },
+                "post": {
+                    "operationId": "index",
+                    "requestBody": {"content": {"application/json": {"schema": {"type": "object"}}}},
+                    "responses": {"200": {"description": "OK"}},
+                },
+            },
+        },
+    }
+
+
+def call(operation_id: str, arguments: str = '{"q": "tesla"}'):
+    return {"type": "function", "function": {"name": operation_id, "arguments": arguments}}
+
+
+def slow_handler(seconds: float, status: int = 200):
+    def handle(handler, number):
+        time.sleep(seconds)
+        send_json(handler, {"request": number}, status=status)
+
+    return handle
+
+
+def client_for(server_url: str, client_class=OpenAPIServiceClient):
+    config = (
+        ClientConfigurationBuilder()
+        .with_openapi_spec(spec_for(server_url))
+        .with_http_client_config(HttpClientConfig(coalesce_requests=True, max_retries=0))
+        .build()
+    )
+    return client_class(config)
+
+
+class TestSingleFlight:
+
+    def test_identical_concurrent_requests_share_one_upstream_request(self, local_http_server):
+        server = local_http_server(slow_handler(0.3))
+        client = client_for(server.url)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda _: client.invoke(call("search")), range(8)))
+
+        assert responses == [{"request": 1}] * 8
+        # every caller decodes its own copy of the shared response
+        assert len({id(response) for response in responses}) == 8
+        assert len(server.requests) == 1
+        assert client.http_client.single_flight.in_flight() == 0
+
+    def test_different_and_non_idempotent_requests_are_not_coalesced(self, local_http_server):
+        server = local_http_server(slow_handler(0.2))
+        client = client_for(server.url)
+        calls = [call("search"), call("search", '{"q": "edison"}'), call("index"), call("index")]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(client.invoke, calls))
+        assert len(server.requests) == 4
+
+    def test_errors_are_shared(self, local_http_server):
+        server = local_http_server(slow_handler(0.3, status=404))
+        client = client_for(server.url)
+
+        def invoke(_):
+            with pytest.raises(HttpClientError, match="404"):
+                client.invoke(call("search"))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(invoke, range(4)))
+        assert len(server.requests) == 1
+        # a failed flight is not remembered, the next call goes upstream again
+        invoke(None)
+        assert len(server.requests) == 2
+
+    def test_waiters_time_out(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        leader = threading.Thread(target=single_flight.do, args=("key", lambda: release.wait(5)))
+        leader.start()
+        while not single_flight.in_flight():
+            time.sleep(0.01)
+
+        with pytest.raises(TimeoutError):
+            single_flight.do("key", lambda: pytest.fail("must not run"), timeout=0.1)
+        release.set()
+        leader.join()
+        assert single_flight.do("key", lambda: "again") == "again"
+
+    def test_async_identical_requests_share_one_upstream_request(self, local_http_server):
+        server = local_http_server(slow_handler(0.3))
+        client = client_for(server.url, client_class=AsyncOpenAPIServiceClient)
+
+        async def run():
+            return await asyncio.gather(*(client.ainvoke(call("search")) for _ in range(5)))
+
+        assert asyncio.run(run()) == [{"request": 1}] * 5
+        assert len(server.requests) == 1
+
+    def test_async_cancelled_caller_does_not_cancel_the_call(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def slow_call():
+            calls.append(1)
+            await asyncio.sleep(0.2)
+            return "done"
+
+        async def run():
+            first = asyncio.ensure_future(single_flight.do("key", slow_call))
+            second = asyncio.ensure_future(single_flight.do("key", slow_call))
+            await asyncio.sleep(0.05)
+            first.cancel()
+            with pytest.raises(TimeoutError):
+                await single_flight.do("key", slow_call, timeout=0.01)
+            return await second
+
+        assert asyncio.run(run()) == "done"
+        assert calls == [1]
+        assert single_flight.in_flight() == 0
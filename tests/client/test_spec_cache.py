@@ -0,0 +1,64 @@
+import pickle
+from unittest.mock import patch
+
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.providers import AnthropicLLMProvider
+from openapi_service_client.spec import CompiledSpecCache, OpenAPISpecification
+
+
+class TestCompiledSpecCache:
+
+    def test_compiled_spec_round_trip(self, test_files_path, tmp_path):
+        cache = CompiledSpecCache(tmp_path)
+        spec_file = test_files_path / "github_compare.yml"
+        compiled = OpenAPISpecification.from_file(spec_file, cache)
+        assert len(list(tmp_path.glob("*.spec"))) == 1
+
+        with patch("yaml.safe_load", side_effect=AssertionError("must not parse")):
+            loaded = OpenAPISpecification.from_file(spec_file, cache)
+        assert loaded.spec_dict == compiled.spec_dict
+        assert loaded.get_operation_ids() == compiled.get_operation_ids()
+        assert loaded.get_fingerprint() == compiled.get_fingerprint()
+        operation_id = compiled.get_operation_ids()[0]
+        operation = loaded.find_operation_by_id(operation_id)
+        assert operation.get_server_url() == compiled.find_operation_by_id(operation_id).get_server_url()
+        # operations restored from the cache still share the specification dictionary and stay immutable
+        assert operation.spec_dict is loaded.spec_dict
+
+    def test_changed_source_is_a_cache_miss(self, test_files_path, tmp_path):
+        cache = CompiledSpecCache(tmp_path)
+        content = (test_files_path / "openapi_greeting_service.yml").read_text()
+        OpenAPISpecification.from_str(content, cache)
+        changed = OpenAPISpecification.from_str(content.replace("Greeting", "Salutation", 1), cache)
+        assert "Salutation" in changed.get_name()
+        assert len(list(tmp_path.glob("*.spec"))) == 2
+
+    def test_corrupt_files_are_ignored(self, test_files_path, tmp_path):
+        cache = CompiledSpecCache(tmp_path)
+        content = (test_files_path / "openapi_greeting_service.yml").read_text()
+        (tmp_path / f"{cache.get_key(content)}.spec").write_bytes(b"not a pickle")
+        assert OpenAPISpecification.from_str(content, cache).get_operation_ids()
+        data = (tmp_path / f"{cache.get_key(content)}.spec").read_bytes()
+        assert isinstance(pickle.loads(data), OpenAPISpecification)  # noqa: S301 - the cache file written above
+
+    def test_tools_definitions_are_cached_per_provider(self, test_files_path, tmp_path):
+        cache = CompiledSpecCache(tmp_path)
+        spec_file = test_files_path / "serper.yaml"
+
+        def build(provider=None):
+            builder = ClientConfigurationBuilder().with_openapi_spec(spec_file).with_spec_cache(cache)
+            if provider is not None:
+                builder.with_provider(provider)
+            return builder.build()
+
+        definitions = build().get_tools_definitions()
+        anthropic_definitions = build(AnthropicLLMProvider()).get_tools_definitions()
+        assert len(list(tmp_path.glob("*.tools"))) == 2
+
+        config = build()
+        with patch.object(config.provider, "get_schema_converter", side_effect=AssertionError("must not convert")):
+            assert config.get_tools_definitions() == definitions
+            assert config.get_tools_definitions([definitions[0]["function"]["name"]]) == definitions[:1]
+        assert anthropic_definitions != definitions
+        cache.clear()
+        assert not list(tmp_path.iterdir())
@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.spec import OpenAPISpecification, SpecFetcher
+
+SPEC = """openapi: 3.0.0
+info:
+  title: {title}
+  version: 1.0.0
+servers:
+  - url: http://localhost
+paths:
+  /lookup:
+    get:
+      operationId: lookup
+      responses:
+        '200':
+          description: OK
+"""
+
+
+class SpecHost:
+    """
+    Serves a specification with an ETag, answering conditional requests with 304 while it is unchanged.
+    """
+
+    def __init__(self):
+        self.title = "Lookup"
+        self.down = False
+        self.conditional_requests = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def handle(self, handler, _):
+        self.release.wait(5)
+        if self.down:
+            handler.send_response(503)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+        etag = f'"{self.title}"'
+        if handler.headers.get("If-None-Match"):
+            self.conditional_requests += 1
+        if handler.headers.get("If-None-Match") == etag:
+            handler.send_response(304)
+            handler.send_header("ETag", etag)
+            handler.end_headers()
+            return
+        body = SPEC.format(title=self.title).encode("utf-8")
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/yaml")
+        handler.send_header("ETag", etag)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+
+class TestSpecFetcher:
+
+    def test_mirror_revalidates_and_survives_outages(self, local_http_server, tmp_path):
+        host = SpecHost()
+        server = local_http_server(host.handle)
+        url = f"{server.url}/spec"
+        fetcher = SpecFetcher(mirror_dir=tmp_path)
+
+        assert OpenAPISpecification.from_url(url, fetcher=fetcher).get_name() == "Lookup"
+        # a new process with the same mirror sends a conditional request
+        fetched = SpecFetcher(mirror_dir=tmp_path).fetch(url)
+        assert host.conditional_requests == 1
+        assert not fetched.stale
+        assert b"title: Lookup" in fetched.content
+
+        host.down = True
+        fetched = SpecFetcher(mirror_dir=tmp_path).fetch(url)
+        assert fetched.stale
+        assert b"title: Lookup" in fetched.content
+        with pytest.raises(ConnectionError):
+            SpecFetcher().fetch(url)
+
+    def test_stale_while_revalidate_refreshes_in_background(self, local_http_server, tmp_path):
+        host = SpecHost()
+        server = local_http_server(host.handle)
+        url = f"{server.url}/spec"
+        SpecFetcher(mirror_dir=tmp_path).fetch(url)
+
+        host.title = "Renamed"
+        host.release.clear()
+        fetcher = SpecFetcher(mirror_dir=tmp_path, stale_while_revalidate=True)
+        config = ClientConfigurationBuilder().with_openapi_spec(url).with_spec_fetcher(fetcher).build()
+        # served from the mirror while the host has not answered yet
+        assert config.get_openapi_spec().get_name() == "Lookup"
+
+        host.release.set()
+        fetcher.wait_for_refreshes(timeout=5)
+        assert OpenAPISpecification.from_url(url, fetcher=fetcher).get_name() == "Renamed"
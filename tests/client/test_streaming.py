@@ -0,0 +1,214 @@
+import asyncio
+import json
+import threading
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from openapi_service_client import AsyncOpenAPIServiceClient, OpenAPIServiceClient
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.config import HttpClientConfig
+from openapi_service_client.http_client import HttpxAsyncHttpClient
+from openapi_service_client.providers import AnthropicLLMProvider, CohereLLMProvider, OpenAILLMProvider
+from tests.conftest import FastAPITestClient
+
+
+def openai_chunks(*calls):
+    """Streams each (id, name, arguments) tool call as a header delta followed by 5-character argument fragments."""
+    for index, (call_id, name, arguments) in enumerate(calls):
+        yield {
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {
+                        "tool_calls": [{"index": index, "id": call_id, "function": {"name": name, "arguments": ""}}]
+                    },
+                }
+            ]
+        }
+        for i in range(0, len(arguments), 5):
+            yield {
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"tool_calls": [{"index": index, "function": {"arguments": arguments[i : i + 5]}}]},
+                    }
+                ]
+            }
+    yield {"choices": [{"index": 0, "delta": {}, "finish_reason": "tool_calls"}]}
+
+
+class TestStreamingPayloadExtractors:
+
+    def test_openai_emits_each_call_when_its_json_closes(self):
+        extractor = OpenAILLMProvider().get_streaming_payload_extractor()
+        arguments = '{"name": "J}oh\\"n", "tags": [{"a": 1}]}'
+        emitted_at = []
+        for i, chunk in enumerate(
+            openai_chunks(("call_0", "greet", arguments), ("call_1", "greet", '{"name": "Jane"}'))
+        ):
+            for invocation in extractor.feed(chunk):
+                emitted_at.append((i, invocation))
+        assert extractor.finish() == []
+
+        assert [invocation for _, invocation in emitted_at] == [
+            {"id": "call_0", "name": "greet", "arguments": json.loads(arguments)},
+            {"id": "call_1", "name": "greet", "arguments": {"name": "Jane"}},
+        ]
+        # the first call is complete before the second call starts streaming
+        fragments = -(-len(arguments) // 5)
+        assert emitted_at[0][0] == fragments
+
+    def test_malformed_arguments_do_not_end_the_stream(self):
+        extractor = OpenAILLMProvider().get_streaming_payload_extractor()
+        chunks = openai_chunks(("call_0", "greet", '{"name": }'), ("call_1", "greet", '{"name": "Jane"}'))
+        invocations = [invocation for chunk in chunks for invocation in extractor.feed(chunk)]
+        assert extractor.finish() == []
+
+        assert [(invocation["id"], invocation["arguments"]) for invocation in invocations] == [
+            ("call_0", None),
+            ("call_1", {"name": "Jane"}),
+        ]
+        assert isinstance(invocations[0]["error"], ValueError)
+        assert "error" not in invocations[1]
+
+    def test_anthropic(self):
+        events = [
+            {"type": "message_start", "message": {"id": "msg_1"}},
+            {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+            {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Greeting"}},
+            {"type": "content_block_stop", "index": 0},
+            {
+                "type": "content_block_start",
+                "index": 1,
+                "content_block": {"type": "tool_use", "id": "toolu_1", "name": "greet", "input": {}},
+            },
+            {"type": "content_block_delta", "index": 1, "delta": {"type": "input_json_delta", "partial_json": '{"na'}},
+            {
+                "type": "content_block_delta",
+                "index": 1,
+                "delta": {"type": "input_json_delta", "partial_json": 'me": "J"}'},
+            },
+            {"type": "content_block_stop", "index": 1},
+            {
+                "type": "content_block_start",
+                "index": 2,
+                "content_block": {"type": "tool_use", "id": "toolu_2", "name": "listAll", "input": {}},
+            },
+            {"type": "content_block_stop", "index": 2},
+            {"type": "message_stop"},
+        ]
+        extractor = AnthropicLLMProvider().get_streaming_payload_extractor()
+        emitted = [(i, invocation) for i, event in enumerate(events) for invocation in extractor.feed(event)]
+        assert emitted == [
+            (6, {"id": "toolu_1", "name": "greet", "arguments": {"name": "J"}}),
+            (9, {"id": "toolu_2", "name": "listAll", "arguments": {}}),
+        ]
+
+    def test_cohere_v1_and_v2(self):
+        v1_events = [
+            {"event_type": "tool-calls-chunk", "tool_call_delta": {"index": 0, "name": "greet"}},
+            {"event_type": "tool-calls-chunk", "tool_call_delta": {"index": 0, "parameters": '{"name":'}},
+            {"event_type": "tool-calls-chunk", "tool_call_delta": {"index": 0, "parameters": ' "J"}'}},
+            {"event_type": "tool-calls-generation", "tool_calls": [{"name": "greet", "parameters": {"name": "J"}}]},
+        ]
+        extractor = CohereLLMProvider().get_streaming_payload_extractor()
+        emitted = [(i, invocation) for i, event in enumerate(v1_events) for invocation in extractor.feed(event)]
+        assert emitted == [(2, {"id": None, "name": "greet", "arguments": {"name": "J"}})]
+
+        v2_events = [
+            {
+                "type": "tool-call-start",
+                "index": 0,
+                "delta": {"message": {"tool_calls": {"id": "tc_1", "function": {"name": "greet", "arguments": ""}}}},
+            },
+            {
+                "type": "tool-call-delta",
+                "index": 0,
+                "delta": {"message": {"tool_calls": {"function": {"arguments": '{"name": "J"}'}}}},
+            },
+            {"type": "tool-call-end", "index": 0},
+        ]
+        extractor = CohereLLMProvider().get_streaming_payload_extractor()
+        emitted = [(i, invocation) for i, event in enumerate(v2_events) for invocation in extractor.feed(event)]
+        assert emitted == [(1, {"id": "tc_1", "name": "greet", "arguments": {"name": "J"}})]
+
+
+def create_greet_params_app(started: threading.Event) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/greet-params/{name}")
+    def greet_params(name: str):
+        started.set()
+        return JSONResponse(content={"greeting": f"Hello, {name} from params_only!"})
+
+    return app
+
+
+class TestInvokeStream:
+
+    def test_invocations_start_before_the_stream_ends(self, test_files_path):
+        started = threading.Event()
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(test_files_path / "openapi_greeting_service.yml")
+            .with_http_client(FastAPITestClient(create_greet_params_app(started)))
+            .build()
+        )
+        client = OpenAPIServiceClient(config)
+
+        def stream():
+            chunks = openai_chunks(
+                ("call_0", "greetParams", '{"name": "John"}'), ("call_1", "greetParams", '{"name": "Jane"}')
+            )
+            for chunk in chunks:
+                if "call_1" in json.dumps(chunk):
+                    # the model is still generating, the first call must already be running
+                    assert started.wait(timeout=5)
+                yield chunk
+
+        results = list(client.invoke_stream(stream()))
+        assert [(result.id, result.response) for result in results] == [
+            ("call_0", {"greeting": "Hello, John from params_only!"}),
+            ("call_1", {"greeting": "Hello, Jane from params_only!"}),
+        ]
+
+    def test_malformed_call_is_reported_next_to_valid_ones(self, test_files_path):
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(test_files_path / "openapi_greeting_service.yml")
+            .with_http_client(FastAPITestClient(create_greet_params_app(threading.Event())))
+            .build()
+        )
+        client = OpenAPIServiceClient(config)
+        # the first call is cut off mid-arguments, it only ends with the stream
+        chunks = openai_chunks(("call_0", "greetParams", '{"name": "Jo'), ("call_1", "greetParams", '{"name": "Jane"}'))
+
+        results = {result.id: result for result in client.invoke_stream(chunks)}
+        assert isinstance(results["call_0"].error, ValueError)
+        assert results["call_1"].response == {"greeting": "Hello, Jane from params_only!"}
+
+    def test_ainvoke_stream(self, test_files_path):
+        app = create_greet_params_app(threading.Event())
+        http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(test_files_path / "openapi_greeting_service.yml")
+            .with_async_http_client(HttpxAsyncHttpClient(HttpClientConfig(max_retries=0), client=http_client))
+            .build()
+        )
+        client = AsyncOpenAPIServiceClient(config)
+
+        async def stream():
+            for chunk in openai_chunks(("call_0", "greetParams", '{"name": "John"}'), ("call_1", "unknown", "{}")):
+                await asyncio.sleep(0)
+                yield chunk
+
+        async def collect():
+            return [result async for result in client.ainvoke_stream(stream())]
+
+        results = asyncio.run(collect())
+        assert results[0].response == {"greeting": "Hello, John from params_only!"}
+        assert results[1].id == "call_1"
+        assert isinstance(results[1].error, ValueError)
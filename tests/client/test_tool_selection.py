@@ -0,0 +1,65 @@
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.spec import OpenAPISpecification
+from openapi_service_client.tool_selection import ToolSelector, tokenize
+
+
+def operation(op_id: str, summary: str, *parameters: str):
+    return {
+        "operationId": op_id,
+        "summary": summary,
+        "description": summary,
+        "parameters": [{"name": name, "in": "query", "schema": {"type": "string"}} for name in parameters],
+        "responses": {"200": {"description": "OK"}},
+    }
+
+
+def repository_spec():
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Code Hosting", "version": "1.0.0"},
+        "servers": [{"url": "http://localhost"}],
+        "paths": {
+            "/repos": {
+                "get": operation("listUserRepos", "List the repositories of a user", "username"),
+                "post": operation("createRepo", "Create a repository", "name"),
+            },
+            "/repos/{repo}/issues": {"get": operation("listIssues", "List the issues of a repository", "state")},
+            "/repos/{repo}/stargazers": {
+                "get": operation("listStargazers", "List the users who starred a repo", "page")
+            },
+            "/weather": {"get": operation("getForecast", "Get the weather forecast for a city", "city")},
+            "/untitled": {"get": {"operationId": "untitled", "responses": {"200": {"description": "OK"}}}},
+        },
+    }
+
+
+class TestToolSelector:
+
+    def test_tokenize_splits_identifiers_and_normalizes_terms(self):
+        assert tokenize("listUserRepos") == ["list", "user", "repo"]
+        assert tokenize("What are the open_issues of my HTTPServer repositories?") == [
+            "open",
+            "issue",
+            "http",
+            "server",
+            "repository",
+        ]
+
+    def test_ranks_operations_by_relevance(self):
+        selector = ToolSelector(OpenAPISpecification(repository_spec()))
+        assert selector.select("Show the open issues of my repository", top_k=1) == ["listIssues"]
+        assert len(selector.select("Show the open issues of my repository", top_k=2)) == 2
+        assert selector.select("weather in Paris?", top_k=3) == ["getForecast"]
+        assert selector.select("hello there") == []
+        ranked = selector.rank("create a new repository")
+        assert ranked[0][0] == "createRepo"
+        assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+
+    def test_select_tools_definitions_returns_top_k_definitions(self):
+        config = ClientConfigurationBuilder().with_openapi_spec(repository_spec()).build()
+        definitions = config.select_tools_definitions("who starred the repo", top_k=2)
+        assert [d["function"]["name"] for d in definitions] == ["listStargazers", "createRepo"]
+        # operations without a description cannot be converted and are passed over
+        assert [d["function"]["name"] for d in config.select_tools_definitions("untitled weather", top_k=1)] == [
+            "getForecast"
+        ]
@@ -0,0 +1,100 @@
+import copy
+
+from openapi_service_client.client_configuration import ClientConfigurationBuilder
+from openapi_service_client.providers import CohereLLMProvider
+from openapi_service_client.providers.cohere import CohereConverter
+from openapi_service_client.providers.openai import OpenAIConverter
+from openapi_service_client.spec import OpenAPISpecification
+
+
+def _operation(op_id: str, description: str):
+    return {
+        "operationId": op_id,
+        "description": description,
+        "parameters": [{"name": "name", "in": "path", "required": True, "schema": {"type": "string"}}],
+    }
+
+
+SPEC_DICT = {
+    "openapi": "3.0.0",
+    "info": {"title": "Greeting Service", "version": "1.0.0"},
+    "servers": [{"url": "http://localhost"}],
+    "paths": {
+        "/greet/{name}": {"get": _operation("greet", "Greets a person")},
+        "/wave/{name}": {"get": _operation("wave", "Waves at a person")},
+        "/bow/{name}": {"get": _operation("bow", "Bows to a person")},
+    },
+}
+
+
+class TestToolsDefinitions:
+
+    def test_definitions_are_memoized(self, monkeypatch):
+        config = ClientConfigurationBuilder().with_openapi_spec(copy.deepcopy(SPEC_DICT)).build()
+        calls = []
+        original_convert = OpenAIConverter.convert
+
+        def counting_convert(self, operation_ids=None):
+            calls.append(operation_ids)
+            return original_convert(self, operation_ids)
+
+        monkeypatch.setattr(OpenAIConverter, "convert", counting_convert)
+
+        first = config.get_tools_definitions()
+        second = config.get_tools_definitions()
+        assert [d["function"]["name"] for d in first] == ["greet", "wave", "bow"]
+        assert first == second
+        assert len(calls) == 1
+        # subsets are served from the already converted definitions
+        assert config.get_tools_definitions(operation_ids=["bow", "greet"]) == [first[2], first[0]]
+        assert len(calls) == 1
+
+    def test_modified_definitions_do_not_leak(self):
+        config = ClientConfigurationBuilder().with_openapi_spec(copy.deepcopy(SPEC_DICT)).build()
+        first = config.get_tools_definitions()
+        first[0]["function"]["name"] = "renamed"
+        first[0]["function"]["strict"] = True
+        first[0]["function"]["parameters"]["properties"].clear()
+        subset = config.get_tools_definitions(operation_ids=["wave"])
+        subset[0]["function"]["description"] = "changed"
+
+        second = config.get_tools_definitions()
+        assert [d["function"]["name"] for d in second] == ["greet", "wave", "bow"]
+        assert "strict" not in second[0]["function"]
+        assert second[0]["function"]["parameters"]["properties"]
+        assert second[1]["function"]["description"] == "Waves at a person"
+
+    def test_subset_converts_only_requested_operations(self, monkeypatch):
+        config = (
+            ClientConfigurationBuilder()
+            .with_openapi_spec(copy.deepcopy(SPEC_DICT))
+            .with_provider(CohereLLMProvider())
+            .build()
+        )
+        parsed = []
+        original_parse = CohereConverter._parse_endpoint
+
+        def recording_parse(self, operation):
+            parsed.append(operation["operationId"])
+            return original_parse(self, operation)
+
+        monkeypatch.setattr(CohereConverter, "_parse_endpoint", recording_parse)
+
+        definitions = config.get_tools_definitions(operation_ids=["wave", "unknownOperation"])
+        assert [d["name"] for d in definitions] == ["wave"]
+        assert parsed == ["wave"]
+
+        definitions = config.get_tools_definitions(operation_ids=["wave", "bow"])
+        assert [d["name"] for d in definitions] == ["wave", "bow"]
+        assert parsed == ["wave", "bow"]
+
+    def test_cache_invalidated_when_spec_changes(self):
+        config = ClientConfigurationBuilder().with_openapi_spec(copy.deepcopy(SPEC_DICT)).build()
+        assert [d["function"]["name"] for d in config.get_tools_definitions()] == ["greet", "wave", "bow"]
+
+        spec_dict = copy.deepcopy(SPEC_DICT)
+        del spec_dict["paths"]["/wave/{name}"]
+        config.openapi_spec = OpenAPISpecification.from_dict(spec_dict)
+
+        assert [d["function"]["name"] for d in config.get_tools_definitions()] == ["greet", "bow"]
+        assert config.get_tools_definitions(operation_ids=["wave"]) == []
@@ -1,4 +1,8 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from typing import Callable, List, Tuple
 from urllib.parse import urlparse
 
 import pytest
@@ -13,6 +17,70 @@ def test_files_path():
     return Path(__file__).parent / "test_files"
 
 
+class LocalHTTPServer:
+    """
+    A real HTTP server on localhost, for tests that exercise the network layer of the HTTP clients (timeouts,
+    retries, connection pooling). Each request is passed to the `handle` function, which receives the request
+    handler and the 1-based request number and writes the response, e.g. with `send_json`.
+    """
+
+    def __init__(self, handle: Callable[[BaseHTTPRequestHandler, int], None]):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                with server.lock:
+                    server.requests.append((self.command, self.path))
+                    number = len(server.requests)
+                length = int(self.headers.get("Content-Length") or 0)
+                self.body = self.rfile.read(length) if length else b""
+                handle(self, number)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_HEAD = _handle  # noqa: N815
+
+            def log_message(self, *args):
+                pass
+
+        self.requests: List[Tuple[str, str]] = []
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def send_json(handler: BaseHTTPRequestHandler, body, status: int = 200, headers=None):
+    payload = json.dumps(body).encode("utf-8")
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", str(len(payload)))
+    for name, value in (headers or {}).items():
+        handler.send_header(name, value)
+    handler.end_headers()
+    handler.wfile.write(payload)
+
+
+@pytest.fixture()
+def local_http_server():
+    servers = []
+
+    def start(handle: Callable[[BaseHTTPRequestHandler, int], None]) -> LocalHTTPServer:
+        server = LocalHTTPServer(handle)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
 class FastAPITestClient(HttpClient):
 
     def __init__(self, app: FastAPI):